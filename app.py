@@ -164,28 +164,50 @@
 #  without telling them what to conclude?"
 # ============================================================
 
-from flask import Flask, render_template, request,  make_response, redirect, url_for
+from flask import Flask, render_template, request,  make_response, redirect, url_for, jsonify, g, abort
 from signals import (
     SUPPORT_SIGNAL,
     detect_support_signal,
     detect_systems_signal,
-    detect_exploration_signal
+    detect_exploration_signal,
+    detect_all,
+    fuzzy_signal_index,
+    signal_stream,
 )
+from catalog import (
+    QUESTIONS,
+    CONSENT_OFFER_REF,
+    CONSENT_LIMITS_REF,
+    question_ref,
+    followup_ref,
+)
+from text_features import TextFeatures
 from pathlib import Path
 import os
 from telemetry import EventLogger
+from timing import Timings
 
 from reflections import (
     collect_reflections,
-    generate_base_summary
+    generate_base_summary,
+    signal_vector,
+    unlocked_snippets,
 )
 from phase5.request import LLMRequest
 from phase5.roles import ParticipantRole, IntelligenceMode
 from phase5.boundary import LLMBoundary
+from phase5.intents import Intent, classify_intents
 from phase5.memory import validate_memory_text
 from datetime import datetime, timezone
 from memory.file_store import FileBackedMemoryStore
 from memory.storage import append_proposal
+from sessions import InMemorySessionStore, SQLiteSessionStore, SessionLocks
+from conversation import ConversationState
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from typing import Dict, Optional
+import atexit
+import threading
 import time
 import uuid
 
@@ -212,6 +234,27 @@ def attach_owner_cookie(resp, owner_id: str, created: bool):
         )
     return resp
 
+# Every request is timed as stage "request" of its route; spans
+# inside it (timings.span) are recorded under the same route.
+@app.before_request
+def start_request_timing():
+    rule = request.url_rule.rule if request.url_rule else "<unmatched>"
+    route = f"{request.method} {rule}"
+    g.timing = (route, timings.set_route(route), time.perf_counter_ns())
+
+@app.teardown_request
+def finish_request_timing(exc=None):
+    timing = g.pop("timing", None)
+    if timing is None:
+        return
+    route, token, start = timing
+    timings.record(route, "request", (time.perf_counter_ns() - start) // 1000)
+    timings.reset_route(token)
+
+def render(template, **context):
+    with timings.span("render"):
+        return render_template(template, **context)
+
 LOG_ENABLED = os.getenv("CAREER_EXPLORER_LOGGING", "0") == "1"
 
 # Create a sticky run id once per terminal/server start.
@@ -228,48 +271,102 @@ SHOULD_LOG = LOG_ENABLED and (IS_RELOADER_CHILD or not RELOADER_ACTIVE)
 logger = EventLogger(
     enabled=SHOULD_LOG,
     base_dir=Path(__file__).resolve().parent / "logs",
+    # Batched background writes instead of one open/append/close per event
+    async_mode=os.getenv("CAREER_EXPLORER_LOG_ASYNC", "0") == "1",
+    # Roll events over into gzipped numbered segments past this size
+    max_segment_bytes=int(os.getenv("CAREER_EXPLORER_LOG_SEGMENT_BYTES", 0)) or None,
+    # "compact": run fields once per segment, dictionary-encoded ids
+    event_format=os.getenv("CAREER_EXPLORER_LOG_FORMAT", "jsonl"),
 )
 
+# Per-route, per-stage latency histograms (see timing.py), served
+# at /debug/latency and flushed next to run_meta.json when logging.
+timings = Timings()
+LATENCY_FLUSH_SECONDS = float(os.getenv("CAREER_EXPLORER_LATENCY_FLUSH", 30))
+if logger.enabled:
+    timings.start_flusher(logger.run_dir / "latency.json", LATENCY_FLUSH_SECONDS)
+    atexit.register(timings.stop_flusher)
+
 llm_boundary = LLMBoundary()
-conversation_state = {
-    "session_id":str(uuid.uuid4()),
-    "stage": 1,
-    "responses": {},
-    "questions_logged": set(),
-    "followup": None,
-    "followup_answers": None,
-    "conversation_log": [],
-    "signal_counts": {
-        "support_seeking": 0,
-        "overwhelmed": 0,
-        "systems_thinking": 0,
-        "exploration_first": 0
-    },
-    "signal_escalated": {
-        "support_seeking": False
-    },
-    "feedback": {
-        "rating": "...",
-        "detail": "..."
-    },
-    "phase5_consent_token": "dev-consent",
-    "phase5_offer_shown": False,
-    "proposals_emitted": False
 
-}
-QUESTIONS = {
-    1: (
-        "Imagine you’re asked to help design a new app for helping people "
-        "navigate a city in a way that feels playful and less stressful.\n\n"
-        "What do you think this project is asking for?"
-    ),
-    2: "How would you actually start working on this?",
-    3: "What feels most challenging or uncertain when you think about executing this idea?"
-}
+# Sessions created on first visit start with dev consent (dev-friendly);
+# /reset starts a session without consent.
+DEV_PHASE5_CONSENT_TOKEN = "dev-consent"
+
+SESSION_BACKEND = os.getenv("CAREER_EXPLORER_SESSION_BACKEND", "memory")
+SESSION_TTL_SECONDS = float(os.getenv("CAREER_EXPLORER_SESSION_TTL", 60 * 60 * 2))
+
+if SESSION_BACKEND == "sqlite":
+    session_store = SQLiteSessionStore(
+        path=Path(os.getenv(
+            "CAREER_EXPLORER_SESSION_DB",
+            Path(__file__).resolve().parent / "sessions.sqlite3",
+        )),
+        encode=ConversationState.to_dict,
+        decode=ConversationState.from_dict,
+        ttl_seconds=SESSION_TTL_SECONDS,
+        purge_every=int(os.getenv("CAREER_EXPLORER_SESSION_PURGE_EVERY", 1_000)),
+    )
+else:
+    session_store = InMemorySessionStore(
+        max_sessions=int(os.getenv("CAREER_EXPLORER_MAX_SESSIONS", 10_000)),
+        ttl_seconds=SESSION_TTL_SECONDS,
+    )
 
+session_locks = SessionLocks()
 
+# Typo-tolerant signal keywords (opt-in). Submitted turns only:
+# /signals/stream stays exact (see stream_signals).
+FUZZY_SIGNALS = os.getenv("CAREER_EXPLORER_FUZZY_SIGNALS", "0") == "1"
+signal_fuzzy_index = (
+    fuzzy_signal_index(int(os.getenv("CAREER_EXPLORER_FUZZY_DISTANCE", 1)))
+    if FUZZY_SIGNALS
+    else None
+)
 
+# Live-typing signal streams, one per owner. Transient: kept in
+# memory only and dropped after a few idle minutes.
+typing_streams = InMemorySessionStore(
+    max_sessions=int(os.getenv("CAREER_EXPLORER_MAX_SESSIONS", 10_000)),
+    ttl_seconds=60 * 10,
+)
 
+# Rendered summary pages, keyed by session_id. An entry is only
+# served while the state's version matches the one it was built from.
+summary_cache = InMemorySessionStore(
+    max_sessions=int(os.getenv("CAREER_EXPLORER_MAX_SESSIONS", 10_000)),
+    ttl_seconds=SESSION_TTL_SECONDS,
+)
+
+# Summary precompute: the POST that finishes the last stage queues
+# the summary (and proposal emission) here; the summary GET waits
+# on it for at most SUMMARY_WAIT_SECONDS.
+SUMMARY_WORKERS = int(os.getenv("CAREER_EXPLORER_SUMMARY_WORKERS", 2))
+SUMMARY_WAIT_SECONDS = float(os.getenv("CAREER_EXPLORER_SUMMARY_WAIT", 2.0))
+summary_pool = ThreadPoolExecutor(max_workers=SUMMARY_WORKERS, thread_name_prefix="summary")
+# Caps queued + running jobs; past it the summary is built on request.
+_summary_slots = threading.BoundedSemaphore(SUMMARY_WORKERS * 8)
+summary_jobs: Dict[str, Future] = {}   # owner_id -> in-flight job
+_summary_jobs_lock = threading.Lock()
+
+@contextmanager
+def owner_session(owner_id):
+    """
+    Load (or start) the conversation for one owner and
+    store it back once the request is done with it.
+
+    Holds the owner's lock throughout, so double-submits and
+    parallel tabs apply one after another instead of racing.
+    """
+    with session_locks.hold(owner_id):
+        state = session_store.get(owner_id)
+        if state is None:
+            state = ConversationState.new(
+                owner_id=owner_id,
+                phase5_consent_token=DEV_PHASE5_CONSENT_TOKEN,
+            )
+        yield state
+        session_store.put(owner_id, state)
 
 MAX_STAGE = max(QUESTIONS.keys()) + 1
 
@@ -282,39 +379,54 @@ FEEDBACK_INTERPRETATION = {
 }
 
 
-def debug_log(title, data=None):
+def debug_log(title, data=None, conversation_state=None):
     print("\n" + "-" * 40)
     print(title)
     if data is not None:
         print(data)
-    logger.event(
-        session_id=conversation_state.get("session_id", "unknown"),
-        event_type=f"debug.{title.lower().replace(' ', '_')}",
-        payload=data if isinstance(data, dict) else {"data": data},
-    )
+    with timings.span("logger.event"):
+        logger.event(
+            session_id=conversation_state.session_id if conversation_state else "unknown",
+            event_type=f"debug.{title.lower().replace(' ', '_')}",
+            payload=data if isinstance(data, dict) else {"data": data},
+        )
 
 def append_to_log(
+    conversation_state,
     speaker: str,
-    content: str,
     content_type: str,
-    phase: int
+    phase: int,
+    content: Optional[str] = None,
+    ref: Optional[str] = None
 ):
-    entry = {
-        "id": str(uuid.uuid4()),
-        "speaker": speaker,           # "system" | "user" | "ai"
-        "content": content,
-        "content_type": content_type,
-        "phase": phase,
-        "timestamp": time.time()
-    }
+    with timings.span("append_to_log"):
+        # System text from the catalog is logged by reference (see catalog.py).
+        entry = conversation_state.append_log(
+            speaker=speaker,           # "system" | "user" | "ai"
+            content=content,
+            content_type=content_type,
+            phase=phase,
+            ref=ref,
+        )
 
-    conversation_state["conversation_log"].append(entry)
+        with timings.span("logger.event"):
+            logger.event(
+                session_id=conversation_state.session_id,
+                event_type="conversation.message",
+                payload=entry.to_dict(),
+            )
 
-    logger.event(
-        session_id=conversation_state.get("session_id", "unknown"),
-        event_type="conversation.message",
-        payload=entry,
-    )
+
+def log_event(conversation_state, event_type: str, payload: dict):
+    """
+    Telemetry that is not a conversation log entry.
+    """
+    with timings.span("logger.event"):
+        logger.event(
+            session_id=conversation_state.session_id,
+            event_type=event_type,
+            payload=payload,
+        )
 
 
 def insight_log(event, data=None):
@@ -324,37 +436,42 @@ def insight_log(event, data=None):
                 print(f"  - {k}: {v}")
 
 
-def looks_like_phase5_request(text: str) -> bool:
-    triggers = [
-        "analyze",
-        "analysis",
-        "pattern",
-        "what does this say",
-        "interpret",
-        "reason through",
-        "deeper"
-    ]
-    text_lower = text.lower()
-    return any(t in text_lower for t in triggers)
+def looks_like_phase5_request(text) -> bool:
+    # `text` may be a raw string or the turn's TextFeatures
+    return Intent.PHASE5_REQUEST in classify_intents(text)
 
-def should_offer_phase5_consent(user_input, state) -> bool:
-    if state["phase5_consent_token"] is not None:
+def should_offer_phase5_consent(intents, state) -> bool:
+    if state.phase5_consent_token is not None:
         return False
-    if state.get("phase5_offer_shown"):
+    if state.phase5_offer_shown:
         return False
-    if not looks_like_phase5_request(user_input):
+    if Intent.PHASE5_REQUEST not in intents:
         return False
     return True
 
-def should_explain_phase5_limits(user_input, state) -> bool:
-    if state["phase5_consent_token"] is not None:
+def should_explain_phase5_limits(intents, state) -> bool:
+    if state.phase5_consent_token is not None:
         return False
-    if not state.get("phase5_offer_shown"):
+    if not state.phase5_offer_shown:
         return False
-    return looks_like_phase5_request(user_input)
+    return Intent.PHASE5_REQUEST in intents
+
+
+def conversation_delta(conversation_state, after: int):
+    """
+    Log entries after the client's cursor, for incremental rendering.
+    The log is append-only and entry seq == position, so the cursor
+    is simply the number of entries the client already has.
+    """
+    log = conversation_state.conversation_log
+    return {
+        "entries": [e.to_dict() for e in log[max(after, 0):]],
+        "cursor": len(log),
+        "stage": conversation_state.stage,
+    }
 
 
-def generate_summary(responses, conversation_state):
+def generate_summary(responses, conversation_state, emit_proposals=True):
     summary = []
 
     # 1. Base heuristic summary (from reflections module)
@@ -365,222 +482,455 @@ def generate_summary(responses, conversation_state):
     summary.extend(reflections)
 
     # --- Phase 5.4 runtime proposal emission (NO approval) ---
-    owner_id = conversation_state.get("owner_id")
-    if owner_id and not conversation_state.get("proposals_emitted"):
+    # At most once per conversation: callers hold the owner lock
+    # on the stored state (or a claim on it, see
+    # _claim_proposals), and the flag is set before emitting.
+    owner_id = conversation_state.owner_id
+    if emit_proposals and owner_id and not conversation_state.proposals_emitted:
+        conversation_state.proposals_emitted = True
         for text in reflections:
-            append_proposal(
-                owner_id=owner_id,
-                proposed_text=text,
-                kind="SELF_OBSERVATION",
-                source_type="phase3_reflection",
-            )
-        conversation_state["proposals_emitted"] = True
+            with timings.span("append_proposal"):
+                append_proposal(
+                    owner_id=owner_id,
+                    proposed_text=text,
+                    kind="SELF_OBSERVATION",
+                    source_type="phase3_reflection",
+                )
     # --- end Phase 5.4 ---
 
     debug_log("SUMMARY FEEDBACK ALIGNMENT", {
-        "interpretation": conversation_state["feedback"].get("interpretation"),
+        "interpretation": conversation_state.feedback.get("interpretation"),
         "signals_visible": [
-            k for k, v in conversation_state["signal_counts"].items()
+            k for k, v in conversation_state.signal_counts.items()
             if v > 0
         ]
-    })
+    }, conversation_state=conversation_state)
 
     return " ".join(summary)
 
+def build_summary_page(conversation_state, emit_proposals=True):
+    with timings.span("generate_summary"):
+        summary = generate_summary(
+            conversation_state.responses,
+            conversation_state,
+            emit_proposals=emit_proposals,
+        )
+    print(conversation_state.conversation_log)
+    debug_log("SESSION INTERPRETATION", {
+        "signal_counts": conversation_state.signal_counts,
+        "escalations": conversation_state.signal_escalated,
+        "user_feedback": conversation_state.feedback
+    }, conversation_state=conversation_state)
+    return summary, render("summary.html", summary=summary)
+
+def render_summary_page(conversation_state, emit_proposals=True):
+    """
+    Summary page for the current state, built at most once per
+    state version. Refreshes and back-navigation are cache hits.
+    """
+    cached = summary_cache.get(conversation_state.session_id)
+    if cached is not None and cached[0] == conversation_state.version:
+        return cached[2]
+
+    summary, page = build_summary_page(conversation_state, emit_proposals)
+    summary_cache.put(
+        conversation_state.session_id,
+        (conversation_state.version, summary, page),
+    )
+    return page
+
+def start_summary_precompute(conversation_state):
+    """
+    Queue summary generation for a state that just reached the
+    summary stage. Call with the owner's lock held, after the
+    request's last mutation.
+    """
+    owner_id = conversation_state.owner_id
+    if owner_id is None:
+        return None
+    with _summary_jobs_lock:
+        if owner_id in summary_jobs:
+            return summary_jobs[owner_id]
+    if not _summary_slots.acquire(blocking=False):
+        return None  # pool saturated: the summary GET builds it inline
+
+    # The job works on a copy; the live state is stored back by
+    # the request that is still running.
+    snapshot = ConversationState.from_dict(conversation_state.to_dict())
+    try:
+        future = summary_pool.submit(_precompute_summary, snapshot)
+    except RuntimeError:  # pool shut down
+        _summary_slots.release()
+        return None
+    with _summary_jobs_lock:
+        summary_jobs[owner_id] = future
+    future.add_done_callback(lambda f: _summary_job_done(owner_id, f))
+    return future
+
+def _claim_proposals(owner_id, session_id):
+    """
+    Mark the stored conversation's proposals as emitted, under the
+    owner lock. True only for the caller that flipped the flag.
+    """
+    with session_locks.hold(owner_id):
+        state = session_store.get(owner_id)
+        if state is None or state.session_id != session_id or state.proposals_emitted:
+            return False
+        # Not a user-visible change: no touch(), so a cached page
+        # stays valid for this version.
+        state.proposals_emitted = True
+        session_store.put(owner_id, state)
+        return True
+
+def _precompute_summary(snapshot):
+    owner_id = snapshot.owner_id
+    # Claimed on the stored state first: a summary GET that did not
+    # see this job (it can run before the job is registered) builds
+    # the page inline, and only one of the two may emit.
+    emit = _claim_proposals(owner_id, snapshot.session_id)
+    with timings.route("summary_precompute"), app.app_context():
+        summary, page = build_summary_page(snapshot, emit_proposals=emit)
+
+    # Publish under the owner lock, held only briefly.
+    with session_locks.hold(owner_id):
+        state = session_store.get(owner_id)
+        if (
+            state is not None
+            and state.session_id == snapshot.session_id
+            and state.version == snapshot.version
+        ):
+            summary_cache.put(state.session_id, (state.version, summary, page))
+
+def _summary_job_done(owner_id, future):
+    _summary_slots.release()
+    with _summary_jobs_lock:
+        if summary_jobs.get(owner_id) is future:
+            del summary_jobs[owner_id]
+
+def wait_for_summary(owner_id):
+    """
+    Wait (up to SUMMARY_WAIT_SECONDS) for the owner's queued
+    summary. Returns True while a job is still running, in which
+    case it keeps ownership of proposal emission.
+    """
+    with _summary_jobs_lock:
+        job = summary_jobs.get(owner_id)
+    if job is None:
+        return False
+    try:
+        job.result(timeout=SUMMARY_WAIT_SECONDS)
+    except FutureTimeout:
+        return True
+    except Exception as exc:
+        debug_log("SUMMARY PRECOMPUTE FAILED", {"error": repr(exc)})
+    return False
+
 @app.route("/", methods=["GET", "POST"])
 def home():
-    global conversation_state
-    stage = conversation_state["stage"]
-
     owner_id, owner_created = get_or_create_owner_id()
-    conversation_state["owner_id"] = owner_id
-
-    if request.method == "POST":
-        user_input = request.form.get("user_input", "").strip()
-
-        # --- Phase 5 consent interception ---
-        if should_offer_phase5_consent(user_input, conversation_state):
-            conversation_state["phase5_offer_shown"] = True
-            append_to_log(
-                speaker="system",
-                content="AI-assisted reasoning is available with consent.",
-                content_type="consent_offer",
-                phase=5
-            )
-            resp = make_response(render_template("phase5_consent.html", prompt_type="offer"))
-            return attach_owner_cookie(resp, owner_id, owner_created)
-
-        if should_explain_phase5_limits(user_input, conversation_state):
-            append_to_log(
-                speaker="system",
-                content="Reflection-only mode is active. Analysis is disabled.",
-                content_type="consent_limits",
-                phase=5
-            )
-            resp = make_response(render_template("phase5_consent.html", prompt_type="limits"))
-            return attach_owner_cookie(resp, owner_id, owner_created)
-        # --- end Phase 5 interception ---
-
-        _ = llm_boundary.evaluate(
-            LLMRequest(
-                user_text=user_input,
-                role=ParticipantRole.OBSERVER,
-                intelligence_mode=IntelligenceMode.NONE,
-                consent_token=conversation_state["phase5_consent_token"],
-                disallowed_capabilities=["recommendation", "diagnosis"]
-            )
-        )
-
 
-        if user_input:
-            append_to_log(
-                speaker="user",
-                content=user_input,
-                content_type="user_response",
-                phase=conversation_state["stage"]
-            )
-
-            debug_log("USER INPUT", {
-                "stage": conversation_state["stage"],
-                "text": user_input,
-                "followup_active": bool(conversation_state["followup"])
-            })
-
-            # CASE 1: answering a follow-up
-            if conversation_state["followup"]:
-                conversation_state["followup_answers"] = user_input
-                conversation_state["followup"] = None
-                conversation_state["stage"] += 1
-
-                debug_log("FOLLOW-UP ANSWER STORED", {
-                    "answer": user_input,
-                    "next_stage": conversation_state["stage"]
+    # Client mode: `after` is the client's log cursor; reply with a JSON delta.
+    delta_after = request.args.get("after", type=int)
+
+    # Waits outside the owner lock: the job needs it to publish.
+    summary_pending = request.method == "GET" and wait_for_summary(owner_id)
+
+    with owner_session(owner_id) as conversation_state:
+        stage = start_stage = conversation_state.stage
+
+        if request.method == "POST":
+            # Any POST may change fields directly; invalidate cached views.
+            conversation_state.touch()
+            user_input = request.form.get("user_input", "").strip()
+            # Normalized + scanned once; every detector below reads this
+            with timings.span("signals.features"):
+                features = TextFeatures(user_input)
+                intents = classify_intents(features)
+
+            # --- Phase 5 consent interception ---
+            # The intercepted answer never enters the conversation
+            # log; it is logged so tools.replay can send it again.
+            if should_offer_phase5_consent(intents, conversation_state):
+                conversation_state.phase5_offer_shown = True
+                log_event(conversation_state, "conversation.intercepted_input", {
+                    "content": user_input, "stage": conversation_state.stage,
                 })
+                append_to_log(
+                    conversation_state,
+                    speaker="system",
+                    ref=CONSENT_OFFER_REF,
+                    content_type="consent_offer",
+                    phase=5
+                )
+                page = render("phase5_consent.html", prompt_type="offer")
+                resp = make_response(jsonify(page=page) if delta_after is not None else page)
+                return attach_owner_cookie(resp, owner_id, owner_created)
 
-            # CASE 2: normal stage response
-            else:
-                stage = conversation_state["stage"]
-                conversation_state["responses"][stage] = user_input
-
-                # Passive detection: systems thinking (summary-only)
-                if detect_systems_signal(user_input):
-                    conversation_state["signal_counts"]["systems_thinking"] += 1
-                # Passive detection: exploration-first (summary-only)
-                if detect_exploration_signal(user_input):
-                    conversation_state["signal_counts"]["exploration_first"] += 1
-
-                fired, debug_info = detect_support_signal(user_input)
-
-                if fired:
-                    conversation_state["signal_counts"]["support_seeking"] += 1
-                    count = conversation_state["signal_counts"]["support_seeking"]
-
-                    if count <= len(SUPPORT_SIGNAL["questions"]):
-                        # 1️⃣ Assign follow-up
-                        conversation_state["followup"] = SUPPORT_SIGNAL["questions"][count - 1]
-
-                        # 2️⃣ Log follow-up ONCE
-                        append_to_log(
-                            speaker="system",
-                            content=conversation_state["followup"],
-                            content_type="followup_question",
-                            phase=2
-                        )
-
-                        # 3️⃣ Lock escalation if needed
-                        if count == SUPPORT_SIGNAL["max_escalation"]:
-                            conversation_state["signal_escalated"]["support_seeking"] = True
-
-                    else:
-                        debug_log("SUPPORT SIGNAL OBSERVED (NO ESCALATION)", {
-                            "count": count,
-                            "reason": "already_escalated"
-                        })
+            if should_explain_phase5_limits(intents, conversation_state):
+                log_event(conversation_state, "conversation.intercepted_input", {
+                    "content": user_input, "stage": conversation_state.stage,
+                })
+                append_to_log(
+                    conversation_state,
+                    speaker="system",
+                    ref=CONSENT_LIMITS_REF,
+                    content_type="consent_limits",
+                    phase=5
+                )
+                page = render("phase5_consent.html", prompt_type="limits")
+                resp = make_response(jsonify(page=page) if delta_after is not None else page)
+                return attach_owner_cookie(resp, owner_id, owner_created)
+            # --- end Phase 5 interception ---
+
+            with timings.span("llm_boundary"):
+                _ = llm_boundary.evaluate(
+                    LLMRequest(
+                        user_text=user_input,
+                        role=ParticipantRole.OBSERVER,
+                        intelligence_mode=IntelligenceMode.NONE,
+                        consent_token=conversation_state.phase5_consent_token,
+                        disallowed_capabilities=["recommendation", "diagnosis"],
+                        text_features=features
+                    )
+                )
 
-                    # If the signal fired but we intentionally did not interrupt,
-                    # continue normal stage progression
-                    if conversation_state["followup"] is None:
-                        conversation_state["stage"] += 1
 
-                    debug_log("SUPPORT SIGNAL FIRED", {
-                        "signal": SUPPORT_SIGNAL["id"],
-                        "details": debug_info
-                    })
+            if user_input:
+                append_to_log(
+                    conversation_state,
+                    speaker="user",
+                    content=user_input,
+                    content_type="user_response",
+                    phase=conversation_state.stage
+                )
 
+                debug_log("USER INPUT", {
+                    "stage": conversation_state.stage,
+                    "text": user_input,
+                    "intents": sorted(intents),
+                    "followup_active": bool(conversation_state.followup)
+                }, conversation_state=conversation_state)
+
+                # CASE 1: answering a follow-up
+                if conversation_state.followup:
+                    conversation_state.followup_answers = user_input
+                    conversation_state.followup = None
+                    conversation_state.stage += 1
+
+                    debug_log("FOLLOW-UP ANSWER STORED", {
+                        "answer": user_input,
+                        "next_stage": conversation_state.stage
+                    }, conversation_state=conversation_state)
+
+                # CASE 2: normal stage response
                 else:
-                    conversation_state["stage"] += 1
-
-                    debug_log("SUPPORT SIGNAL NOT FIRED", {
-                        "signal": SUPPORT_SIGNAL["id"],
-                        "details": debug_info
-                    })
-            debug_log("STATE SUMMARY", {
-                "stage": conversation_state["stage"],
-                "followup_active": bool(conversation_state["followup"]),
-                "support_count": conversation_state["signal_counts"]["support_seeking"],
-                "support_escalated": conversation_state["signal_escalated"]["support_seeking"]
-            })
-
-            stage = conversation_state["stage"]
-
-    if stage in QUESTIONS:
-        # ----- Render state (every request) -----
-        question = QUESTIONS[stage]
-        alternate_question = None
-
-        # ----- Log question ONCE -----
-        if stage not in conversation_state["questions_logged"]:
-            append_to_log(
-                speaker="system",
-                content=question,
-                content_type="question",
-                phase=1
-            )
-            conversation_state["questions_logged"].add(stage)
-
-        # ----- Phase 5.2 paraphrase (render concern) -----
-        if conversation_state["phase5_consent_token"]:
-            paraphrase_response = llm_boundary.evaluate(
-                LLMRequest(
-                    user_text=question,
-                    role=ParticipantRole.OBSERVER,
-                    intelligence_mode=IntelligenceMode.SHALLOW,
-                    consent_token=conversation_state["phase5_consent_token"],
-                    disallowed_capabilities=["recommendation", "diagnosis"],
-                    content_type="question"
-                )
-            )
+                    stage = conversation_state.stage
+                    conversation_state.responses[stage] = user_input
+
+                    with timings.span("signals.detect"):
+                        # Reuses the turn's single scan
+                        matches = detect_all(features, fuzzy=signal_fuzzy_index)
+
+                        # Passive detection: systems thinking (summary-only)
+                        if detect_systems_signal(user_input, matches):
+                            conversation_state.signal_counts["systems_thinking"] += 1
+                        # Passive detection: exploration-first (summary-only)
+                        if detect_exploration_signal(user_input, matches):
+                            conversation_state.signal_counts["exploration_first"] += 1
+
+                        fired, debug_info = detect_support_signal(user_input, matches)
+
+                    if fired:
+                        conversation_state.signal_counts["support_seeking"] += 1
+                        count = conversation_state.signal_counts["support_seeking"]
+
+                        if count <= len(SUPPORT_SIGNAL["questions"]):
+                            # 1️⃣ Assign follow-up
+                            conversation_state.followup = SUPPORT_SIGNAL["questions"][count - 1]
+
+                            # 2️⃣ Log follow-up ONCE
+                            append_to_log(
+                                conversation_state,
+                                speaker="system",
+                                ref=followup_ref(count - 1),
+                                content_type="followup_question",
+                                phase=2
+                            )
+
+                            # 3️⃣ Lock escalation if needed
+                            if count == SUPPORT_SIGNAL["max_escalation"]:
+                                conversation_state.signal_escalated["support_seeking"] = True
+
+                        else:
+                            debug_log("SUPPORT SIGNAL OBSERVED (NO ESCALATION)", {
+                                "count": count,
+                                "reason": "already_escalated"
+                            }, conversation_state=conversation_state)
+
+                        # If the signal fired but we intentionally did not interrupt,
+                        # continue normal stage progression
+                        if conversation_state.followup is None:
+                            conversation_state.stage += 1
+
+                        debug_log("SUPPORT SIGNAL FIRED", {
+                            "signal": SUPPORT_SIGNAL["id"],
+                            "details": debug_info
+                        }, conversation_state=conversation_state)
 
-            if paraphrase_response.status == "paraphrased":
-                alternate_question = paraphrase_response.content
+                    else:
+                        conversation_state.stage += 1
+
+                        debug_log("SUPPORT SIGNAL NOT FIRED", {
+                            "signal": SUPPORT_SIGNAL["id"],
+                            "details": debug_info
+                        }, conversation_state=conversation_state)
+                debug_log("STATE SUMMARY", {
+                    "stage": conversation_state.stage,
+                    "followup_active": bool(conversation_state.followup),
+                    "support_count": conversation_state.signal_counts["support_seeking"],
+                    "support_escalated": conversation_state.signal_escalated["support_seeking"]
+                }, conversation_state=conversation_state)
+
+                stage = conversation_state.stage
+
+        if stage in QUESTIONS:
+            # ----- Render state (every request) -----
+            question = QUESTIONS[stage]
+            alternate_question = None
+
+            # ----- Log question ONCE -----
+            if stage not in conversation_state.questions_logged:
+                append_to_log(
+                    conversation_state,
+                    speaker="system",
+                    ref=question_ref(stage),
+                    content_type="question",
+                    phase=1
+                )
+                conversation_state.questions_logged.add(stage)
+
+            if delta_after is not None:
+                resp = make_response(jsonify(conversation_delta(conversation_state, delta_after)))
+                return attach_owner_cookie(resp, owner_id, owner_created)
+
+            # ----- Phase 5.2 paraphrase (render concern) -----
+            if conversation_state.phase5_consent_token:
+                with timings.span("llm_boundary"):
+                    paraphrase_response = llm_boundary.evaluate(
+                        LLMRequest(
+                            user_text=question,
+                            role=ParticipantRole.OBSERVER,
+                            intelligence_mode=IntelligenceMode.SHALLOW,
+                            consent_token=conversation_state.phase5_consent_token,
+                            disallowed_capabilities=["recommendation", "diagnosis"],
+                            content_type="question"
+                        )
+                    )
+
+                if paraphrase_response.status == "paraphrased":
+                    alternate_question = paraphrase_response.content
+
+            resp = make_response(render(
+                "index.html",
+                conversation_log=conversation_state.conversation_log,
+                question=question,
+                alternate_question=alternate_question,
+                followup=conversation_state.followup
+            ))
+            return attach_owner_cookie(resp, owner_id, owner_created)
+        # Otherwise, show summary
+        if request.method == "POST":
+            # The last stage was just answered: build the summary
+            # off-request and let the redirected GET pick it up.
+            if start_stage in QUESTIONS:
+                log_event(conversation_state, "conversation.completed", {"stage": start_stage})
+            start_summary_precompute(conversation_state)
+            if delta_after is None:
+                resp = make_response(redirect(url_for("home"), code=303))
+                return attach_owner_cookie(resp, owner_id, owner_created)
+
+        if delta_after is not None:
+            resp = make_response(jsonify(redirect=url_for("home")))
+            return attach_owner_cookie(resp, owner_id, owner_created)
 
-        resp = make_response(render_template(
-            "index.html",
-            conversation_log=conversation_state["conversation_log"],
-            question=question,
-            alternate_question=alternate_question,
-            followup=conversation_state["followup"]
+        resp = make_response(render_summary_page(
+            conversation_state,
+            emit_proposals=not summary_pending,
         ))
         return attach_owner_cookie(resp, owner_id, owner_created)
-    # Otherwise, show summary
-    summary = generate_summary(
-        conversation_state["responses"],
-        conversation_state
+@app.route("/signals/stream", methods=["POST"])
+def stream_signals():
+    """
+    Live signal detection while the user types.
+
+    Body: {"offset": n, "text": "..."} where `text` is what was
+    appended after the first n characters already sent.
+    offset 0 starts over. Any other offset must equal the length
+    received so far; otherwise the reply asks for a resync
+    (resend everything from offset 0).
+
+    Matching is exact even with CAREER_EXPLORER_FUZZY_SIGNALS on:
+    a word still being typed is often one edit from a keyword
+    ("explor"), so the live hints would fire early. The submitted
+    turn is what the fuzzy index scores.
+    """
+    owner_id, owner_created = get_or_create_owner_id()
+    payload = request.get_json(silent=True) or {}
+    offset = payload.get("offset", 0)
+    text = payload.get("text", "")
+    if not isinstance(offset, int) or not isinstance(text, str):
+        return jsonify({"error": "offset must be an int and text a string"}), 400
+
+    with session_locks.hold(owner_id):
+        stream = signal_stream() if offset == 0 else typing_streams.get(owner_id)
+        if stream is None or stream.length != offset:
+            resp = make_response(jsonify({"resync": True}))
+            return attach_owner_cookie(resp, owner_id, owner_created)
+        stream.feed(text)
+        typing_streams.put(owner_id, stream)
+        matches = stream.matches()
+
+    resp = make_response(jsonify({
+        "length": stream.length,
+        "fired": sorted(matches),
+        "signals": matches,
+    }))
+    return attach_owner_cookie(resp, owner_id, owner_created)
 
-    )
-    print(conversation_state["conversation_log"])
-    debug_log("SESSION INTERPRETATION", {
-        "signal_counts": conversation_state["signal_counts"],
-        "escalations": conversation_state["signal_escalated"],
-        "user_feedback": conversation_state["feedback"]
-    })
+@app.route("/conversation/log")
+def conversation_log():
+    owner_id, owner_created = get_or_create_owner_id()
+    after = request.args.get("after", default=0, type=int)
+
+    # Read-only: an unknown owner gets an empty log, not a stored session.
+    with session_locks.hold(owner_id):
+        conversation_state = session_store.get(owner_id)
+        if conversation_state is None:
+            delta = {"entries": [], "cursor": 0, "stage": min(QUESTIONS)}
+        else:
+            delta = conversation_delta(conversation_state, after)
+    resp = make_response(jsonify(delta))
+    return attach_owner_cookie(resp, owner_id, owner_created)
 
+def session_snapshot(conversation_state):
+    """
+    What a finished session leaves behind for offline tools.
+    unlocked_snippets records what this code unlocked, so runs
+    under different code can be compared without re-deriving it.
+    """
+    return {
+        "conversation_log": [
+            e.to_dict(resolve=False) for e in conversation_state.conversation_log
+        ],
+        "signal_counts": conversation_state.signal_counts,
+        "signal_escalated": conversation_state.signal_escalated,
+        "feedback": conversation_state.feedback,
+        "unlocked_snippets": list(unlocked_snippets(signal_vector(conversation_state))),
+    }
 
-    resp = make_response(render_template("summary.html", summary=summary))
-    return attach_owner_cookie(resp, owner_id, owner_created)
 @app.route("/feedback", methods=["POST"])
 def feedback():
-    global conversation_state
+    owner_id, owner_created = get_or_create_owner_id()
 
     feedback_value = request.form.get("feedback")
     feedback_detail = request.form.get("feedback_detail")
@@ -590,44 +940,34 @@ def feedback():
         "unknown"
     )
 
-    conversation_state["feedback"] = {
-        "rating": feedback_value,
-        "detail": feedback_detail,
-        "interpretation": interpretation
-    }
-
-    logger.event(
-        session_id=conversation_state["session_id"],
-        event_type="session.feedback_received",
-        payload=conversation_state["feedback"],
-    )
-
-    logger.write_session_snapshot(
-        session_id=conversation_state["session_id"],
-        snapshot={
-            "conversation_log": conversation_state["conversation_log"],
-            "signal_counts": conversation_state["signal_counts"],
-            "signal_escalated": conversation_state["signal_escalated"],
-            "feedback": conversation_state["feedback"],
-        },
-    )
+    with owner_session(owner_id) as conversation_state:
+        conversation_state.feedback = {
+            "rating": feedback_value,
+            "detail": feedback_detail,
+            "interpretation": interpretation
+        }
+        conversation_state.touch()
+
+        logger.event(
+            session_id=conversation_state.session_id,
+            event_type="session.feedback_received",
+            payload=conversation_state.feedback,
+        )
 
-    debug_log("USER FEEDBACK RECEIVED", {
-        "rating": feedback_value,
-        "interpretation": interpretation,
-        "detail": feedback_detail,
-        "signal_counts": conversation_state["signal_counts"],
-        "signal_escalated": conversation_state["signal_escalated"]
-    })
+        logger.write_session_snapshot(
+            session_id=conversation_state.session_id,
+            snapshot=session_snapshot(conversation_state),
+        )
 
-    owner_id = conversation_state.get("owner_id")
-    if not owner_id:
-        owner_id, owner_created = get_or_create_owner_id()
-    else:
-        owner_created = False
-    conversation_state["owner_id"] = owner_id
+        debug_log("USER FEEDBACK RECEIVED", {
+            "rating": feedback_value,
+            "interpretation": interpretation,
+            "detail": feedback_detail,
+            "signal_counts": conversation_state.signal_counts,
+            "signal_escalated": conversation_state.signal_escalated
+        }, conversation_state=conversation_state)
 
-    resp = make_response(render_template("feedback_thanks.html"))
+    resp = make_response(render("feedback_thanks.html"))
     return attach_owner_cookie(resp, owner_id, owner_created)
 
 @app.route("/memory")
@@ -641,7 +981,7 @@ def view_memory():
     proposals = load_proposals(owner_id)
     pending = [p for p in proposals if p.get("decision") == "pending"]
 
-    resp = make_response(render_template(
+    resp = make_response(render(
         "memory.html",
         memories=memories,
         proposal_count = len(pending),
@@ -658,7 +998,7 @@ def view_memory_proposals():
         p for p in load_proposals(owner_id)
         if p.get("decision") == "pending"
     ]
-    resp = make_response(render_template(
+    resp = make_response(render(
         "memory_proposals.html",
         proposals=proposals,
         owner_id=owner_id,
@@ -724,36 +1064,21 @@ def decline_memory_proposal(proposal_id):
     return redirect(url_for("view_memory_proposals"))
 
 
+@app.route("/debug/latency")
+def debug_latency():
+    """
+    Latency histograms per route and stage. Local requests only.
+    """
+    if request.remote_addr not in ("127.0.0.1", "::1"):
+        abort(404)
+    return jsonify(timings.snapshot())
+
+
 @app.route("/reset")
 def reset():
-    global conversation_state
     owner_id, owner_created = get_or_create_owner_id()
-    conversation_state = {
-        "session_id": str(uuid.uuid4()),
-        "owner_id": owner_id,
-        "stage": 1,
-        "responses": {},
-        "questions_logged": set(),
-        "followup": None,
-        "followup_answers": None,
-        "conversation_log": [],
-        "signal_counts": {
-            "support_seeking": 0,
-            "overwhelmed": 0,
-            "systems_thinking": 0,
-            "exploration_first": 0
-        },
-        "signal_escalated": {
-            "support_seeking": False
-        },
-        "feedback": {
-            "rating": "...",
-            "detail": "..."
-        },
-        "phase5_consent_token": None,
-        "phase5_offer_shown": False,
-        "proposals_emitted": False
-    }
+    with session_locks.hold(owner_id):
+        session_store.put(owner_id, ConversationState.new(owner_id=owner_id))
 
     resp = make_response(redirect(url_for("home")))
     return attach_owner_cookie(resp, owner_id, owner_created)
@@ -0,0 +1,96 @@
+# benchmarks/bench_event_format.py
+# ============================================================
+# Event Format Size and Throughput
+# ------------------------------------------------------------
+# Writes the same synthetic event stream with the "jsonl" and
+# "compact" formats (sync mode, one events file) and reports:
+#   - bytes on disk, raw and gzipped
+#   - encode+write throughput (events/second)
+#   - decode throughput through telemetry.iter_events
+# and checks the compact file decodes to the jsonl records.
+#
+# The stream mimics a live run: many sessions interleaved, a
+# handful of event types, small payloads.
+#
+# Run from the repo root:
+#   python benchmarks/bench_event_format.py [events]
+# ============================================================
+
+import gzip
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from telemetry import EventLogger, iter_events  # noqa: E402
+
+EVENT_TYPES = [
+    "conversation.message",
+    "debug.signal_detection",
+    "debug.llm_boundary",
+    "conversation.followup",
+    "feedback.submitted",
+]
+
+
+def synthetic_events(count, sessions=200, seed=3):
+    rng = random.Random(seed)
+    ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(sessions)]
+    for _ in range(count):
+        event_type = rng.choice(EVENT_TYPES)
+        if event_type == "conversation.message":
+            payload = {"phase": rng.randrange(1, 7), "speaker": "user", "content": "i would start by mapping"}
+        else:
+            payload = {"phase": rng.randrange(1, 7), "signals": {"uncertainty": rng.random() < 0.3}}
+        yield rng.choice(ids), event_type, payload
+
+
+def write_run(base_dir, event_format, events):
+    os.environ["CAREER_EXPLORER_RUN_ID"] = "bench-event-format"
+    logger = EventLogger(enabled=True, base_dir=base_dir / event_format, event_format=event_format)
+    start = time.perf_counter()
+    for session_id, event_type, payload in events:
+        logger.event(session_id, event_type, payload)
+    elapsed = time.perf_counter() - start
+    logger.close()
+    return logger, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    events = list(synthetic_events(count))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for event_format in ("jsonl", "compact"):
+            logger, write_s = write_run(Path(tmp), event_format, events)
+            raw = logger.events_path.read_bytes()
+            start = time.perf_counter()
+            records = list(iter_events(logger.run_dir))
+            read_s = time.perf_counter() - start
+            for record in records:
+                record.pop("ts")
+            results[event_format] = (len(raw), len(gzip.compress(raw)), write_s, read_s, records)
+
+    print(f"events: {count}")
+    base_raw, base_gz = results["jsonl"][0], results["jsonl"][1]
+    for event_format, (raw, gz, write_s, read_s, _) in results.items():
+        print(
+            f"{event_format:<8} raw {raw / 1e6:7.2f} MB ({raw / base_raw:5.1%})   "
+            f"gzip {gz / 1e6:6.2f} MB ({gz / base_gz:5.1%})   "
+            f"write {count / write_s:9,.0f} ev/s   read {count / read_s:9,.0f} ev/s"
+        )
+
+    if results["compact"][4] != results["jsonl"][4]:
+        print("compact records differ from jsonl records")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
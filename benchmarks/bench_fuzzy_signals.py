@@ -0,0 +1,83 @@
+# benchmarks/bench_fuzzy_signals.py
+# ============================================================
+# Fuzzy Signal Detection Latency
+# ------------------------------------------------------------
+# Per-turn detect_all() latency with and without the fuzzy
+# index, on answers where some keywords carry one typo.
+#
+# "cold" clears the per-token candidate cache before every
+# turn (worst case); "warm" keeps it, as a running server does.
+# Exits non-zero if cold p99 at distance 1 is over BUDGET_US.
+#
+# Run from the repo root:
+#   python benchmarks/bench_fuzzy_signals.py [turns]
+# ============================================================
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from signals import detect_all, fuzzy_signal_index  # noqa: E402
+from text_features import TextFeatures  # noqa: E402
+
+sys.path.insert(0, str(ROOT / "benchmarks"))
+from bench_signal_batch import synthetic_answers  # noqa: E402
+
+BUDGET_US = 1_000
+
+
+def typo(word, rng):
+    if len(word) < 5:
+        return word
+    i = rng.randrange(len(word) - 1)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def typo_answers(count, seed=7):
+    rng = random.Random(seed)
+    for text in synthetic_answers(count, seed=seed):
+        yield " ".join(typo(w, rng) if rng.random() < 0.2 else w for w in text.split())
+
+
+def per_turn_us(texts, fuzzy, cold):
+    timings = []
+    for text in texts:
+        if cold and fuzzy is not None:
+            fuzzy.candidates.cache_clear()
+        start = time.perf_counter()
+        detect_all(TextFeatures(text), fuzzy=fuzzy)
+        timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99) - 1]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    texts = list(typo_answers(count))
+
+    rows = [("exact", None, False)]
+    for distance in (1, 2):
+        index = fuzzy_signal_index(distance)
+        rows.append((f"fuzzy d={distance} cold", index, True))
+        rows.append((f"fuzzy d={distance} warm", index, False))
+
+    print(f"turns: {len(texts)}   budget (d=1 cold p99): {BUDGET_US} µs")
+    over_budget = False
+    for label, index, cold in rows:
+        p50, p99 = per_turn_us(texts, index, cold)
+        print(f"{label:<18} p50 {p50:8.1f} µs   p99 {p99:8.1f} µs")
+        if label == "fuzzy d=1 cold" and p99 > BUDGET_US:
+            over_budget = True
+
+    if over_budget:
+        print("over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_reflection_batch.py
+# ============================================================
+# Batch Reflection Evaluation Throughput
+# ------------------------------------------------------------
+# Compares sessions/second for:
+#   - a Python loop over every compiled condition (no memo)
+#   - a Python loop over unlocked_snippets() (memoized)
+#   - one batch_unlocked_snippets() call (NumPy)
+#
+# Sessions are synthetic snapshot "data" dicts. All three
+# results are checked to be identical. GC is paused while
+# timing (as timeit does) so collections triggered by the
+# million live dicts don't land on one variant.
+#
+# Run from the repo root:
+#   python benchmarks/bench_reflection_batch.py [sessions]
+# ============================================================
+
+import gc
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from types import SimpleNamespace  # noqa: E402
+
+from reflections import (  # noqa: E402
+    COMPILED_CONDITIONS,
+    REFLECTION_SNIPPETS,
+    batch_unlocked_snippets,
+    signal_matrix,
+    signal_vector,
+    unlocked_snippets,
+)
+
+
+def synthetic_sessions(count, seed=42):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield {
+            "signal_counts": {
+                "support_seeking": rng.randint(0, 4),
+                "overwhelmed": 0,
+                "systems_thinking": rng.randint(0, 3),
+                "exploration_first": rng.randint(0, 3),
+            },
+            "signal_escalated": {"support_seeking": rng.random() < 0.2},
+        }
+
+
+def scalar_unlocked(vector):
+    return tuple(
+        key
+        for key, snippet in REFLECTION_SNIPPETS.items()
+        if COMPILED_CONDITIONS[snippet["condition"]](vector)
+    )
+
+
+def timed(fn):
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        result = fn()
+        return result, time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    sessions = list(synthetic_sessions(count))
+
+    states = [SimpleNamespace(**s) for s in sessions]
+    scalar, scalar_s = timed(
+        lambda: [scalar_unlocked(signal_vector(s)) for s in states]
+    )
+    memo, memo_s = timed(
+        lambda: [unlocked_snippets(signal_vector(s)) for s in states]
+    )
+    matrix, load_s = timed(lambda: signal_matrix(sessions))
+    batch, batch_s = timed(lambda: batch_unlocked_snippets(sessions))
+
+    assert scalar == memo == batch, "batch and scalar results differ"
+
+    print(f"sessions: {count:,}")
+    print(f"scalar conditions loop:  {count / scalar_s:12,.0f} sessions/s  ({scalar_s:6.2f} s)")
+    print(f"memoized loop:           {count / memo_s:12,.0f} sessions/s  ({memo_s:6.2f} s)")
+    print(f"batch (NumPy):           {count / batch_s:12,.0f} sessions/s  ({batch_s:6.2f} s)")
+    print(f"  of which loading:      {load_s:6.2f} s for a {matrix.shape} matrix")
+    print(f"speedup vs scalar:       {scalar_s / batch_s:12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# benchmarks/bench_replay.py
+# ============================================================
+# Session Replay Throughput
+# ------------------------------------------------------------
+# Records a synthetic run (sessions interleaved as in a live
+# run, each answering every stage and then completing), then
+# reports:
+#   - grouping throughput of tools.replay.iter_recorded_sessions
+#     (sessions/second) and the most sessions it held at once
+#   - end-to-end tools.replay.replay throughput (sessions/minute)
+#     for 1 worker and for every core
+# and checks every session was replayed to completion.
+#
+# Run from the repo root:
+#   python benchmarks/bench_replay.py [sessions]
+# ============================================================
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from telemetry import EventLogger  # noqa: E402
+from tools import replay  # noqa: E402
+
+ANSWERS = [
+    "I would start by mapping how the pieces connect.",
+    "Trying things out and seeing what happens.",
+    "Whether the structure holds up once it grows.",
+]
+# Sessions in progress at any moment of the recorded run.
+CONCURRENT = 50
+
+
+def record_run(base_dir, sessions, seed=5):
+    os.environ["CAREER_EXPLORER_RUN_ID"] = "bench-replay"
+    logger = EventLogger(enabled=True, base_dir=base_dir)
+    rng = random.Random(seed)
+    waiting = list(range(sessions))
+    active = {}
+    while waiting or active:
+        while waiting and len(active) < CONCURRENT:
+            active[f"s{waiting.pop(0)}"] = 0
+        session_id = rng.choice(list(active))
+        answered = active[session_id]
+        logger.event(session_id, "conversation.message", {
+            "id": answered + 1, "speaker": "user", "content": ANSWERS[answered],
+            "content_type": "user_response", "phase": answered + 1, "timestamp": 0,
+        })
+        active[session_id] = answered + 1
+        if active[session_id] == len(ANSWERS):
+            logger.event(session_id, "conversation.completed", {"stage": len(ANSWERS)})
+            del active[session_id]
+    logger.close()
+    return logger.run_dir
+
+
+def grouping(run_dir):
+    held = 0
+    real = replay.iter_events
+
+    def counting(path):
+        nonlocal held
+        open_sessions = set()
+        for record in real(path):
+            if record["type"] == "conversation.completed":
+                open_sessions.discard(record["session_id"])
+            else:
+                open_sessions.add(record["session_id"])
+            held = max(held, len(open_sessions))
+            yield record
+
+    replay.iter_events = counting
+    try:
+        start = time.perf_counter()
+        count = sum(1 for _ in replay.iter_recorded_sessions(run_dir))
+        elapsed = time.perf_counter() - start
+    finally:
+        replay.iter_events = real
+    return count, elapsed, held
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    cores = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        logs = Path(tmp)
+        record_run(logs, sessions)
+        run_dir = logs / "runs" / "bench-replay"
+
+        count, group_s, held = grouping(run_dir)
+        print(f"sessions: {sessions}")
+        print(f"grouping     {count / group_s:9,.0f} sessions/s   held at most {held} sessions")
+
+        failed = False
+        for workers in sorted({1, cores}):
+            output = logs / f"replay-{workers}.jsonl"
+            start = time.perf_counter()
+            done = replay.replay(logs, output, workers=workers)
+            elapsed = time.perf_counter() - start
+            results = [json.loads(line) for line in output.read_text().splitlines()]
+            print(f"replay x{workers:<3}  {done / elapsed * 60:9,.0f} sessions/min")
+            failed = failed or done != sessions or not all(r.get("completed") for r in results)
+
+    if failed:
+        print("some sessions were not replayed to completion")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# benchmarks/bench_session_memory.py
+# ============================================================
+# Per-Session Memory Footprint
+# ------------------------------------------------------------
+# Compares bytes per session for:
+#   - the legacy nested-dict conversation_state
+#   - the slotted ConversationState / LogEntry records,
+#     with system text held by catalog reference
+#
+# Measured three ways: live objects, objects decoded from
+# stored JSON (as the SQLite backend does), and stored JSON size.
+#
+# Each simulated session answers three questions and one
+# follow-up, matching a typical run through the flow.
+#
+# Run from the repo root:
+#   python benchmarks/bench_session_memory.py [sessions]
+# ============================================================
+
+import json
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from catalog import QUESTIONS, followup_ref, question_ref, resolve  # noqa: E402
+from conversation import ConversationState  # noqa: E402
+
+
+def _turns(i):
+    for stage in QUESTIONS:
+        yield "system", question_ref(stage), "question", 1
+        yield "user", f"session {i} answer to stage {stage}", "user_response", stage
+    yield "system", followup_ref(0), "followup_question", 2
+    yield "user", f"session {i} follow-up answer", "user_response", 3
+
+
+def legacy_session(i):
+    state = {
+        "session_id": str(uuid.uuid4()),
+        "owner_id": str(uuid.uuid4()),
+        "stage": 4,
+        "responses": {},
+        "questions_logged": set(),
+        "followup": None,
+        "followup_answers": None,
+        "conversation_log": [],
+        "signal_counts": {
+            "support_seeking": 1,
+            "overwhelmed": 0,
+            "systems_thinking": 0,
+            "exploration_first": 0
+        },
+        "signal_escalated": {"support_seeking": False},
+        "feedback": {"rating": "...", "detail": "..."},
+        "phase5_consent_token": "dev-consent",
+        "phase5_offer_shown": False,
+        "proposals_emitted": False,
+    }
+    for speaker, content, content_type, phase in _turns(i):
+        state["conversation_log"].append({
+            "id": str(uuid.uuid4()),
+            "speaker": speaker,
+            "content": resolve(content) if speaker == "system" else content,
+            "content_type": content_type,
+            "phase": phase,
+            "timestamp": time.time(),
+        })
+        if speaker == "user":
+            state["responses"][phase] = content
+        else:
+            state["questions_logged"].add(phase)
+    return state
+
+
+def slotted_session(i):
+    state = ConversationState.new(owner_id=str(uuid.uuid4()), phase5_consent_token="dev-consent")
+    state.stage = 4
+    state.signal_counts["support_seeking"] = 1
+    for speaker, content, content_type, phase in _turns(i):
+        if speaker == "system":
+            state.append_log(speaker, None, content_type, phase, ref=content)
+        else:
+            state.append_log(speaker, content, content_type, phase)
+        if speaker == "user":
+            state.responses[phase] = content
+        else:
+            state.questions_logged.add(phase)
+    return state
+
+
+def legacy_stored(i):
+    state = legacy_session(i)
+    state["questions_logged"] = sorted(state["questions_logged"])
+    return json.dumps(state, ensure_ascii=False)
+
+
+def legacy_decoded(i):
+    return json.loads(legacy_stored(i))
+
+
+def slotted_stored(i):
+    return json.dumps(slotted_session(i).to_dict(), ensure_ascii=False)
+
+
+def slotted_decoded(i):
+    return ConversationState.from_dict(json.loads(slotted_stored(i)))
+
+
+def stored_bytes(factory, count):
+    return sum(len(factory(i).encode("utf-8")) for i in range(count)) / count
+
+
+def bytes_per_session(factory, count):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    sessions = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del sessions
+    return total / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    rows = [
+        ("live objects", bytes_per_session(legacy_session, count), bytes_per_session(slotted_session, count)),
+        ("decoded from JSON", bytes_per_session(legacy_decoded, count), bytes_per_session(slotted_decoded, count)),
+        ("stored JSON", stored_bytes(legacy_stored, count), stored_bytes(slotted_stored, count)),
+    ]
+
+    print(f"sessions: {count}  (bytes/session)")
+    print(f"{'':20} {'legacy dict':>12} {'slotted+refs':>13} {'reduction':>10}")
+    for label, legacy, slotted in rows:
+        print(f"{label:20} {legacy:12.0f} {slotted:13.0f} {100 * (1 - slotted / legacy):9.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_signal_batch.py
+# ============================================================
+# Batch Signal Detection Throughput
+# ------------------------------------------------------------
+# Compares texts/second for:
+#   - a Python loop over detect_all()
+#   - one detect_batch() call (NumPy)
+#
+# The corpus is user answers from the logs/runs/* event files when
+# any exist, otherwise synthetic answers built from the signal
+# keywords.
+#
+# Run from the repo root:
+#   python benchmarks/bench_signal_batch.py [texts]
+# ============================================================
+
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from signals import SIGNALS, detect_all, detect_batch  # noqa: E402
+from telemetry import iter_events  # noqa: E402
+
+FILLER = (
+    "i would start by mapping the main user journeys and then talk to people "
+    "who get lost in cities to find out what makes it stressful for them"
+).split()
+
+
+def logged_answers():
+    for run_dir in sorted(ROOT.glob("logs/runs/*/")):
+        for record in iter_events(run_dir):
+            payload = record.get("payload", {})
+            if record.get("type") == "conversation.message" and payload.get("speaker") == "user":
+                yield payload.get("content") or ""
+
+
+def synthetic_answers(count, seed=42):
+    rng = random.Random(seed)
+    keywords = [kw for signal in SIGNALS for kw in signal["keywords"]]
+    for _ in range(count):
+        words = rng.choices(FILLER, k=rng.randint(15, 60))
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        yield " ".join(words)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    texts = list(logged_answers())[:count]
+    source = "events.jsonl"
+    if not texts:
+        texts = list(synthetic_answers(count))
+        source = "synthetic"
+
+    start = time.perf_counter()
+    scalar = [detect_all(t) for t in texts]
+    scalar_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = detect_batch(texts)
+    batch_s = time.perf_counter() - start
+
+    fired = [[s["id"] in m for s in SIGNALS] for m in scalar]
+    assert batch.fired.tolist() == fired, "batch and scalar results differ"
+
+    print(f"texts: {len(texts)} ({source})")
+    print(f"detect_all loop: {len(texts) / scalar_s:12,.0f} texts/s")
+    print(f"detect_batch:    {len(texts) / batch_s:12,.0f} texts/s")
+    print(f"speedup:         {scalar_s / batch_s:12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# catalog.py
+# ============================================================
+# System Text Catalog
+# ------------------------------------------------------------
+# Purpose:
+# Hold every piece of static system text that can appear in a
+# conversation log, addressed by a short reference string.
+#
+# Log entries for system content store the reference; text is
+# resolved only when an entry is rendered or serialized for
+# readers. Identical wording is therefore held once per
+# process instead of once per session.
+#
+# Reference format:
+#   question:<stage>
+#   followup:<signal_id>:<index>
+#   consent:offer | consent:limits
+#
+# This module NEVER:
+#   - mutates state
+#   - decides which text to show
+# ============================================================
+
+from typing import Dict, Optional
+
+from signals import SUPPORT_SIGNAL
+
+QUESTIONS = {
+    1: (
+        "Imagine you’re asked to help design a new app for helping people "
+        "navigate a city in a way that feels playful and less stressful.\n\n"
+        "What do you think this project is asking for?"
+    ),
+    2: "How would you actually start working on this?",
+    3: "What feels most challenging or uncertain when you think about executing this idea?"
+}
+
+CONSENT_OFFER_TEXT = "AI-assisted reasoning is available with consent."
+CONSENT_LIMITS_TEXT = "Reflection-only mode is active. Analysis is disabled."
+
+CONSENT_OFFER_REF = "consent:offer"
+CONSENT_LIMITS_REF = "consent:limits"
+
+
+def question_ref(stage: int) -> str:
+    return _CANONICAL_REFS[f"question:{stage}"]
+
+
+def followup_ref(index: int, signal_id: str = SUPPORT_SIGNAL["id"]) -> str:
+    return _CANONICAL_REFS[f"followup:{signal_id}:{index}"]
+
+
+def _build_catalog() -> Dict[str, str]:
+    catalog = {
+        CONSENT_OFFER_REF: CONSENT_OFFER_TEXT,
+        CONSENT_LIMITS_REF: CONSENT_LIMITS_TEXT,
+    }
+    for stage, text in QUESTIONS.items():
+        catalog[f"question:{stage}"] = text
+    for index, text in enumerate(SUPPORT_SIGNAL["questions"]):
+        catalog[f"followup:{SUPPORT_SIGNAL['id']}:{index}"] = text
+    return catalog
+
+
+SYSTEM_TEXT = _build_catalog()
+
+# Maps any equal ref string to the single shared key object.
+_CANONICAL_REFS = {ref: ref for ref in SYSTEM_TEXT}
+
+
+# Reverse lookup, for logs written before entries carried refs.
+_REFS_BY_TEXT = {text: ref for ref, text in SYSTEM_TEXT.items()}
+
+
+def ref_for_text(text: str) -> Optional[str]:
+    """
+    The reference whose current text is exactly `text`, if any.
+    """
+    return _REFS_BY_TEXT.get(text)
+
+
+def canonical_ref(ref: str) -> str:
+    """
+    Return the shared instance of a reference string.
+    Used when decoding, so loaded sessions don't carry copies.
+    """
+    return _CANONICAL_REFS.get(ref, ref)
+
+
+def resolve(ref: str) -> str:
+    """
+    Resolve a catalog reference to its current text.
+    Raises KeyError for unknown references.
+    """
+    return SYSTEM_TEXT[ref]
@@ -0,0 +1,215 @@
+# conversation.py
+# ============================================================
+# Conversation State Records
+# ------------------------------------------------------------
+# Purpose:
+# Compact, slotted containers for one owner's conversation
+# and its message log.
+#
+# This module contains:
+#   - LogEntry: one message in the conversation log
+#   - ConversationState: the per-session stage machine state
+#   - to_dict / from_dict: the ONLY serialization boundary
+#
+# System text is stored by catalog reference (see catalog.py).
+#
+# This module NEVER:
+#   - detects signals
+#   - decides stage transitions
+#   - renders UI
+# ============================================================
+
+from __future__ import annotations
+
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+from catalog import canonical_ref, resolve as resolve_ref
+
+
+def _default_signal_counts() -> Dict[str, int]:
+    return {
+        "support_seeking": 0,
+        "overwhelmed": 0,
+        "systems_thinking": 0,
+        "exploration_first": 0
+    }
+
+
+def _default_signal_escalated() -> Dict[str, bool]:
+    return {
+        "support_seeking": False
+    }
+
+
+def _default_feedback() -> Dict[str, Any]:
+    return {
+        "rating": "...",
+        "detail": "..."
+    }
+
+
+@dataclass(slots=True)
+class LogEntry:
+    """
+    One conversation message.
+
+    `seq` is the entry's 1-based position in its session's log;
+    it replaces a per-entry uuid string.
+
+    Static system text is held as a catalog `ref` rather than a
+    copy of the text; `content` resolves it on access.
+    """
+    seq: int
+    speaker: str           # "system" | "user" | "ai"
+    text: Optional[str]
+    content_type: str
+    phase: int
+    timestamp: float
+    ref: Optional[str] = None
+
+    @property
+    def content(self) -> str:
+        if self.ref is not None:
+            return resolve_ref(self.ref)
+        return self.text
+
+    def to_dict(self, resolve: bool = True) -> Dict[str, Any]:
+        """
+        resolve=True gives the reader-facing message shape.
+        resolve=False keeps catalog refs (storage / snapshots).
+        """
+        data = {
+            "id": self.seq,
+            "speaker": self.speaker,
+        }
+        if resolve or self.ref is None:
+            data["content"] = self.content
+        else:
+            data["ref"] = self.ref
+        data["content_type"] = self.content_type
+        data["phase"] = self.phase
+        data["timestamp"] = self.timestamp
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LogEntry":
+        ref = data.get("ref")
+        return cls(
+            seq=data["id"],
+            speaker=data["speaker"],
+            text=None if ref is not None else data["content"],
+            content_type=data["content_type"],
+            phase=data["phase"],
+            timestamp=data["timestamp"],
+            ref=canonical_ref(ref) if ref is not None else None,
+        )
+
+
+@dataclass(slots=True)
+class ConversationState:
+    """
+    Per-owner conversation state.
+    Data container only — stage logic lives in app.py.
+
+    `version` grows with every mutation (see touch()), so views
+    derived from the state can be cached against it.
+    """
+    session_id: str
+    owner_id: Optional[str] = None
+    stage: int = 1
+    responses: Dict[int, str] = field(default_factory=dict)
+    questions_logged: Set[int] = field(default_factory=set)
+    followup: Optional[str] = None
+    followup_answers: Optional[str] = None
+    conversation_log: List[LogEntry] = field(default_factory=list)
+    signal_counts: Dict[str, int] = field(default_factory=_default_signal_counts)
+    signal_escalated: Dict[str, bool] = field(default_factory=_default_signal_escalated)
+    feedback: Dict[str, Any] = field(default_factory=_default_feedback)
+    phase5_consent_token: Optional[str] = None
+    phase5_offer_shown: bool = False
+    proposals_emitted: bool = False
+    version: int = 0
+
+    @classmethod
+    def new(cls, owner_id: Optional[str] = None, phase5_consent_token: Optional[str] = None) -> "ConversationState":
+        return cls(
+            session_id=str(uuid.uuid4()),
+            owner_id=owner_id,
+            phase5_consent_token=phase5_consent_token,
+        )
+
+    def touch(self) -> int:
+        """
+        Record a mutation. Call after changing any field directly;
+        append_log() does it for you.
+        """
+        self.version += 1
+        return self.version
+
+    def append_log(
+        self,
+        speaker: str,
+        content: Optional[str],
+        content_type: str,
+        phase: int,
+        ref: Optional[str] = None,
+    ) -> LogEntry:
+        entry = LogEntry(
+            seq=len(self.conversation_log) + 1,
+            speaker=speaker,
+            text=content,
+            content_type=content_type,
+            phase=phase,
+            timestamp=time.time(),
+            ref=ref,
+        )
+        self.conversation_log.append(entry)
+        self.touch()
+        return entry
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON-safe representation.
+        Sets become sorted lists; integer stage keys become strings;
+        system log entries keep their catalog refs.
+        """
+        return {
+            "session_id": self.session_id,
+            "owner_id": self.owner_id,
+            "stage": self.stage,
+            "responses": {str(k): v for k, v in self.responses.items()},
+            "questions_logged": sorted(self.questions_logged),
+            "followup": self.followup,
+            "followup_answers": self.followup_answers,
+            "conversation_log": [e.to_dict(resolve=False) for e in self.conversation_log],
+            "signal_counts": dict(self.signal_counts),
+            "signal_escalated": dict(self.signal_escalated),
+            "feedback": dict(self.feedback),
+            "phase5_consent_token": self.phase5_consent_token,
+            "phase5_offer_shown": self.phase5_offer_shown,
+            "proposals_emitted": self.proposals_emitted,
+            "version": self.version,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConversationState":
+        return cls(
+            session_id=data["session_id"],
+            owner_id=data.get("owner_id"),
+            stage=data["stage"],
+            responses={int(k): v for k, v in data["responses"].items()},
+            questions_logged=set(data["questions_logged"]),
+            followup=data.get("followup"),
+            followup_answers=data.get("followup_answers"),
+            conversation_log=[LogEntry.from_dict(e) for e in data["conversation_log"]],
+            signal_counts=dict(data["signal_counts"]),
+            signal_escalated=dict(data["signal_escalated"]),
+            feedback=dict(data["feedback"]),
+            phase5_consent_token=data.get("phase5_consent_token"),
+            phase5_offer_shown=data.get("phase5_offer_shown", False),
+            proposals_emitted=data.get("proposals_emitted", False),
+            version=data.get("version", 0),
+        )
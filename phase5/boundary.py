@@ -6,6 +6,7 @@ from .null_adapter import NullLLMAdapter
 from .paraphrase_adapter import ParaphraseAdapter
 from .roles import IntelligenceMode
 from .bounded_adapter import BoundedInterpretationAdapter
+from .intents import Intent, classify_intents
 
 
 class LLMBoundary:
@@ -29,7 +30,9 @@ class LLMBoundary:
 
         # --- Phase 5.3 explicit request detection ---
         if request.intelligence_mode == IntelligenceMode.BOUNDED:
-            if not self.is_explicit_interpretation_request(request.user_text):
+            if not self.is_explicit_interpretation_request(
+                request.text_features or request.user_text
+            ):
                 return LLMResponse(
                     status="ignored",
                     content=None
@@ -44,22 +47,12 @@ class LLMBoundary:
         return self.null_adapter.evaluate(request)
 
     @staticmethod
-    def is_explicit_interpretation_request(text: str) -> bool:
+    def is_explicit_interpretation_request(text) -> bool:
         """
         Returns True only if the user explicitly asks
         for interpretation / analysis of prior content.
-        """
-        triggers = [
-            "interpret",
-            "analyze",
-            "analysis",
-            "what does this say about",
-            "what does this suggest",
-            "possible interpretations",
-            "help me understand what this means",
-            "reflect on",
-        ]
 
-        lowered = text.lower()
-        return any(trigger in lowered for trigger in triggers)
+        Accepts raw text or precomputed TextFeatures.
+        """
+        return Intent.EXPLICIT_INTERPRETATION in classify_intents(text)
 
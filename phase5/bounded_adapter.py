@@ -2,6 +2,7 @@
 
 from .response import LLMResponse
 from .roles import IntelligenceMode
+from .intents import Intent, classify_intents
 
 IDENTITY_LOCKING_PHRASES = [
     "you are a ",
@@ -52,20 +53,12 @@ AUTHORITATIVE_PHRASES = [
     "i recommend that you",
 ]
 
-def requests_authoritative_guidance(text: str) -> bool:
+def requests_authoritative_guidance(text) -> bool:
+    # Accepts raw text or precomputed TextFeatures
     if not text:
         return False
 
-    triggers = [
-        "what should i do",
-        "tell me what to do",
-        "what is the best",
-        "what is the right",
-        "what do i need to do",
-    ]
-
-    lowered = text.lower()
-    return any(t in lowered for t in triggers)
+    return Intent.AUTHORITATIVE_GUIDANCE in classify_intents(text)
 
 def contextualize(text: str) -> str:
     return f"One possible interpretation is that {text} in this context."
@@ -0,0 +1,65 @@
+# phase5/intents.py
+"""
+Phase 5 intent router.
+
+Every Phase 5 trigger list lives here and is registered with the
+shared text_features matcher, so classifying a user turn is one
+scan that yields the full set of intents at once.
+
+Intents are routing hints only — they never grant capability.
+Policy and consent are still enforced by the boundary.
+"""
+
+from typing import FrozenSet, Union
+
+from text_features import TextFeatures, register_intent
+
+
+class Intent:
+    PHASE5_REQUEST = "phase5_request"
+    EXPLICIT_INTERPRETATION = "explicit_interpretation"
+    AUTHORITATIVE_GUIDANCE = "authoritative_guidance"
+
+
+INTENT_TRIGGERS = {
+    # User seems to want more than reflection (consent offer / limits)
+    Intent.PHASE5_REQUEST: [
+        "analyze",
+        "analysis",
+        "pattern",
+        "what does this say",
+        "interpret",
+        "reason through",
+        "deeper"
+    ],
+    # User explicitly asks for interpretation of prior content (Phase 5.3)
+    Intent.EXPLICIT_INTERPRETATION: [
+        "interpret",
+        "analyze",
+        "analysis",
+        "what does this say about",
+        "what does this suggest",
+        "possible interpretations",
+        "help me understand what this means",
+        "reflect on",
+    ],
+    # User asks to be told what to do (never answered authoritatively)
+    Intent.AUTHORITATIVE_GUIDANCE: [
+        "what should i do",
+        "tell me what to do",
+        "what is the best",
+        "what is the right",
+        "what do i need to do",
+    ],
+}
+
+for _intent, _triggers in INTENT_TRIGGERS.items():
+    register_intent(_intent, _triggers)
+
+
+def classify_intents(text: Union[str, TextFeatures]) -> FrozenSet[str]:
+    """
+    Return every intent whose triggers appear in `text`.
+    Cached on the TextFeatures, so repeated calls are free.
+    """
+    return TextFeatures.of(text).intents
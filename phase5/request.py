@@ -17,4 +17,5 @@ class LLMRequest:
     disallowed_capabilities: List[str]
     content_type: Optional[str] = None # "question" | "summary" | None
     phase_context: Optional[Dict[str, Any]] = None  # ✅ FIXED
+    text_features: Optional[Any] = None  # TextFeatures for user_text, if already computed
 
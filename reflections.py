@@ -1,9 +1,13 @@
 """
-This module expects conversation_state to contain:
+This module expects conversation_state to expose:
 - signal_counts: dict
 - signal_escalated: dict
 """
 
+from functools import lru_cache
+
+from text_features import TextFeatures, register_phrases
+
 
 REFLECTION_SNIPPETS = {
     "uncertainty_observed": {
@@ -39,23 +43,215 @@ REFLECTION_SNIPPETS = {
 }
 DEBUG_REFLECTIONS = True
 
+# ------------------------------------------------------------
+# Reflection Conditions
+# ------------------------------------------------------------
+# Each condition is data: minimum signal counts plus required
+# escalation flags. They are compiled once into predicates over
+# a signal vector (counts, then flags), and the snippets a vector
+# unlocks are memoized, so a render costs one vector build and
+# one lookup however many snippets exist. Unlocked snippets are
+# recomputed only when signal_counts / signal_escalated change.
+# ------------------------------------------------------------
+
+REFLECTION_CONDITIONS = {
+    "support_seeking_escalated": {
+        "escalated": {"support_seeking": True},
+    },
+    "support_seeking_observed": {
+        "min_counts": {"support_seeking": 2},
+        "escalated": {"support_seeking": False},
+    },
+    "systems_thinking_observed": {
+        "min_counts": {"systems_thinking": 1},
+    },
+    "exploration_first_observed": {
+        "min_counts": {"exploration_first": 2},
+    },
+}
+
+VECTOR_COUNTS = sorted({
+    signal_id
+    for rule in REFLECTION_CONDITIONS.values()
+    for signal_id in rule.get("min_counts", {})
+})
+VECTOR_FLAGS = sorted({
+    signal_id
+    for rule in REFLECTION_CONDITIONS.values()
+    for signal_id in rule.get("escalated", {})
+})
+
+
+def signal_vector(conversation_state):
+    counts = conversation_state.signal_counts
+    escalated = conversation_state.signal_escalated
+    return (
+        tuple(counts.get(s, 0) for s in VECTOR_COUNTS)
+        + tuple(bool(escalated.get(s, False)) for s in VECTOR_FLAGS)
+    )
+
+
+def _condition_checks(rule):
+    # (vector index, wanted): an int is a minimum count, a bool an exact flag
+    return tuple(
+        (VECTOR_COUNTS.index(s), threshold)
+        for s, threshold in rule.get("min_counts", {}).items()
+    ) + tuple(
+        (len(VECTOR_COUNTS) + VECTOR_FLAGS.index(s), expected)
+        for s, expected in rule.get("escalated", {}).items()
+    )
+
+
+CONDITION_CHECKS = {
+    name: _condition_checks(rule)
+    for name, rule in REFLECTION_CONDITIONS.items()
+}
+
+
+def _compile_condition(checks):
+    def predicate(vector):
+        for i, want in checks:
+            if type(want) is bool:
+                if vector[i] is not want:
+                    return False
+            elif vector[i] < want:
+                return False
+        return True
+
+    return predicate
+
+
+COMPILED_CONDITIONS = {
+    name: _compile_condition(checks)
+    for name, checks in CONDITION_CHECKS.items()
+}
+
+
+@lru_cache(maxsize=4096)
+def unlocked_snippets(vector):
+    """
+    Snippet keys (in REFLECTION_SNIPPETS order) unlocked by a
+    signal vector. Computed once per distinct vector.
+    """
+    return tuple(
+        key
+        for key, snippet in REFLECTION_SNIPPETS.items()
+        if snippet.get("condition") in COMPILED_CONDITIONS
+        and COMPILED_CONDITIONS[snippet["condition"]](vector)
+    )
+
+
 def check_reflection_condition(condition, conversation_state):
-    if condition == "support_seeking_escalated":
-        return conversation_state["signal_escalated"].get("support_seeking", False)
+    predicate = COMPILED_CONDITIONS.get(condition)
+    if predicate is None:
+        return False
+    return predicate(signal_vector(conversation_state))
 
-    if condition == "support_seeking_observed":
-        return (
-            conversation_state["signal_counts"].get("support_seeking", 0) >= 2
-            and not conversation_state["signal_escalated"].get("support_seeking", False)
-        )
+# ------------------------------------------------------------
+# Batch Evaluation (offline, NumPy)
+# ------------------------------------------------------------
+# For analysing many session snapshots at once. Signal vectors
+# are stacked into one (sessions x vector) matrix, every
+# condition becomes a column mask built from the same
+# CONDITION_CHECKS as the scalar predicates, and each session's
+# row of snippet bits is mapped to its key tuple via a lookup
+# table, so results are identical to unlocked_snippets().
+# ------------------------------------------------------------
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the batch API
+    np = None
 
-    if condition == "systems_thinking_observed":
-        return conversation_state["signal_counts"].get("systems_thinking", 0) >= 1
+SNIPPET_KEYS = list(REFLECTION_SNIPPETS)
 
-    if condition == "exploration_first_observed":
-        return conversation_state["signal_counts"].get("exploration_first", 0) >= 2
 
-    return False
+def _signal_maps(item):
+    # A conversation state, a snapshot's "data" dict, or a
+    # full snapshot file record -> (signal_counts, signal_escalated)
+    if hasattr(item, "signal_counts"):
+        return item.signal_counts, item.signal_escalated
+    if "data" in item and "signal_counts" not in item:
+        item = item["data"]
+    return item.get("signal_counts") or {}, item.get("signal_escalated") or {}
+
+
+def signal_matrix(items):
+    """
+    Stack signal vectors into an int64 matrix, one row per item,
+    columns VECTOR_COUNTS then VECTOR_FLAGS (flags as 0/1).
+    Row i equals signal_vector() of item i.
+    """
+    if np is None:
+        raise ImportError("signal_matrix() requires numpy")
+    maps = [_signal_maps(item) for item in items]
+    n = len(maps)
+    matrix = np.empty((n, len(VECTOR_COUNTS) + len(VECTOR_FLAGS)), dtype=np.int64)
+    for j, s in enumerate(VECTOR_COUNTS):
+        matrix[:, j] = np.fromiter((c.get(s, 0) for c, _ in maps), dtype=np.int64, count=n)
+    for j, s in enumerate(VECTOR_FLAGS, start=len(VECTOR_COUNTS)):
+        matrix[:, j] = np.fromiter((bool(e.get(s, False)) for _, e in maps), dtype=np.int64, count=n)
+    return matrix
+
+
+def condition_masks(matrix):
+    """
+    condition name -> bool array, one entry per matrix row.
+    """
+    masks = {}
+    for name, checks in CONDITION_CHECKS.items():
+        mask = np.ones(len(matrix), dtype=bool)
+        for i, want in checks:
+            if type(want) is bool:
+                mask &= matrix[:, i] == int(want)
+            else:
+                mask &= matrix[:, i] >= want
+        masks[name] = mask
+    return masks
+
+
+def unlocked_matrix(matrix):
+    """
+    bool array (rows x SNIPPET_KEYS): snippet unlocked per session.
+    """
+    masks = condition_masks(matrix)
+    unlocked = np.zeros((len(matrix), len(SNIPPET_KEYS)), dtype=bool)
+    for j, key in enumerate(SNIPPET_KEYS):
+        condition = REFLECTION_SNIPPETS[key].get("condition")
+        if condition in masks:
+            unlocked[:, j] = masks[condition]
+    return unlocked
+
+
+def batch_unlocked_snippets(items):
+    """
+    Unlocked snippet keys for every item, in input order.
+    Each entry equals unlocked_snippets(signal_vector(item)).
+    """
+    unlocked = unlocked_matrix(signal_matrix(items))
+    if not len(unlocked):
+        return []
+
+    if len(SNIPPET_KEYS) <= 62:
+        # One int64 bit code per row; few distinct codes in practice.
+        weights = np.left_shift(1, np.arange(len(SNIPPET_KEYS), dtype=np.int64))
+        table = {}
+        result = []
+        for code in (unlocked.astype(np.int64) @ weights).tolist():
+            keys = table.get(code)
+            if keys is None:
+                keys = tuple(k for j, k in enumerate(SNIPPET_KEYS) if code >> j & 1)
+                table[code] = keys
+            result.append(keys)
+        return result
+
+    patterns, inverse = np.unique(unlocked, axis=0, return_inverse=True)
+    table = [
+        tuple(key for key, on in zip(SNIPPET_KEYS, row) if on)
+        for row in patterns.tolist()
+    ]
+    return [table[i] for i in inverse.reshape(-1).tolist()]
+
 
 def reflection_debug(event, data=None):
     """
@@ -74,18 +270,12 @@ def collect_reflections(conversation_state):
     unlocked conditions. No logic or interpretation lives here.
     """
 
-    reflections = []
-    unlocked = []
-
-    for key, snippet in REFLECTION_SNIPPETS.items():
-        condition = snippet.get("condition")
-
-        if condition and check_reflection_condition(condition, conversation_state):
-            reflections.append(snippet["text"])
-            unlocked.append({
-                "snippet": key,
-                "condition": condition
-            })
+    keys = unlocked_snippets(signal_vector(conversation_state))
+    reflections = [REFLECTION_SNIPPETS[key]["text"] for key in keys]
+    unlocked = [
+        {"snippet": key, "condition": REFLECTION_SNIPPETS[key]["condition"]}
+        for key in keys
+    ]
 
     # Debug-only visibility
     if DEBUG_REFLECTIONS:
@@ -93,8 +283,8 @@ def collect_reflections(conversation_state):
             "Reflections collected",
             {
                 "unlocked_snippets": unlocked,
-                "signal_counts": conversation_state["signal_counts"],
-                "signal_escalated": conversation_state["signal_escalated"]
+                "signal_counts": conversation_state.signal_counts,
+                "signal_escalated": conversation_state.signal_escalated
             }
         )
 
@@ -129,33 +319,39 @@ EXPLORATION_WORDS = [
     "learn", "experiment", "research"
 ]
 
+register_phrases("summary_systems_words", SYSTEMS_WORDS)
+register_phrases("summary_support_words", SUPPORT_WORDS)
+register_phrases("summary_exploration_words", EXPLORATION_WORDS)
+
 
 def generate_base_summary(responses):
     """
     Generates heuristic, non-reflective summary sentences
     based purely on language patterns in responses.
+
+    Response values may be raw text or TextFeatures.
     """
 
     summary = []
     matched_any_pattern = False
 
-    r1 = responses.get(1, "").lower()
-    r2 = responses.get(2, "").lower()
-    r3 = responses.get(3, "").lower()
+    r1 = TextFeatures.of(responses.get(1, ""))
+    r2 = TextFeatures.of(responses.get(2, ""))
+    r3 = TextFeatures.of(responses.get(3, ""))
 
-    if any(word in r1 for word in EXPLORATION_WORDS):
+    if r1.matched("summary_exploration_words"):
         summary.append(
             "You approach new problems by exploring and understanding context before committing to solutions."
         )
         matched_any_pattern = True
 
-    if any(word in r2 for word in SYSTEMS_WORDS):
+    if r2.matched("summary_systems_words"):
         summary.append(
             "You tend to think in terms of systems, features, and interactions rather than linear task lists."
         )
         matched_any_pattern = True
 
-    if any(word in r3 for word in SUPPORT_WORDS):
+    if r3.matched("summary_support_words"):
         summary.append(
             "You appear to benefit from external guidance or feedback when moving from ideas into execution."
         )
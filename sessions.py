@@ -0,0 +1,250 @@
+# sessions.py
+# ============================================================
+# Per-Owner Session Storage
+# ------------------------------------------------------------
+# Purpose:
+# Hold one conversation state per owner (the ce_owner_id
+# cookie), so concurrent users never share a stage machine.
+#
+# This module contains:
+#   - SessionStore: the pluggable storage interface
+#   - InMemorySessionStore: in-process LRU with TTL eviction
+#   - SQLiteSessionStore: shared, file-backed sessions
+#   - SessionLocks: per-owner request serialization
+#
+# This module NEVER:
+#   - interprets conversation state
+#   - creates new sessions on its own
+#   - renders UI
+# ============================================================
+
+from __future__ import annotations
+
+import itertools
+import json
+import sqlite3
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+class SessionStore(ABC):
+    """
+    Storage interface for per-owner conversation state.
+
+    Implementations must be safe to call from multiple threads.
+    """
+
+    @abstractmethod
+    def get(self, owner_id: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def put(self, owner_id: str, state: Any) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, owner_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    In-process session store.
+
+    - Least-recently-used sessions are evicted past max_sessions
+    - Sessions idle longer than ttl_seconds are treated as gone
+    - State objects are stored by reference (no copying)
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 10_000,
+        ttl_seconds: Optional[float] = 60 * 60 * 2,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expired(self, touched_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - touched_at > self.ttl_seconds
+
+    def get(self, owner_id: str) -> Optional[Any]:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(owner_id)
+            if entry is None:
+                return None
+            state, touched_at = entry
+            if self._expired(touched_at, now):
+                del self._entries[owner_id]
+                return None
+            self._entries[owner_id] = (state, now)
+            self._entries.move_to_end(owner_id)
+            return state
+
+    def put(self, owner_id: str, state: Any) -> None:
+        now = self._clock()
+        with self._lock:
+            self._entries[owner_id] = (state, now)
+            self._entries.move_to_end(owner_id)
+            self._evict(now)
+
+    def delete(self, owner_id: str) -> None:
+        with self._lock:
+            self._entries.pop(owner_id, None)
+
+    def _evict(self, now: float) -> None:
+        # Oldest entries sit at the front, so expired ones are found first.
+        while self._entries:
+            owner_id, (_, touched_at) = next(iter(self._entries.items()))
+            if len(self._entries) > self.max_sessions or self._expired(touched_at, now):
+                self._entries.popitem(last=False)
+            else:
+                break
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite-backed session store.
+
+    Sessions survive restarts and can be shared by several worker
+    processes. State is converted with `encode` / `decode` so this
+    store never needs to know the shape of a conversation.
+
+    Expired rows are purged every `purge_every` writes (per
+    process), so the table does not grow with abandoned sessions.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        encode: Callable[[Any], Dict[str, Any]],
+        decode: Callable[[Dict[str, Any]], Any],
+        ttl_seconds: Optional[float] = 60 * 60 * 2,
+        clock: Callable[[], float] = time.time,
+        purge_every: Optional[int] = 1_000,
+    ) -> None:
+        self.path = Path(path)
+        self.encode = encode
+        self.decode = decode
+        self.ttl_seconds = ttl_seconds
+        self.purge_every = purge_every
+        self._clock = clock
+        self._local = threading.local()
+        self._writes = itertools.count(1)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " owner_id TEXT PRIMARY KEY,"
+            " state TEXT NOT NULL,"
+            " touched_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS sessions_touched ON sessions (touched_at)")
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread; SQLite handles cross-thread locking.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, owner_id: str) -> Optional[Any]:
+        row = self._conn().execute(
+            "SELECT state, touched_at FROM sessions WHERE owner_id = ?",
+            (owner_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        state, touched_at = row
+        if self.ttl_seconds is not None and self._clock() - touched_at > self.ttl_seconds:
+            self.delete(owner_id)
+            return None
+        return self.decode(json.loads(state))
+
+    def put(self, owner_id: str, state: Any) -> None:
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions (owner_id, state, touched_at) VALUES (?, ?, ?)",
+            (owner_id, json.dumps(self.encode(state), ensure_ascii=False), self._clock()),
+        )
+        conn.commit()
+        if self.purge_every and next(self._writes) % self.purge_every == 0:
+            self.purge_expired()
+
+    def delete(self, owner_id: str) -> None:
+        conn = self._conn()
+        conn.execute("DELETE FROM sessions WHERE owner_id = ?", (owner_id,))
+        conn.commit()
+
+    def purge_expired(self) -> int:
+        """
+        Remove sessions idle longer than ttl_seconds.
+        Returns the number of sessions removed.
+        """
+        if self.ttl_seconds is None:
+            return 0
+        conn = self._conn()
+        cur = conn.execute(
+            "DELETE FROM sessions WHERE touched_at < ?",
+            (self._clock() - self.ttl_seconds,),
+        )
+        conn.commit()
+        return cur.rowcount
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+class SessionLocks:
+    """
+    One lock per owner_id.
+
+    Requests for the same owner serialize; requests for different
+    owners never wait on each other. Locks are held weakly, so an
+    owner's lock disappears once no request is using it.
+    """
+
+    def __init__(self) -> None:
+        self._locks: "weakref.WeakValueDictionary[str, threading.RLock]" = weakref.WeakValueDictionary()
+        # Guards lock lookup/creation only; never held while a request runs.
+        self._registry_lock = threading.Lock()
+
+    def lock_for(self, owner_id: str) -> threading.RLock:
+        with self._registry_lock:
+            lock = self._locks.get(owner_id)
+            if lock is None:
+                lock = threading.RLock()
+                self._locks[owner_id] = lock
+            return lock
+
+    @contextmanager
+    def hold(self, owner_id: str) -> Iterator[None]:
+        lock = self.lock_for(owner_id)
+        with lock:
+            yield
+
+    def __len__(self) -> int:
+        return len(self._locks)
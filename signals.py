@@ -8,7 +8,11 @@
 #
 # This module contains:
 #   - signal metadata (keywords, ids)
+#   - a signal registry (compiled via text_features)
 #   - pure detection functions
+#   - opt-in typo-tolerant (fuzzy) detection
+#   - streaming detection for text typed a piece at a time
+#   - a batch (NumPy) API for offline corpora
 #
 # This module NEVER:
 #   - mutates state
@@ -16,6 +20,24 @@
 #   - renders UI
 # ============================================================
 
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from text_features import (
+    FuzzyPhraseIndex,
+    PhraseAutomaton,
+    PhraseMatcher,
+    PhraseStream,
+    TextFeatures,
+    normalize,
+    register_phrases,
+)
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for detect_batch()
+    np = None
+
 # ----------------------------
 # Support-Seeking / Uncertainty
 # ----------------------------
@@ -42,10 +64,8 @@ SUPPORT_SIGNAL = {
 
 
 }
-def detect_support_signal(text):
-    text = text.lower()
-
-    matched = [kw for kw in SUPPORT_SIGNAL["keywords"] if kw in text]
+def detect_support_signal(text, matches=None):
+    matched = _matched(SUPPORT_SIGNAL, text, matches)
 
     if matched:
         return True, {
@@ -72,9 +92,8 @@ SYSTEMS_SIGNAL = {
     ]
 }
 
-def detect_systems_signal(text):
-    text = text.lower()
-    return any(kw in text for kw in SYSTEMS_SIGNAL["keywords"])
+def detect_systems_signal(text, matches=None):
+    return bool(_matched(SYSTEMS_SIGNAL, text, matches))
 
 
 # ----------------------------
@@ -90,6 +109,257 @@ EXPLORATION_SIGNAL = {
 }
 
 
-def detect_exploration_signal(text):
-    text = text.lower()
-    return any(kw in text for kw in EXPLORATION_SIGNAL["keywords"])
+def detect_exploration_signal(text, matches=None):
+    return bool(_matched(EXPLORATION_SIGNAL, text, matches))
+
+
+# ----------------------------
+# Signal Registry
+# ----------------------------
+# Every signal's keywords are registered as a phrase group in
+# text_features, which compiles all groups into one matcher.
+# A detect_all() call therefore lowers and scans the text once,
+# and a TextFeatures built earlier in the turn is reused as-is.
+
+SIGNALS = [SUPPORT_SIGNAL, SYSTEMS_SIGNAL, EXPLORATION_SIGNAL]
+
+for _signal in SIGNALS:
+    register_phrases(_signal["id"], _signal["keywords"])
+
+
+def detect_all(
+    text: Union[str, TextFeatures],
+    fuzzy: Optional[FuzzyPhraseIndex] = None,
+) -> Dict[str, List[str]]:
+    """
+    Run every registered signal over `text` in one pass.
+    Signals that did not fire are absent from the result.
+
+    With a `fuzzy` index (see fuzzy_signal_index), keywords that
+    only match with typos are added, reported by their canonical
+    spelling and kept in keyword order.
+    """
+    features = TextFeatures.of(text)
+    result = {
+        signal["id"]: features.matched(signal["id"])
+        for signal in SIGNALS
+        if features.matched(signal["id"])
+    }
+    if fuzzy is None:
+        return result
+
+    for signal_id, keywords in fuzzy.match(features.tokens).items():
+        exact = result.get(signal_id, [])
+        if set(keywords) <= set(exact):
+            continue
+        order = _KEYWORD_ORDER[signal_id]
+        result[signal_id] = sorted(set(exact) | set(keywords), key=order.__getitem__)
+    return result
+
+
+# Real words one edit from a keyword word. A typo index would
+# read them as misspelt keywords ("I want to ensure" as unsure,
+# "a steep slope" as scope), so they only ever match exactly.
+# Inflections of a keyword ("explored", "systems") are left out
+# on purpose: those should still fire.
+FUZZY_EXACT_WORDS = frozenset({
+    "clarity",                                  # clarify
+    "contest", "content",                       # context
+    "won't", "donut",                           # don't
+    "explode",                                  # explore
+    "lean", "earn", "yearn",                    # learn
+    "slope", "score", "scone", "scape",         # scope
+    "stricture",                                # structure
+    "though", "trough", "thorough",             # through
+    "ensure", "insure",                         # unsure
+})
+
+_fuzzy_indexes: Dict[tuple, FuzzyPhraseIndex] = {}
+
+
+def fuzzy_signal_index(max_distance: int = 1, min_token_length: int = 5) -> FuzzyPhraseIndex:
+    """
+    Shared typo-tolerant index over every signal's keywords.
+
+    - max_distance: edits (insert/delete/substitute/transpose)
+      tolerated per word
+    - min_token_length: keyword words shorter than this must
+      match exactly
+
+    Words in FUZZY_EXACT_WORDS never count as typos.
+    """
+    key = (max_distance, min_token_length)
+    index = _fuzzy_indexes.get(key)
+    if index is None:
+        index = FuzzyPhraseIndex(
+            {signal["id"]: [normalize(kw) for kw in signal["keywords"]] for signal in SIGNALS},
+            max_distance=max_distance,
+            min_token_length=min_token_length,
+            exact_words=FUZZY_EXACT_WORDS,
+        )
+        _fuzzy_indexes[key] = index
+    return index
+
+
+def _matched(signal, text, matches: Optional[Dict[str, List[str]]]) -> List[str]:
+    # Per-signal wrappers accept a precomputed detect_all() result
+    # so one turn never scans the same text twice.
+    if matches is None:
+        matches = detect_all(text)
+    return matches.get(signal["id"], [])
+
+
+# ----------------------------
+# Streaming Detection (live typing)
+# ----------------------------
+# One shared automaton over every signal's keywords; each typing
+# session gets its own PhraseStream and feeds it only the
+# characters appended since the last call. stream.matches() on
+# the final text equals detect_all() on that text.
+
+_STREAM_AUTOMATON = PhraseAutomaton(
+    {signal["id"]: [normalize(kw) for kw in signal["keywords"]] for signal in SIGNALS}
+)
+
+
+def signal_stream() -> PhraseStream:
+    return _STREAM_AUTOMATON.stream()
+
+
+# ----------------------------
+# Batch Detection (offline)
+# ----------------------------
+# For offline evaluation over large corpora. Texts are joined
+# with a separator no keyword can contain and normalized once;
+# each keyword is then located across the whole chunk with one
+# C-level find sweep, and match positions are mapped back to
+# texts with a vectorized searchsorted. Results are identical
+# to calling detect_all() on each text.
+#
+# Requires numpy.
+
+_BATCH_SEPARATOR = "\x00"
+# Stand-in for separators already inside a text: same length,
+# matched by no keyword, untouched by normalization.
+_BATCH_SEPARATOR_STANDIN = "\x01"
+_BATCH_CHUNK = 20_000
+
+SIGNAL_IDS = [signal["id"] for signal in SIGNALS]
+_BATCH_MATCHER = PhraseMatcher({signal["id"]: signal["keywords"] for signal in SIGNALS})
+BATCH_KEYWORDS = sorted(_BATCH_MATCHER.owners)
+_KEYWORD_INDEX = {kw: i for i, kw in enumerate(BATCH_KEYWORDS)}
+_KEYWORD_ORDER = {
+    signal["id"]: {kw: i for i, kw in enumerate(signal["keywords"])}
+    for signal in SIGNALS
+}
+
+
+@dataclass
+class BatchSignalResult:
+    """
+    Batch detection output.
+
+    fired:   bool matrix, shape (texts, signals), columns in `signal_ids` order
+    matches: one row per keyword occurrence, as parallel int arrays:
+             text  - row in `fired`
+             signal - column in `fired`
+             start / end - offsets into normalize(text)
+             keyword - index into BATCH_KEYWORDS
+    """
+    signal_ids: List[str]
+    fired: Any
+    match_text: Any
+    match_signal: Any
+    match_start: Any
+    match_end: Any
+    match_keyword: Any
+
+    def matched_keywords(self, row: int) -> Dict[str, List[str]]:
+        """
+        detect_all()-shaped view of one text's matches.
+        """
+        result: Dict[str, set] = {}
+        for i in np.flatnonzero(self.match_text == row):
+            sid = self.signal_ids[self.match_signal[i]]
+            result.setdefault(sid, set()).add(BATCH_KEYWORDS[self.match_keyword[i]])
+        return {
+            sid: sorted(kws, key=_KEYWORD_ORDER[sid].__getitem__)
+            for sid, kws in result.items()
+        }
+
+
+def _detect_chunk(texts: List[str], row_offset: int):
+    joined = normalize(
+        _BATCH_SEPARATOR.join(t.replace(_BATCH_SEPARATOR, _BATCH_SEPARATOR_STANDIN) for t in texts)
+    )
+    lengths = np.fromiter(
+        (len(part) for part in joined.split(_BATCH_SEPARATOR)),
+        dtype=np.int64,
+        count=len(texts),
+    )
+    text_starts = np.concatenate(([0], np.cumsum(lengths + 1)[:-1]))
+
+    # One C-level str.find sweep per keyword over the whole chunk;
+    # Python only runs per occurrence, never per (text, keyword).
+    positions, keyword_ids, signal_cols, ends = [], [], [], []
+    column = {sid: j for j, sid in enumerate(SIGNAL_IDS)}
+    for kw in BATCH_KEYWORDS:
+        owners = [column[signal_id] for signal_id, _ in _BATCH_MATCHER.owners[kw]]
+        find = joined.find
+        pos = find(kw)
+        while pos != -1:
+            for col in owners:
+                positions.append(pos)
+                ends.append(pos + len(kw))
+                keyword_ids.append(_KEYWORD_INDEX[kw])
+                signal_cols.append(col)
+            pos = find(kw, pos + 1)
+
+    positions = np.asarray(positions, dtype=np.int64)
+    rows = np.searchsorted(text_starts, positions, side="right") - 1
+    starts = positions - text_starts[rows]
+    ends = np.asarray(ends, dtype=np.int64) - text_starts[rows]
+
+    fired = np.zeros((len(texts), len(SIGNAL_IDS)), dtype=bool)
+    signal_cols = np.asarray(signal_cols, dtype=np.int16)
+    fired[rows, signal_cols] = True
+
+    return (
+        fired,
+        (rows + row_offset).astype(np.int64),
+        signal_cols,
+        starts.astype(np.int32),
+        ends.astype(np.int32),
+        np.asarray(keyword_ids, dtype=np.int32),
+    )
+
+
+def detect_batch(texts: Iterable[str], chunk_size: int = _BATCH_CHUNK) -> BatchSignalResult:
+    """
+    Run every registered signal over many texts.
+
+    `texts` may be any iterable of strings (including a NumPy
+    array); it is consumed in chunks, so generators over large
+    corpora are fine.
+    """
+    if np is None:
+        raise ImportError("detect_batch() requires numpy")
+
+    parts = []
+    chunk: List[str] = []
+    seen = 0
+    for text in texts:
+        chunk.append(str(text))
+        if len(chunk) >= chunk_size:
+            parts.append(_detect_chunk(chunk, seen))
+            seen += len(chunk)
+            chunk = []
+    if chunk or not parts:
+        parts.append(_detect_chunk(chunk, seen))
+
+    fired, *match_arrays = zip(*parts)
+    return BatchSignalResult(
+        list(SIGNAL_IDS),
+        np.concatenate(fired),
+        *(np.concatenate(arrays) for arrays in match_arrays),
+    )
@@ -1,15 +1,29 @@
 # telemetry.py
 from __future__ import annotations
 
+import atexit
+import bisect
+import gzip
+import heapq
+import itertools
 import json
 import os
 import platform
+import queue
+import re
 import subprocess
 import sys
+import threading
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, wait as futures_wait
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: every writer indexes its own run.
+    fcntl = None
 
 
 def _now_ts() -> float:
@@ -23,6 +37,1026 @@ def _safe_git_sha() -> Optional[str]:
         return None
 
 
+# ----------------------------
+# Segments
+# ----------------------------
+# Without a size limit a run writes one events.jsonl. With one,
+# it writes events.000001.jsonl, events.000002.jsonl, ... and
+# each closed segment is gzipped in the background as a series
+# of independent gzip members ("blocks") of about
+# GZIP_BLOCK_BYTES each, cut on line boundaries. A sidecar
+# <segment>.gz.blocks maps each block's uncompressed offset to
+# its compressed offset, so a reader can seek into a compressed
+# segment by decompressing a single block. Plain gzip tools
+# still read the whole file.
+#
+# Every events file also gets a sidecar <file>.idx (see
+# SegmentIndex), and the run keeps session_segments.json saying
+# which files hold which sessions and what time range each
+# covers, so one session's records, or one time window, are
+# fetched by seeking instead of scanning the run. The sidecar
+# is checkpointed while a file is open (every
+# INDEX_CHECKPOINT_BYTES or INDEX_CHECKPOINT_SECONDS of writes)
+# by appending what is new since the last checkpoint, and the
+# map is updated when the file is closed, both off the writing
+# thread. Readers scan only the open file's unindexed tail, and
+# a crash loses at most that much index.
+#
+# Several processes can share a run (forked workers inherit
+# CAREER_EXPLORER_RUN_ID). The one holding an exclusive lock on
+# RUN_LOCK_FILE owns the run: only it indexes, rolls over and
+# compresses. The others create SHARED_MARKER and append plain
+# jsonl lines to the owner's newest file. The owner stops
+# indexing a file once its size shows bytes it did not write,
+# and compresses nothing once the marker exists, so readers scan
+# what the index does not cover.
+
+EVENTS_FILE = "events.jsonl"
+SESSION_MAP_FILE = "session_segments.json"
+RUN_LOCK_FILE = "events.lock"
+SHARED_MARKER = "events.shared"
+TS_INDEX_BYTES = 16 * 1024
+INDEX_CHECKPOINT_BYTES = 1024 * 1024
+INDEX_CHECKPOINT_SECONDS = 5.0
+GZIP_BLOCK_BYTES = 64 * 1024
+_SEGMENT_RE = re.compile(r"^events\.(\d{6})\.jsonl(\.gz)?$")
+
+
+def segment_name(number: int) -> str:
+    return f"events.{number:06d}.jsonl"
+
+
+def compress_segment(path: Path, block_bytes: int = GZIP_BLOCK_BYTES) -> Path:
+    """
+    Gzip a closed segment into independent line-aligned members,
+    write its block map, then remove the plain file.
+    """
+    path = Path(path)
+    gz_path = path.with_name(path.name + ".gz")
+    tmp_path = gz_path.with_name(gz_path.name + ".tmp")
+    blocks = []
+
+    with path.open("rb") as src, tmp_path.open("wb") as dst:
+        raw_offset = 0
+        while True:
+            chunk = src.read(block_bytes)
+            if not chunk:
+                break
+            if not chunk.endswith(b"\n"):
+                chunk += src.readline()
+            blocks.append([raw_offset, dst.tell()])
+            dst.write(gzip.compress(chunk, mtime=0))
+            raw_offset += len(chunk)
+
+    blocks_path = gz_path.with_name(gz_path.name + ".blocks")
+    blocks_path.write_text(json.dumps({"raw_size": raw_offset, "blocks": blocks}), encoding="utf-8")
+    os.replace(tmp_path, gz_path)
+    path.unlink()
+    return gz_path
+
+
+# ----------------------------
+# Record formats
+# ----------------------------
+# Records reach the segment writer as (ts, session_id, type,
+# payload_json) tuples and are encoded per segment.
+#
+# "jsonl":   one JSON object per line, exactly the record shape
+#            {"ts", "run_id", "git_sha", "session_id", "type", "payload"}
+# "compact": a header line carrying run-level fields once, then
+#            one JSON array per record: [ts, session, type, payload].
+#            A session id or type is written as a string the first
+#            time it appears after a header and as its index
+#            (order of first appearance) afterwards. Every segment
+#            starts with a header, so each decodes on its own.
+
+COMPACT_FORMAT = "compact-v1"
+
+
+class _PlainFormat:
+    def __init__(self, run_id: str, git_sha: Optional[str]) -> None:
+        self.run_id = run_id
+        self.git_sha = git_sha
+        self._middle = (
+            ', "run_id": ' + json.dumps(run_id, ensure_ascii=False)
+            + ', "git_sha": ' + json.dumps(git_sha, ensure_ascii=False)
+            + ', "session_id": '
+        )
+
+    def header(self) -> Optional[str]:
+        return None
+
+    def encode(self, record: tuple) -> str:
+        ts, session_id, event_type, payload_json = record
+        return (
+            '{"ts": ' + repr(ts) + self._middle
+            + json.dumps(session_id, ensure_ascii=False)
+            + ', "type": ' + json.dumps(event_type, ensure_ascii=False)
+            + ', "payload": ' + payload_json + "}\n"
+        )
+
+
+class _CompactFormat:
+    def __init__(self, run_id: str, git_sha: Optional[str]) -> None:
+        self.run_id = run_id
+        self.git_sha = git_sha
+        self.sessions: Dict[str, int] = {}
+        self.types: Dict[str, int] = {}
+
+    def header(self) -> str:
+        self.sessions = {}
+        self.types = {}
+        return json.dumps({
+            "format": COMPACT_FORMAT,
+            "run_id": self.run_id,
+            "git_sha": self.git_sha,
+        }, ensure_ascii=False) + "\n"
+
+    @staticmethod
+    def _ref(table: Dict[str, int], value: str) -> str:
+        index = table.get(value)
+        if index is None:
+            table[value] = len(table)
+            return json.dumps(value, ensure_ascii=False)
+        return str(index)
+
+    def encode(self, record: tuple) -> str:
+        ts, session_id, event_type, payload_json = record
+        return (
+            "[" + repr(ts)
+            + "," + self._ref(self.sessions, session_id)
+            + "," + self._ref(self.types, event_type)
+            + "," + payload_json + "]\n"
+        )
+
+
+EVENT_FORMATS = {"jsonl": _PlainFormat, "compact": _CompactFormat}
+
+
+class CompactDecoder:
+    """
+    Turns compact lines back into records identical (including
+    key order) to what the jsonl format writes.
+    """
+
+    def __init__(self) -> None:
+        self.header: Dict[str, Any] = {}
+        self.sessions: List[str] = []
+        self.types: List[str] = []
+
+    def feed(self, item: Any) -> Optional[Dict[str, Any]]:
+        """
+        Decode one parsed line. Headers reset the dictionaries
+        and return None.
+        """
+        if isinstance(item, dict):
+            self.header = item
+            self.sessions = []
+            self.types = []
+            return None
+        ts, session, event_type, payload = item
+        if isinstance(session, str):
+            self.sessions.append(session)
+        else:
+            session = self.sessions[session]
+        if isinstance(event_type, str):
+            self.types.append(event_type)
+        else:
+            event_type = self.types[event_type]
+        return {
+            "ts": ts,
+            "run_id": self.header.get("run_id"),
+            "git_sha": self.header.get("git_sha"),
+            "session_id": session,
+            "type": event_type,
+            "payload": payload,
+        }
+
+
+class _SegmentWriter:
+    """
+    Owns the open events file, encodes records for it, indexes
+    them and rolls it over by size. Not thread-safe; EventLogger
+    serializes access.
+
+    Index checkpoints and the session map are written by a
+    background thread, in order. The writer keeps only the
+    offsets taken since the last checkpoint and the ids of the
+    sessions in the open file.
+
+    Only the run's owner (see RUN_LOCK_FILE) indexes; `indexing`
+    is False for other writers and for a file another writer
+    has appended to.
+    """
+
+    def __init__(self, run_dir: Path, max_bytes: Optional[int], on_closed, encoding) -> None:
+        self.run_dir = run_dir
+        self.max_bytes = max_bytes
+        self.on_closed = on_closed
+        self.encoding = encoding
+        self._lock_fd = _lock_run(run_dir)
+        self._pid = os.getpid()
+        self.owner = self.indexing = self._lock_fd is not None
+        self._joined = False
+        if not self.owner:
+            self._join_shared()
+        self.number = 0
+        if max_bytes:
+            self.number = max([n for n, _ in list_segments(run_dir, numbered_only=True)] + [0])
+            if self.number == 0 or not self._segment_path(self.number).exists():
+                self.number += 1
+        self.path = self._segment_path(self.number)
+        self._file = None
+        self.size = self.path.stat().st_size if self.path.exists() else 0
+        self.index = self._resume_index() if self.owner else SegmentIndex()
+        # What was resumed is on disk already.
+        self._file_sessions = set(self.index.sessions)
+        self.index.take_delta()
+        self.session_map = _load_json(run_dir / SESSION_MAP_FILE) or {"segments": {}, "sessions": {}}
+        self._checkpointed = self.index.size
+        self._checkpoint_at = time.monotonic()
+        self._indexer: Optional[ThreadPoolExecutor] = None
+        self._index_jobs: List[Any] = []
+        # A header (if the format has one) opens every file this
+        # writer appends to, even a pre-existing one.
+        self._needs_header = True
+
+    def _segment_path(self, number: int) -> Path:
+        if not self.max_bytes:
+            return self.run_dir / EVENTS_FILE
+        return self.run_dir / segment_name(number)
+
+    def _resume_index(self) -> "SegmentIndex":
+        if not self.size:
+            # Deltas are appended, so a stale sidecar must go.
+            index_path(self.path).unlink(missing_ok=True)
+            return SegmentIndex()
+        index = load_segment_index(self.path)
+        if index is not None and index.size == self.size:
+            return index
+        if index is None or index.size > self.size:
+            index = build_segment_index(self.path)
+        else:
+            # A checkpoint of this file: index only what follows it.
+            index = build_segment_index(self.path, index)
+        # Rewritten whole, dropping any line torn by a crash.
+        save_segment_index(self.path, index)
+        return index
+
+    @property
+    def shared(self) -> bool:
+        return (self.run_dir / SHARED_MARKER).exists()
+
+    def _join_shared(self) -> None:
+        # Marked before choosing a file, so an owner rolling over
+        # either sees the mark or has already opened the next file.
+        (self.run_dir / SHARED_MARKER).touch()
+        # Plain lines decode on their own amid the owner's records.
+        self.encoding = _PlainFormat(self.encoding.run_id, self.encoding.git_sha)
+        self._joined = True
+
+    def _check_fork(self) -> None:
+        if os.getpid() == self._pid:
+            return
+        # A forked copy of the owner: the parent keeps the run,
+        # its lock and its index thread.
+        self._pid = os.getpid()
+        self.owner = self.indexing = False
+        self._lock_fd = None
+        self._indexer, self._index_jobs = None, []
+
+    def _follow_owner(self) -> None:
+        if not self._joined:
+            self._join_shared()
+        while self.max_bytes and self._segment_path(self.number + 1).exists():
+            self.number += 1
+            self.path = self._segment_path(self.number)
+            self._needs_header = True
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def release(self) -> None:
+        """
+        Close the file and give up ownership of the run; writes
+        after this are not indexed.
+        """
+        self._check_fork()
+        self.close()
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+        self.owner = self.indexing = False
+
+    def _header(self) -> bytes:
+        header = self.encoding.header() if self._needs_header else None
+        return header.encode("utf-8") if header else b""
+
+    def write(self, records: List[tuple]) -> None:
+        """
+        Append records, rolling over before any record that would
+        take a non-empty segment past max_bytes (so a batch can
+        span segments). Records are encoded in order, after the
+        header of the segment they land in.
+        """
+        self._check_fork()
+        if not self.owner:
+            self._follow_owner()
+        header = self._header()
+        batch: List[tuple] = []
+        size = self.size + len(header)
+        for record in records:
+            line = self.encoding.encode(record).encode("utf-8")
+            if self.owner and self.max_bytes and (self.size or batch) and size + len(line) > self.max_bytes:
+                self._append(header, batch)
+                self.rollover()
+                header = self._header()
+                batch = []
+                size = len(header)
+                line = self.encoding.encode(record).encode("utf-8")
+            batch.append((record, line))
+            size += len(line)
+        self._append(header, batch)
+
+    def _append(self, header: bytes, batch: List[tuple]) -> None:
+        if not batch:
+            return
+        if self._file is None:
+            self._file = self.path.open("ab")
+        data = header + b"".join(line for _, line in batch)
+        self._file.write(data)
+        self._file.flush()
+        self._needs_header = False
+        start, self.size = self.size, self.size + len(data)
+        if not self.indexing:
+            return
+        if os.fstat(self._file.fileno()).st_size != self.size:
+            self._stop_indexing()
+            return
+
+        offset = start
+        if header:
+            self.index.add_header(offset, json.loads(header))
+            offset += len(header)
+        for record, line in batch:
+            self.index.add(offset, record[1], record[2], record[0])
+            offset += len(line)
+        self.index.size = offset
+        if (
+            self.size - self._checkpointed >= INDEX_CHECKPOINT_BYTES
+            or time.monotonic() - self._checkpoint_at >= INDEX_CHECKPOINT_SECONDS
+        ):
+            self._checkpoint()
+
+    def _stop_indexing(self) -> None:
+        # Another writer's bytes are in this file, possibly ahead
+        # of the batch just written, so offsets from here on are
+        # unknown. What was indexed before stays valid; readers
+        # scan the rest, in full for time windows.
+        self.indexing = False
+        self.index.ts_sorted = False
+        self._checkpoint()
+
+    def rollover(self) -> None:
+        closed = self.path
+        self.close()
+        self.number += 1
+        self.path = self._segment_path(self.number)
+        # Opened before on_closed checks for other writers (see
+        # _join_shared).
+        self._file = self.path.open("ab")
+        self.size = 0
+        self.index = SegmentIndex()
+        self.indexing = self.owner
+        self._file_sessions = set()
+        self._checkpointed = 0
+        self._needs_header = True
+        self.on_closed(closed)
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        if self.indexing:
+            self._checkpoint(closing=True)
+
+    def _checkpoint(self, closing: bool = False) -> None:
+        delta = self.index.take_delta()
+        self._file_sessions.update(delta.sessions)
+        # The map lists a file once it is closed; readers treat
+        # files it does not list as open and scan their tails.
+        closed = None
+        if closing:
+            closed = (self.number, delta.size, delta.min_ts, delta.max_ts, list(self._file_sessions))
+        self._submit(self._write_index, self.path, delta, self._checkpointed < delta.size, closed)
+        self._checkpointed = delta.size
+        self._checkpoint_at = time.monotonic()
+
+    def _submit(self, fn, *args) -> None:
+        self._index_jobs = [job for job in self._index_jobs if not job.done() or job.exception()]
+        if self._indexer is None:
+            self._indexer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="segment-index")
+        try:
+            self._index_jobs.append(self._indexer.submit(fn, *args))
+        except RuntimeError:
+            # Interpreter shutdown (close() from atexit): no new
+            # threads, so write inline.
+            fn(*args)
+
+    def _write_index(self, path: Path, delta: "SegmentIndex", grew: bool, closed: Optional[tuple]) -> None:
+        if grew:
+            append_segment_index(path, delta)
+        if closed is None:
+            return
+        number, size, min_ts, max_ts, file_sessions = closed
+        self.session_map["segments"][str(number)] = size
+        if min_ts is not None:
+            self.session_map.setdefault("ts_ranges", {})[str(number)] = [min_ts, max_ts]
+        sessions = self.session_map["sessions"]
+        for session_id in file_sessions:
+            numbers = sessions.setdefault(session_id, [])
+            if number not in numbers:
+                numbers.append(number)
+        _write_json_atomic(self.run_dir / SESSION_MAP_FILE, self.session_map)
+
+    def wait_for_index(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the checkpoints taken so far are on disk.
+        Returns False on timeout; re-raises a failed write.
+        """
+        jobs = list(self._index_jobs)
+        _, pending = futures_wait(jobs, timeout)
+        for job in jobs:
+            if job.done():
+                job.result()
+        return not pending
+
+
+def _lock_run(run_dir: Path) -> Optional[int]:
+    """
+    Take the run's writer lock without waiting. Returns the
+    locked fd, or None if another writer holds it.
+    """
+    fd = os.open(run_dir / RUN_LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+    if fcntl is None:
+        return fd
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def list_segments(run_dir: Path, numbered_only: bool = False) -> List[tuple]:
+    """
+    (number, path) for every events file in a run, oldest first.
+    A plain events.jsonl is number 0. If both a segment and its
+    .gz exist (compression in progress), the plain file wins.
+    """
+    run_dir = Path(run_dir)
+    found: Dict[int, Path] = {}
+    if not numbered_only and (run_dir / EVENTS_FILE).exists():
+        found[0] = run_dir / EVENTS_FILE
+    if run_dir.is_dir():
+        for entry in os.scandir(run_dir):
+            m = _SEGMENT_RE.match(entry.name)
+            if m is None:
+                continue
+            number = int(m.group(1))
+            if number not in found or not m.group(2):
+                found[number] = run_dir / entry.name
+    return sorted(found.items())
+
+
+def _load_json(path: Path) -> Optional[Any]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+
+
+def _write_json_atomic(path: Path, data: Any, newline: bool = False) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False) + ("\n" if newline else ""), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _plain_path(path: Path) -> Path:
+    return path.with_suffix("") if path.suffix == ".gz" else path
+
+
+def _block_map(path: Path) -> Optional[Dict[str, Any]]:
+    return _load_json(path.with_name(path.name + ".blocks"))
+
+
+def _raw_lines(path: Path, start: int = 0) -> Iterator[tuple]:
+    """
+    (uncompressed offset, line bytes) from `start` to the end of
+    an events file. Gzipped segments start at the block holding
+    `start` when a block map exists.
+    """
+    path = Path(path)
+    with path.open("rb") as f:
+        offset = 0
+        stream = f
+        if path.suffix == ".gz":
+            blocks = (_block_map(path) or {}).get("blocks") or [[0, 0]]
+            raw_start, gz_start = blocks[bisect.bisect_right([b[0] for b in blocks], start) - 1]
+            f.seek(gz_start)
+            offset = raw_start
+            stream = gzip.GzipFile(fileobj=f, mode="rb")
+        else:
+            f.seek(start)
+            offset = start
+        while offset < start:
+            skipped = stream.readline()
+            if not skipped:
+                return
+            offset += len(skipped)
+        for line in stream:
+            yield offset, line
+            offset += len(line)
+
+
+def _read_lines_at(path: Path, offsets: List[int]) -> Iterator[tuple]:
+    """
+    (offset, line bytes) for each given uncompressed offset, in
+    order. A gzipped segment decompresses only the blocks touched.
+    """
+    path = Path(path)
+    if path.suffix != ".gz":
+        with path.open("rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                yield offset, f.readline()
+        return
+
+    block_map = _block_map(path)
+    if block_map is None:
+        wanted = set(offsets)
+        for offset, line in _raw_lines(path):
+            if offset in wanted:
+                yield offset, line
+        return
+
+    blocks = block_map["blocks"]
+    starts = [b[0] for b in blocks]
+    current, data = -1, b""
+    with path.open("rb") as f:
+        for offset in offsets:
+            i = bisect.bisect_right(starts, offset) - 1
+            if i != current:
+                f.seek(blocks[i][1])
+                if i + 1 < len(blocks):
+                    data = gzip.decompress(f.read(blocks[i + 1][1] - blocks[i][1]))
+                else:
+                    data = gzip.decompress(f.read())
+                current = i
+            rel = offset - starts[i]
+            yield offset, data[rel:data.index(b"\n", rel) + 1]
+
+
+def _decode_lines(lines: Iterator[tuple], decoder: Optional[CompactDecoder] = None) -> Iterator[Dict[str, Any]]:
+    for _, line in lines:
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        if isinstance(item, list):
+            yield decoder.feed(item)
+        elif item.get("format") == COMPACT_FORMAT:
+            # A restart may append to a file in the other format.
+            decoder = decoder or CompactDecoder()
+            decoder.feed(item)
+        else:
+            yield item
+
+
+def iter_segment(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Records of one events file, in either format.
+    """
+    return _decode_lines(_raw_lines(Path(path)))
+
+
+# ----------------------------
+# Session index
+# ----------------------------
+
+class SegmentIndex:
+    """
+    Where each session's records sit in one events file, by
+    uncompressed byte offset (so it stays valid once gzipped).
+
+    Compact files also need each section's dictionaries (a section
+    runs from one header line to the next) to decode a record read
+    in isolation; `sections` keeps the header and the session ids
+    and types in their dictionary order.
+
+    For time queries it keeps the file's min/max ts and a sparse
+    [ts, offset] entry about every TS_INDEX_BYTES. `ts_sorted`
+    turns False if a record ever went back in time (e.g. a
+    restart under a skewed clock); such files are scanned.
+
+    The sidecar holds one index per line: the first covers the
+    start of the file and each later one is a delta (take_delta)
+    appended at a checkpoint, so a checkpoint writes only what is
+    new. load_segment_index merges them back.
+    """
+
+    def __init__(self) -> None:
+        self.size = 0
+        self.sessions: Dict[str, List[int]] = {}
+        self.sections: List[Dict[str, Any]] = []
+        self.min_ts: Optional[float] = None
+        self.max_ts: Optional[float] = None
+        self.ts_sorted = True
+        self.sparse: List[List[float]] = []
+        self._last_sparse: Optional[int] = None
+        self._section_sessions: set = set()
+        self._section_types: set = set()
+
+    def add_header(self, offset: int, header: Dict[str, Any]) -> None:
+        self.sections.append({"offset": offset, "header": header, "sessions": [], "types": []})
+        self._section_sessions = set()
+        self._section_types = set()
+
+    def add(self, offset: int, session_id: str, event_type: str, ts: float) -> None:
+        if self.min_ts is None:
+            self.min_ts = ts
+        elif ts < self.max_ts:
+            self.ts_sorted = False
+        self.max_ts = ts if self.max_ts is None else max(self.max_ts, ts)
+        if self._last_sparse is None or offset - self._last_sparse >= TS_INDEX_BYTES:
+            self.sparse.append([ts, offset])
+            self._last_sparse = offset
+
+        offsets = self.sessions.get(session_id)
+        if offsets is None:
+            offsets = self.sessions[session_id] = []
+        offsets.append(offset)
+        if not self.sections:
+            return
+        section = self.sections[-1]
+        if session_id not in self._section_sessions:
+            self._section_sessions.add(session_id)
+            section["sessions"].append(session_id)
+        if event_type not in self._section_types:
+            self._section_types.add(event_type)
+            section["types"].append(event_type)
+
+    def take_delta(self) -> "SegmentIndex":
+        """
+        Split off the offsets, sections and sparse entries added
+        since the last call, keeping only the state `add` needs to
+        carry on. The delta's size and ts fields are cumulative.
+        """
+        delta = SegmentIndex()
+        delta.size = self.size
+        delta.min_ts = self.min_ts
+        delta.max_ts = self.max_ts
+        delta.ts_sorted = self.ts_sorted
+        delta.sessions, self.sessions = self.sessions, {}
+        delta.sparse, self.sparse = self.sparse, []
+        delta.sections, self.sections = self.sections, []
+        if delta.sections:
+            # The open section carries on; the next delta repeats
+            # its offset and header and lists only new entries.
+            current = delta.sections[-1]
+            self.sections.append({"offset": current["offset"], "header": current["header"], "sessions": [], "types": []})
+        return delta
+
+    def merge(self, delta: "SegmentIndex") -> None:
+        """
+        Extend this index with the delta that followed it.
+        """
+        self.size = delta.size
+        self.min_ts = delta.min_ts
+        self.max_ts = delta.max_ts
+        self.ts_sorted = delta.ts_sorted
+        for session_id, offsets in delta.sessions.items():
+            self.sessions.setdefault(session_id, []).extend(offsets)
+        for section in delta.sections:
+            if self.sections and self.sections[-1]["offset"] == section["offset"]:
+                self.sections[-1]["sessions"].extend(section["sessions"])
+                self.sections[-1]["types"].extend(section["types"])
+            else:
+                self.sections.append(section)
+        self.sparse.extend(delta.sparse)
+        self._refresh()
+
+    def _refresh(self) -> None:
+        if self.sparse:
+            self._last_sparse = self.sparse[-1][1]
+        if self.sections:
+            self._section_sessions = set(self.sections[-1]["sessions"])
+            self._section_types = set(self.sections[-1]["types"])
+
+    def section_at(self, offset: int) -> Optional[Dict[str, Any]]:
+        i = bisect.bisect_right([s["offset"] for s in self.sections], offset) - 1
+        return self.sections[i] if i >= 0 else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "sessions": self.sessions,
+            "sections": self.sections,
+            "min_ts": self.min_ts,
+            "max_ts": self.max_ts,
+            "ts_sorted": self.ts_sorted,
+            "sparse": self.sparse,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SegmentIndex":
+        index = cls()
+        index.size = data["size"]
+        index.sessions = data["sessions"]
+        index.sections = data["sections"]
+        index.min_ts = data.get("min_ts")
+        index.max_ts = data.get("max_ts")
+        index.ts_sorted = data.get("ts_sorted", True)
+        index.sparse = data.get("sparse", [])
+        index._refresh()
+        return index
+
+
+def index_path(path: Path) -> Path:
+    plain = _plain_path(Path(path))
+    return plain.with_name(plain.name + ".idx")
+
+
+def load_segment_index(path: Path) -> Optional[SegmentIndex]:
+    """
+    The sidecar's first index merged with every delta after it.
+    A line that does not parse (a crash mid-append) ends it.
+    """
+    try:
+        lines = index_path(path).read_bytes().splitlines()
+    except FileNotFoundError:
+        return None
+    index = None
+    for line in lines:
+        try:
+            part = SegmentIndex.from_dict(json.loads(line))
+        except ValueError:
+            break
+        if index is None:
+            index = part
+        else:
+            index.merge(part)
+    return index
+
+
+def save_segment_index(path: Path, index: SegmentIndex) -> None:
+    _write_json_atomic(index_path(path), index.to_dict(), newline=True)
+
+
+def append_segment_index(path: Path, delta: SegmentIndex) -> None:
+    with index_path(path).open("a+b") as f:
+        line = json.dumps(delta.to_dict(), ensure_ascii=False).encode("utf-8") + b"\n"
+        # Sidecars written before deltas existed lack the newline.
+        if f.seek(0, os.SEEK_END):
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                line = b"\n" + line
+        f.write(line)
+
+
+def build_segment_index(path: Path, index: Optional[SegmentIndex] = None) -> SegmentIndex:
+    """
+    Index an events file by scanning it (for files written before
+    indexing existed, or whose sidecar is missing or stale).
+    Given `index`, a sidecar covering the start of the file (a
+    checkpoint), only the rest is scanned and added to it.
+    """
+    index = index or SegmentIndex()
+    decoder = _decoder_at(index, index.size)
+    end = index.size
+    for offset, line in _raw_lines(Path(path), index.size):
+        end = offset + len(line)
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        if isinstance(item, list):
+            record = decoder.feed(item)
+        elif item.get("format") == COMPACT_FORMAT:
+            decoder = decoder or CompactDecoder()
+            decoder.feed(item)
+            index.add_header(offset, item)
+            continue
+        else:
+            record = item
+        index.add(offset, record["session_id"], record["type"], record["ts"])
+    index.size = end
+    return index
+
+
+def _raw_size(path: Path) -> Optional[int]:
+    if path.suffix != ".gz":
+        return path.stat().st_size
+    block_map = _block_map(path)
+    return block_map["raw_size"] if block_map else None
+
+
+def build_run_index(run_dir: Path) -> int:
+    """
+    Write missing or stale sidecars for every events file of a
+    run and rebuild its session map. Returns how many files were
+    (re)indexed.
+    """
+    session_map: Dict[str, Any] = {"segments": {}, "sessions": {}}
+    built = 0
+    for number, path in list_segments(run_dir):
+        index = load_segment_index(path)
+        size = _raw_size(path)
+        if index is None or index.size != size:
+            partial = index is not None and size is not None and index.size < size
+            index = build_segment_index(path, index if partial else None)
+            save_segment_index(path, index)
+            built += 1
+        session_map["segments"][str(number)] = index.size
+        if index.min_ts is not None:
+            session_map.setdefault("ts_ranges", {})[str(number)] = [index.min_ts, index.max_ts]
+        for session_id in index.sessions:
+            session_map["sessions"].setdefault(session_id, []).append(number)
+    _write_json_atomic(Path(run_dir) / SESSION_MAP_FILE, session_map)
+    return built
+
+
+def _indexed_records(path: Path, index: SegmentIndex, session_id: str) -> Iterator[Dict[str, Any]]:
+    for offset, line in _read_lines_at(path, index.sessions.get(session_id, [])):
+        item = json.loads(line)
+        if isinstance(item, dict):
+            yield item
+            continue
+        section = index.section_at(offset)
+        header = section["header"] if section else {}
+        ts, _, event_type, payload = item
+        if not isinstance(event_type, str):
+            event_type = section["types"][event_type]
+        yield {
+            "ts": ts,
+            "run_id": header.get("run_id"),
+            "git_sha": header.get("git_sha"),
+            "session_id": session_id,
+            "type": event_type,
+            "payload": payload,
+        }
+
+
+def _decoder_at(index: SegmentIndex, offset: int) -> Optional[CompactDecoder]:
+    """
+    A decoder for reading from `offset` onwards. Priming it with
+    the section's complete tables is safe from any record in the
+    section: indexes are assigned in order, so every reference
+    resolves to the same entry either way.
+    """
+    section = index.section_at(offset)
+    if section is None:
+        return None
+    decoder = CompactDecoder()
+    decoder.header = section["header"]
+    decoder.sessions = list(section["sessions"])
+    decoder.types = list(section["types"])
+    return decoder
+
+
+def _unindexed_records(path: Path, index: SegmentIndex, session_id: str) -> Iterator[Dict[str, Any]]:
+    # Scan what the index does not cover yet.
+    decoder = _decoder_at(index, index.size)
+    for record in _decode_lines(_raw_lines(path, index.size), decoder):
+        if record["session_id"] == session_id:
+            yield record
+
+
+def session_events(run_dir: Path, session_id: str) -> List[Dict[str, Any]]:
+    """
+    Every event of one session in a run, in timestamp order.
+
+    Files the run's session map says are indexed and do not hold
+    the session are skipped unopened; indexed files are read by
+    seeking to the recorded offsets; only what no index covers
+    yet (the file still being written) is scanned.
+    """
+    run_dir = Path(run_dir)
+    session_map = _load_json(run_dir / SESSION_MAP_FILE) or {"segments": {}, "sessions": {}}
+    holding = set(session_map["sessions"].get(session_id, ()))
+
+    records: List[Dict[str, Any]] = []
+    for number, path in list_segments(run_dir):
+        indexed_size = session_map["segments"].get(str(number))
+        complete = indexed_size is not None and _raw_size(path) == indexed_size
+        if complete and number not in holding:
+            continue
+        index = load_segment_index(path) or SegmentIndex()
+        try:
+            found = list(_indexed_records(path, index, session_id))
+        except ValueError:
+            # Offsets that miss record boundaries (a sidecar from a
+            # run several processes indexed at once): scan instead.
+            records.extend(r for r in iter_segment(path) if r["session_id"] == session_id)
+            continue
+        records.extend(found)
+        if not complete:
+            records.extend(_unindexed_records(path, index, session_id))
+    records.sort(key=lambda record: record["ts"])
+    return records
+
+
+def iter_events(run_dir: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Every event of a run, across events.jsonl and all numbered
+    segments (plain or gzipped), in timestamp order.
+
+    One writer produces each file in timestamp order, and
+    numbered segments follow each other, so they are read as one
+    chain and merged with the unsegmented file, if any.
+    """
+    segments = list_segments(run_dir)
+    plain = [path for number, path in segments if number == 0]
+    numbered = [path for number, path in segments if number > 0]
+    streams = [iter_segment(path) for path in plain]
+    if numbered:
+        streams.append(itertools.chain.from_iterable(iter_segment(p) for p in numbered))
+    return heapq.merge(*streams, key=lambda record: record["ts"])
+
+
+# ----------------------------
+# Time-range queries
+# ----------------------------
+
+def _window(path: Path, index: SegmentIndex, start_ts: Optional[float], end_ts: Optional[float]) -> Iterator[Dict[str, Any]]:
+    # Start at the last sparse entry before start_ts and stop at
+    # the first record past end_ts; unsorted files are scanned.
+    offset = 0
+    if index.ts_sorted and start_ts is not None and index.sparse:
+        i = bisect.bisect_left([entry[0] for entry in index.sparse], start_ts) - 1
+        if i >= 0:
+            offset = int(index.sparse[i][1])
+    for record in _decode_lines(_raw_lines(path, offset), _decoder_at(index, offset)):
+        ts = record["ts"]
+        if start_ts is not None and ts < start_ts:
+            continue
+        if end_ts is not None and ts > end_ts:
+            if index.ts_sorted:
+                return
+            continue
+        yield record
+
+
+def events_between(
+    run_dir: Path,
+    start_ts: Optional[float] = None,
+    end_ts: Optional[float] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Events of a run with start_ts <= ts <= end_ts (either bound
+    may be None), in timestamp order.
+
+    Numbered segments follow each other in time, so the first
+    segment that can match is found by binary search over the
+    ts ranges in the run's session map, and reading stops at the
+    first segment starting after end_ts. Within a file the sparse
+    ts index gives the starting offset. Work is proportional to
+    the result, plus at most one sparse interval per file touched.
+    """
+    run_dir = Path(run_dir)
+    session_map = _load_json(run_dir / SESSION_MAP_FILE) or {"segments": {}}
+    ranges = session_map.get("ts_ranges", {})
+
+    def known_range(number: int, path: Path) -> Optional[List[float]]:
+        indexed_size = session_map["segments"].get(str(number))
+        if indexed_size is None or _raw_size(path) != indexed_size:
+            return None
+        return ranges.get(str(number))
+
+    def window(path: Path) -> Iterator[Dict[str, Any]]:
+        return _window(path, load_segment_index(path) or SegmentIndex(), start_ts, end_ts)
+
+    segments = list_segments(run_dir)
+    numbered = [(path, known_range(number, path)) for number, path in segments if number > 0]
+
+    # Closed segments come first and all have ranges; bisect them.
+    maxes = []
+    for _, known in numbered:
+        if known is None:
+            break
+        maxes.append(known[1])
+    first = bisect.bisect_left(maxes, start_ts) if start_ts is not None else 0
+
+    def chain() -> Iterator[Dict[str, Any]]:
+        for path, known in numbered[first:]:
+            if known is not None and end_ts is not None and known[0] > end_ts:
+                return
+            yield from window(path)
+
+    streams = [window(path) for number, path in segments if number == 0]
+    streams.append(chain())
+    return heapq.merge(*streams, key=lambda record: record["ts"])
+
+
 class EventLogger:
     """
     Local-only structured event logging. Designed for:
@@ -31,9 +1065,52 @@ class EventLogger:
     - tracking behavior drift across commits
     """
 
-    def __init__(self, enabled: bool, base_dir: Path) -> None:
+    def __init__(
+        self,
+        enabled: bool,
+        base_dir: Path,
+        async_mode: bool = False,
+        queue_size: int = 10_000,
+        flush_records: int = 256,
+        flush_interval: float = 0.5,
+        max_segment_bytes: Optional[int] = None,
+        compress_segments: bool = True,
+        event_format: str = "jsonl",
+    ) -> None:
+        """
+        async_mode=False: every event() appends its line before returning.
+        async_mode=True:  event() only enqueues; a writer thread keeps the
+            file open and writes batches of up to `flush_records` records,
+            at least every `flush_interval` seconds. When the queue holds
+            `queue_size` records, new ones are dropped and counted.
+
+        max_segment_bytes: roll over to a new numbered segment once the
+            current one would grow past this size; closed segments are
+            gzipped in the background unless compress_segments=False.
+
+        event_format: "jsonl" (one full record per line) or "compact"
+            (run fields once per segment, dictionary-encoded session
+            ids and types). Readers here decode both.
+        """
         self.enabled = enabled
         self.base_dir = base_dir
+        self.async_mode = async_mode
+        self.flush_records = flush_records
+        self.flush_interval = flush_interval
+        self.max_segment_bytes = max_segment_bytes
+        self.compress_segments = compress_segments
+        self.event_format = event_format
+
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.segments_closed = 0
+        self._last_ts = 0.0
+        self._lock = threading.Lock()
+        self._queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        self._compressor: Optional[ThreadPoolExecutor] = None
+        self._compressions: List[Any] = []
         run_id = os.getenv("CAREER_EXPLORER_RUN_ID")
         if not run_id:
             run_id = f"run-{int(_now_ts())}-{uuid.uuid4().hex[:8]}"
@@ -48,7 +1125,12 @@ class EventLogger:
         self.run_dir = self.base_dir / "runs" / self.run_id
         self.run_dir.mkdir(parents=True, exist_ok=True)
 
-        self.events_path = self.run_dir / "events.jsonl"
+        self._segments = _SegmentWriter(
+            self.run_dir,
+            max_segment_bytes,
+            self._segment_closed,
+            EVENT_FORMATS[event_format](self.run_id, self.git_sha),
+        )
         self.sessions_dir = self.run_dir / "sessions"
         self.sessions_dir.mkdir(parents=True, exist_ok=True)
 
@@ -64,20 +1146,170 @@ class EventLogger:
         if not meta_path.exists():
             meta_path.write_text(json.dumps(meta, indent=2))
 
+        if self.async_mode:
+            self._queue = queue.Queue(maxsize=queue_size)
+            self._writer = threading.Thread(
+                target=self._write_loop,
+                name="event-writer",
+                daemon=True,
+            )
+            self._writer.start()
+        atexit.register(self.close)
+
+    @property
+    def events_path(self) -> Path:
+        """
+        The events file currently being written.
+        """
+        return self._segments.path
+
     def event(self, session_id: str, event_type: str, payload: Optional[Dict[str, Any]] = None) -> None:
         if not self.enabled:
             return
 
-        record = {
-            "ts": _now_ts(),
-            "run_id": self.run_id,
-            "git_sha": self.git_sha,
-            "session_id": session_id,
-            "type": event_type,
-            "payload": payload or {},
-        }
-        with self.events_path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        # Serialized now: payloads are often live state dicts.
+        payload_json = json.dumps(payload or {}, ensure_ascii=False)
+
+        # The timestamp is taken in write/enqueue order (and never
+        # goes backwards), so every events file is in ts order.
+        with self._lock:
+            ts = max(_now_ts(), self._last_ts)
+            self._last_ts = ts
+            record = (ts, session_id, event_type, payload_json)
+
+            q = self._queue
+            if q is None:
+                self._segments.write([record])
+                self.written += 1
+                return
+            try:
+                q.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+
+    # ----------------------------
+    # Async writer
+    # ----------------------------
+
+    _STOP = object()
+
+    def _write_loop(self) -> None:
+        batch: List[tuple] = []
+        deadline = time.monotonic() + self.flush_interval
+        stopping = False
+
+        while not stopping:
+            flushed: Optional[threading.Event] = None
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                if item is self._STOP:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    flushed = item
+                else:
+                    batch.append(item)
+            except queue.Empty:
+                pass
+
+            now = time.monotonic()
+            if batch and (
+                stopping
+                or flushed is not None
+                or len(batch) >= self.flush_records
+                or now >= deadline
+            ):
+                self._segments.write(batch)
+                with self._lock:
+                    self.written += len(batch)
+                    self.batches += 1
+                batch = []
+            if now >= deadline:
+                deadline = now + self.flush_interval
+            if flushed is not None:
+                flushed.set()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until everything enqueued so far is on disk, along
+        with the index checkpoints taken so far. Returns False on
+        timeout.
+        """
+        if not self.enabled:
+            return True
+        writer = self._writer
+        if self._queue is not None and writer is not None and writer.is_alive():
+            done = threading.Event()
+            self._queue.put(done)
+            if not done.wait(timeout):
+                return False
+        return self._segments.wait_for_index(timeout)
+
+    def close(self) -> None:
+        """
+        Drain the queue, stop the writer and finish background
+        compression. Later events are written synchronously.
+        Safe to call twice; registered with atexit.
+        """
+        if not self.enabled:
+            return
+        writer = self._writer
+        if writer is not None and writer.is_alive():
+            q = self._queue
+            q.put(self._STOP)
+            writer.join()
+
+            with self._lock:
+                self._queue = None
+                # Anything that slipped in behind the stop marker.
+                leftovers = []
+                while True:
+                    try:
+                        item = q.get_nowait()
+                    except queue.Empty:
+                        break
+                    if isinstance(item, tuple):
+                        leftovers.append(item)
+                    elif isinstance(item, threading.Event):
+                        item.set()
+                if leftovers:
+                    self._segments.write(leftovers)
+                    self.written += len(leftovers)
+
+        with self._lock:
+            self._segments.release()
+        self._segments.wait_for_index()
+        self.wait_for_compression()
+
+    # ----------------------------
+    # Segment rollover
+    # ----------------------------
+
+    def _segment_closed(self, path: Path) -> None:
+        self.segments_closed += 1
+        # Another writer may still append to it.
+        if not self.compress_segments or self._segments.shared:
+            return
+        if self._compressor is None:
+            self._compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="segment-gzip")
+        # Drop finished jobs; failed ones stay for
+        # wait_for_compression to raise.
+        self._compressions = [job for job in self._compressions if not job.done() or job.exception()]
+        self._compressions.append(self._compressor.submit(compress_segment, path))
+
+    def wait_for_compression(self) -> None:
+        pending, self._compressions = self._compressions, []
+        for future in pending:
+            future.result()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "written": self.written,
+                "dropped": self.dropped,
+                "batches": self.batches,
+                "queued": self._queue.qsize() if self._queue is not None else 0,
+                "segments_closed": self.segments_closed,
+            }
 
     def write_session_snapshot(self, session_id: str, snapshot: Dict[str, Any]) -> Path:
         """
@@ -96,4 +1328,3 @@ class EventLogger:
         }
         path.write_text(json.dumps(enriched, ensure_ascii=False, indent=2), encoding="utf-8")
         return path
-
@@ -1,6 +1,6 @@
 # test_agent.py
 import json
-from app import app
+from app import app, OWNER_COOKIE_NAME
 from test_answers import TEST_RESPONSES
 
 def run_test():
@@ -22,11 +22,14 @@ def run_test():
             "status": response.status_code,
         })
 
+    owner_id = client.get_cookie(OWNER_COOKIE_NAME).value
+
     # 🔑 FORCE summary + proposal emission
     with app.app_context():
-        from app import generate_summary, conversation_state
+        from app import generate_summary, session_store
+        conversation_state = session_store.get(owner_id)
         _ = generate_summary(
-            conversation_state["responses"],
+            conversation_state.responses,
             conversation_state
         )
 
@@ -44,10 +47,8 @@ def run_test():
 
     # 🔒 Safely read owner + proposals inside app context
     with app.app_context():
-        from app import conversation_state
         from memory.storage import load_proposals
 
-        owner_id = conversation_state.get("owner_id")
         print("TEST AGENT OWNER_ID:", owner_id)
 
         result["proposals_raw"] = load_proposals(owner_id)
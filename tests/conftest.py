@@ -0,0 +1,14 @@
+import itertools
+
+import pytest
+
+import telemetry
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Event timestamps 1000.0, 1001.0, ... in call order.
+    """
+    ticks = itertools.count(1_000)
+    monkeypatch.setattr(telemetry, "_now_ts", lambda: float(next(ticks)))
@@ -0,0 +1,49 @@
+# Shared test helpers. Fixtures live in conftest.py.
+
+from telemetry import EventLogger
+
+
+def make_logger(base_dir, monkeypatch, run_id="run-test", **kwargs):
+    monkeypatch.setenv("CAREER_EXPLORER_RUN_ID", run_id)
+    return EventLogger(enabled=True, base_dir=base_dir, **kwargs)
+
+
+ANSWERS = [
+    "I'm not sure where to start, maybe with an example.",
+    "Examples help most, and someone asking guiding questions.",
+    "I would map features to moments of stress first.",
+    "The biggest uncertainty is balancing structure with flexibility.",
+]
+
+
+def record_session(logger, session_id, answers):
+    for seq, text in enumerate(answers, start=1):
+        logger.event(session_id, "conversation.message", {
+            "id": seq, "speaker": "system", "content": "question",
+            "content_type": "question", "phase": 1, "timestamp": 0,
+        })
+        logger.event(session_id, "conversation.message", {
+            "id": seq, "speaker": "user", "content": text,
+            "content_type": "user_response", "phase": 1, "timestamp": 0,
+        })
+
+
+def write_run(logs_dir, monkeypatch, sessions, run_id="run-rec"):
+    """
+    A closed run holding each session's answers, as the app logs them.
+    """
+    logger = make_logger(logs_dir, monkeypatch, run_id)
+    for session_id, answers in sessions.items():
+        record_session(logger, session_id, answers)
+    logger.close()
+    return logger
+
+
+def finish_conversation(client):
+    """
+    Answer all three stages; returns the last response.
+    """
+    client.get("/")
+    client.post("/", data={"user_input": "A first answer."})
+    client.post("/", data={"user_input": "A second answer."})
+    return client.post("/", data={"user_input": "A third answer."})
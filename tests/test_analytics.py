@@ -0,0 +1,81 @@
+import json
+
+from tools import analytics
+from tests.helpers import make_logger
+
+
+def message(logger, session_id, seq, content_type):
+    logger.event(session_id, "conversation.message", {
+        "id": seq, "speaker": "system", "content": "...",
+        "content_type": content_type, "phase": 1, "timestamp": 0,
+    })
+
+
+def write_sessions(logs_dir, monkeypatch, run_id, sessions, **kwargs):
+    logger = make_logger(logs_dir, monkeypatch, run_id, **kwargs)
+    for n in range(sessions):
+        session_id = f"{run_id}-{n}"
+        message(logger, session_id, 1, "question")
+        if n % 2:
+            logger.event(session_id, "debug.support_signal_fired", {"signal": "support_seeking"})
+            message(logger, session_id, 2, "followup_question")
+        else:
+            logger.event(session_id, "debug.support_signal_not_fired", {"signal": "support_seeking"})
+        if n % 3 == 0:
+            message(logger, session_id, 3, "consent_offer")
+        interpretation = ("aligned", "misaligned")[n % 2]
+        logger.event(session_id, "session.feedback_received", {"rating": "x", "interpretation": interpretation})
+        logger.write_session_snapshot(session_id, {
+            "conversation_log": [],
+            "signal_counts": {"support_seeking": n % 2, "overwhelmed": 0},
+            "signal_escalated": {"support_seeking": n % 4 == 1, "overwhelmed": False},
+            "feedback": {"interpretation": interpretation},
+        })
+    logger.close()
+    return logger
+
+
+def test_report_over_runs(tmp_path, monkeypatch, clock):
+    write_sessions(tmp_path, monkeypatch, "run-a", 6)
+    write_sessions(tmp_path, monkeypatch, "run-b", 6, event_format="compact", max_segment_bytes=600)
+
+    result = analytics.report(analytics.analyze(tmp_path, workers=2))
+
+    assert result["sessions_started"] == 12
+    assert result["signals"]["support_firing_rate"] == 0.5
+    assert result["signals"]["sessions_with_signal"] == {"support_seeking": {"sessions": 6, "rate": 0.5}}
+    assert result["followups"]["asked"] == 6
+    assert result["followups"]["escalated_sessions"]["support_seeking"]["sessions"] == 4
+    assert result["feedback"]["interpretation"]["aligned"] == {"count": 6, "share": 0.5}
+    assert result["consent"] == {"offers": 4, "offer_rate": 0.3333, "limits_explained": 0, "limits_per_offer": 0.0}
+    assert result["event_types"]["conversation.message"]["count"] == 12 + 6 + 4
+
+
+def test_parallel_merge_matches_single_runs(tmp_path, monkeypatch, clock):
+    for r in range(4):
+        write_sessions(tmp_path, monkeypatch, f"run-{r}", 3 + r)
+
+    merged = analytics.Aggregates()
+    for run_dir in sorted((tmp_path / "runs").iterdir()):
+        merged.merge(analytics.analyze_run(str(run_dir)))
+
+    assert analytics.report(analytics.analyze(tmp_path, workers=3)) == analytics.report(merged)
+
+
+def test_time_window_limits_events_and_snapshots(tmp_path, monkeypatch, clock):
+    logger = write_sessions(tmp_path, monkeypatch, "run-a", 6)
+    first = min(json.loads(line)["ts"] for line in logger.events_path.read_text().splitlines())
+
+    result = analytics.report(analytics.analyze(tmp_path, start_ts=first, end_ts=first + 4, workers=1))
+    assert result["sessions_started"] == 1
+    assert result["feedback"]["total"] == 1
+    # question, not_fired, consent offer, feedback; the snapshot took the 5th tick
+    assert sum(t["count"] for t in result["event_types"].values()) == 4
+
+
+def test_cli_writes_report(tmp_path, monkeypatch, clock):
+    write_sessions(tmp_path, monkeypatch, "run-a", 2)
+    output = tmp_path / "report.json"
+
+    assert analytics.main(["--logs", str(tmp_path), "--workers", "1", "--output", str(output)]) == 0
+    assert json.loads(output.read_text())["sessions_started"] == 2
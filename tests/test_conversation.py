@@ -0,0 +1,83 @@
+import json
+
+from catalog import QUESTIONS, followup_ref, question_ref
+from conversation import ConversationState, LogEntry
+from signals import SUPPORT_SIGNAL
+
+
+def test_log_entries_are_numbered_in_order():
+    state = ConversationState.new(owner_id="owner-1")
+
+    first = state.append_log("system", "Question one", "question", 1)
+    second = state.append_log("user", "An answer", "user_response", 1)
+
+    assert (first.seq, second.seq) == (1, 2)
+    assert state.conversation_log == [first, second]
+
+
+def test_records_are_slotted():
+    state = ConversationState.new()
+    entry = state.append_log("user", "An answer", "user_response", 1)
+
+    assert not hasattr(state, "__dict__")
+    assert not hasattr(entry, "__dict__")
+
+
+def test_log_entry_serializes_to_legacy_message_shape():
+    entry = LogEntry(
+        seq=3,
+        speaker="user",
+        text="An answer",
+        content_type="user_response",
+        phase=1,
+        timestamp=1.5,
+    )
+
+    assert entry.to_dict() == {
+        "id": 3,
+        "speaker": "user",
+        "content": "An answer",
+        "content_type": "user_response",
+        "phase": 1,
+        "timestamp": 1.5,
+    }
+    assert LogEntry.from_dict(entry.to_dict()) == entry
+
+
+def test_state_round_trips_through_json():
+    state = ConversationState.new(owner_id="owner-1", phase5_consent_token="dev-consent")
+    state.stage = 2
+    state.responses[1] = "An answer"
+    state.questions_logged.update({1, 2})
+    state.signal_counts["systems_thinking"] = 1
+    state.append_log("system", "Question one", "question", 1)
+    state.append_log("user", "An answer", "user_response", 1)
+
+    data = json.loads(json.dumps(state.to_dict()))
+
+    assert ConversationState.from_dict(data) == state
+
+
+def test_system_text_is_stored_by_reference():
+    state = ConversationState.new()
+    entry = state.append_log("system", None, "question", 1, ref=question_ref(2))
+
+    assert entry.text is None
+    assert entry.content == QUESTIONS[2]
+    assert entry.to_dict()["content"] == QUESTIONS[2]
+
+    stored = entry.to_dict(resolve=False)
+    assert stored["ref"] == "question:2"
+    assert "content" not in stored
+
+
+def test_decoded_refs_share_the_catalog_instance():
+    state = ConversationState.new()
+    state.append_log("system", None, "followup_question", 2, ref=followup_ref(0))
+
+    data = json.loads(json.dumps(state.to_dict()))
+    loaded = ConversationState.from_dict(data)
+    entry = loaded.conversation_log[0]
+
+    assert entry.ref is followup_ref(0)
+    assert entry.content == SUPPORT_SIGNAL["questions"][0]
@@ -0,0 +1,41 @@
+from app import app
+
+
+def test_post_with_cursor_returns_only_new_entries():
+    client = app.test_client()
+    client.get("/")  # logs question 1
+
+    resp = client.post("/?after=1", data={"user_input": "A first answer."})
+    data = resp.get_json()
+
+    assert [e["id"] for e in data["entries"]] == [2, 3]
+    assert [e["speaker"] for e in data["entries"]] == ["user", "system"]
+    assert data["entries"][0]["content"] == "A first answer."
+    assert data["entries"][1]["content"] == "How would you actually start working on this?"
+    assert data["cursor"] == 3
+    assert data["stage"] == 2
+
+
+def test_log_endpoint_returns_entries_after_cursor():
+    client = app.test_client()
+    client.get("/")
+    client.post("/", data={"user_input": "A first answer."})
+
+    everything = client.get("/conversation/log").get_json()
+    tail = client.get("/conversation/log?after=2").get_json()
+
+    assert [e["id"] for e in everything["entries"]] == [1, 2, 3]
+    assert [e["id"] for e in tail["entries"]] == [3]
+    assert tail["cursor"] == everything["cursor"] == 3
+
+
+def test_client_mode_redirects_to_summary_page():
+    client = app.test_client()
+    client.get("/")
+    client.post("/", data={"user_input": "A first answer."})
+    client.post("/", data={"user_input": "A second answer."})
+
+    resp = client.post("/?after=5", data={"user_input": "A third answer."})
+
+    assert resp.get_json() == {"redirect": "/"}
+    assert b"Conversation Summary" in client.get("/").data
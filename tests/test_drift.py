@@ -0,0 +1,126 @@
+import io
+import json
+
+from catalog import SYSTEM_TEXT
+from tools import drift, replay
+from tests.helpers import ANSWERS, make_logger, write_run
+
+
+def log(*refs):
+    entries = []
+    for n, ref in enumerate(refs, start=1):
+        entries.append({"id": n, "speaker": "system", "ref": ref,
+                        "content_type": ref.split(":")[0], "phase": 1, "timestamp": 0})
+    return entries
+
+
+def snapshot(refs, support=0, escalated=False):
+    return {
+        "conversation_log": log(*refs),
+        "signal_counts": {"support_seeking": support, "overwhelmed": 0,
+                          "systems_thinking": 0, "exploration_first": 0},
+        "signal_escalated": {"support_seeking": escalated, "overwhelmed": False},
+        "feedback": {},
+    }
+
+
+def write_snapshots(logs_dir, monkeypatch, run_id, sessions):
+    logger = make_logger(logs_dir, monkeypatch, run_id)
+    for session_id, data in sessions.items():
+        logger.write_session_snapshot(session_id, data)
+    return logger.run_dir
+
+
+PATH = ["question:1", "question:2", "question:3"]
+FOLLOWUP_PATH = ["question:1", "followup:support_seeking:0", "question:2", "question:3"]
+
+
+def test_only_differing_sessions_are_emitted(tmp_path, monkeypatch):
+    run_a = write_snapshots(tmp_path, monkeypatch, "run-a", {
+        "s1": snapshot(PATH),
+        "s2": snapshot(FOLLOWUP_PATH, support=2),
+        "s3": snapshot(PATH),
+        "s5": snapshot(PATH),
+    })
+    run_b = write_snapshots(tmp_path, monkeypatch, "run-b", {
+        "s1": snapshot(PATH),
+        "s2": snapshot(PATH, support=1),
+        "s4": snapshot(PATH),
+        "s5": snapshot(PATH),
+    })
+    out = io.StringIO()
+
+    stats = drift.drift(run_a, run_b, out)
+
+    [line] = out.getvalue().splitlines()
+    record = json.loads(line)
+    assert record["session_id"] == "s2"
+    assert record["diff"]["followups"] == {"common_prefix": 0, "a": ["followup:support_seeking:0"], "b": []}
+    assert record["diff"]["stage_path"] == {
+        "common_prefix": 1,
+        "a": ["followup:support_seeking:0", "question:2", "question:3"],
+        "b": ["question:2", "question:3"],
+    }
+    assert record["diff"]["reflections"] == {"added": [], "removed": ["uncertainty_observed"]}
+    assert stats["compared"] == 3
+    assert (stats["identical"], stats["differing"], stats["only_a"], stats["only_b"]) == (2, 1, 1, 1)
+    assert stats["fields"] == {"followups": 1, "reflections": 1, "stage_path": 1}
+    assert stats["reflections_removed"] == {"uncertainty_observed": 1}
+
+
+def test_stored_unlocked_keys_are_diffed_not_recomputed(tmp_path, monkeypatch):
+    old = snapshot(PATH, support=2)
+    old["unlocked_snippets"] = ["uncertainty_observed"]
+    new = snapshot(PATH, support=2)
+    new["unlocked_snippets"] = []
+    run_a = write_snapshots(tmp_path, monkeypatch, "run-a", {"s1": old})
+    run_b = write_snapshots(tmp_path, monkeypatch, "run-b", {"s1": new})
+    out = io.StringIO()
+
+    drift.drift(run_a, run_b, out)
+
+    record = json.loads(out.getvalue())
+    assert record["diff"] == {"reflections": {"added": [], "removed": ["uncertainty_observed"]}}
+
+
+def test_legacy_entries_without_refs_match_their_catalog_refs(tmp_path, monkeypatch):
+    legacy = snapshot(FOLLOWUP_PATH, support=2)
+    for entry in legacy["conversation_log"]:
+        entry["content"] = SYSTEM_TEXT[entry.pop("ref")]
+    run_a = write_snapshots(tmp_path, monkeypatch, "run-a", {"s1": legacy})
+    run_b = write_snapshots(tmp_path, monkeypatch, "run-b", {"s1": snapshot(FOLLOWUP_PATH, support=2)})
+    out = io.StringIO()
+
+    stats = drift.drift(run_a, run_b, out)
+
+    assert out.getvalue() == ""
+    assert stats["identical"] == 1
+
+
+def test_merge_join_covers_union_in_order():
+    a = iter([("a", 1), ("c", 3), ("d", 4)])
+    b = iter([("b", 2), ("c", 30), ("e", 5)])
+    assert list(drift.merge_join(a, b)) == [
+        ("a", 1, None), ("b", None, 2), ("c", 3, 30), ("d", 4, None), ("e", None, 5),
+    ]
+
+
+def test_snapshots_are_walked_in_id_order(tmp_path, monkeypatch):
+    run_dir = write_snapshots(tmp_path, monkeypatch, "run-a", {"a-": snapshot(PATH), "a": snapshot(PATH)})
+    assert [session_id for session_id, _ in drift.iter_snapshots(run_dir)] == ["a", "a-"]
+
+
+def test_replayed_runs_of_same_code_do_not_drift(tmp_path, monkeypatch, capsys):
+    write_run(tmp_path, monkeypatch, {"a": ANSWERS, "b": ANSWERS[2:]})
+    for record_run in ("replay-1", "replay-2"):
+        replay.replay(tmp_path, tmp_path / f"{record_run}.jsonl", run_id="run-rec",
+                      workers=1, record_run=record_run)
+
+    sessions_dir = tmp_path / "runs" / "replay-1" / "sessions"
+    assert sorted(p.name for p in sessions_dir.iterdir()) == ["a.json", "b.json"]
+    assert "unlocked_snippets" in json.loads((sessions_dir / "a.json").read_text())["data"]
+    assert drift.main(["replay-1", "replay-2", "--logs", str(tmp_path)]) == 0
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    stats = json.loads(captured.err)
+    assert (stats["compared"], stats["identical"]) == (2, 2)
@@ -0,0 +1,103 @@
+import itertools
+import json
+
+import pytest
+
+import telemetry
+from telemetry import build_run_index, events_between, index_path, iter_events, list_segments
+from tools import event_window as cli
+from tests.helpers import make_logger
+
+
+def emit(logger, count=400):
+    for n in range(count):
+        logger.event(f"s{n % 7}", "conversation.message", {"n": n, "text": "x" * 40})
+
+
+def payloads(records):
+    return [r["payload"]["n"] for r in records]
+
+
+@pytest.mark.parametrize("event_format", ["jsonl", "compact"])
+@pytest.mark.parametrize("max_segment_bytes", [None, 4_000])
+def test_window_matches_filtered_scan(tmp_path, monkeypatch, clock, event_format, max_segment_bytes):
+    logger = make_logger(tmp_path, monkeypatch, event_format=event_format, max_segment_bytes=max_segment_bytes)
+    monkeypatch.setattr(telemetry, "TS_INDEX_BYTES", 500)
+    emit(logger)
+    logger.close()
+    everything = list(iter_events(logger.run_dir))
+    start, end = everything[0]["ts"], everything[-1]["ts"]
+
+    for lo, hi in [(start + 50, start + 60), (start + 199.5, start + 250), (None, start + 3), (end - 3, None),
+                   (end + 1, end + 5), (None, None)]:
+        want = [r for r in everything if (lo is None or r["ts"] >= lo) and (hi is None or r["ts"] <= hi)]
+        assert list(events_between(logger.run_dir, lo, hi)) == want
+
+
+def test_window_skips_segments_and_seeks(tmp_path, monkeypatch, clock):
+    logger = make_logger(tmp_path, monkeypatch, event_format="compact", max_segment_bytes=4_000)
+    monkeypatch.setattr(telemetry, "TS_INDEX_BYTES", 500)
+    emit(logger)
+    logger.close()
+    start = next(iter_events(logger.run_dir))["ts"]
+
+    read = []
+    real = telemetry._raw_lines
+
+    def counting(path, offset=0):
+        for item in real(path, offset):
+            read.append(path)
+            yield item
+
+    monkeypatch.setattr(telemetry, "_raw_lines", counting)
+    assert payloads(events_between(logger.run_dir, start + 200, start + 204)) == [200, 201, 202, 203, 204]
+    segments = len(list_segments(logger.run_dir))
+    assert segments >= 8
+    assert len(set(read)) <= 2
+    # the window, up to one sparse interval before it in each file
+    # touched, and the record that ends the scan
+    assert len(read) < 5 + 2 * (500 // 60 + 1) + 1
+
+
+def test_window_on_open_segment_and_unindexed_logs(tmp_path, monkeypatch, clock):
+    logger = make_logger(tmp_path, monkeypatch, max_segment_bytes=4_000)
+    emit(logger)
+    logger.close()
+    logger.event("late", "debug.late", {"n": 400})
+    for _, path in list_segments(logger.run_dir):
+        index_path(path).unlink(missing_ok=True)
+    (logger.run_dir / telemetry.SESSION_MAP_FILE).unlink()
+
+    start = next(iter_events(logger.run_dir))["ts"]
+    assert payloads(events_between(logger.run_dir, start + 398)) == [398, 399, 400]
+    build_run_index(logger.run_dir)
+    assert payloads(events_between(logger.run_dir, start + 10, start + 11)) == [10, 11]
+
+
+def test_unsorted_file_is_scanned(tmp_path, monkeypatch):
+    ticks = itertools.count(5)
+    monkeypatch.setattr(telemetry, "_now_ts", lambda: float(next(ticks)))
+    first = make_logger(tmp_path, monkeypatch)
+    for n in range(3):
+        first.event("a", "debug.test", {"n": n})
+    first.close()
+    # A restart with a clock that went backwards.
+    ticks = itertools.count(1)
+    second = make_logger(tmp_path, monkeypatch)
+    for n in range(3, 5):
+        second.event("a", "debug.test", {"n": n})
+    second.close()
+
+    assert payloads(events_between(first.run_dir, 1.5, 6.0)) == [0, 3, 4]
+
+
+def test_cli_parses_iso_bounds(tmp_path, monkeypatch, capsys, clock):
+    logger = make_logger(tmp_path, monkeypatch)
+    emit(logger, count=10)
+    logger.close()
+
+    start = cli.parse_ts("1970-01-01T00:16:45+00:00")
+    assert start == 1_005.0
+    assert cli.main(["--logs", str(tmp_path), "--start", "1970-01-01T00:16:45+00:00", "--end", "1006"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["ts"] for line in lines] == [1_005.0, 1_006.0]
@@ -0,0 +1,93 @@
+import pytest
+
+from signals import SIGNALS, detect_all, fuzzy_signal_index
+from text_features import FuzzyPhraseIndex, TextFeatures, osa_distance
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("unsure", "unsure", 0),
+    ("unsrue", "unsure", 1),       # transposition
+    ("architecure", "architecture", 1),
+    ("guidence", "guidance", 1),
+    ("framwork", "framework", 1),
+    ("abc", "xyz", 2),             # capped at limit + 1
+])
+def test_osa_distance(a, b, expected):
+    assert osa_distance(a, b, limit=1) == expected
+
+
+def test_fuzzy_is_off_by_default():
+    assert detect_all("I'm unsrue about the architecure") == {}
+
+
+def test_typos_fire_signals_with_canonical_keywords():
+    index = fuzzy_signal_index(1)
+    result = detect_all("I'm unsrue about the architecure", fuzzy=index)
+    assert result == {
+        "support_seeking": ["unsure"],
+        "systems_thinking": ["architecture"],
+    }
+
+
+def test_multi_word_keywords_match_consecutive_tokens():
+    index = fuzzy_signal_index(1)
+    assert detect_all("can you walk me throguh it", fuzzy=index) == {
+        "support_seeking": ["walk me through"],
+    }
+    assert detect_all("walk through me", fuzzy=index) == {}
+
+
+def test_short_keyword_words_must_match_exactly():
+    index = fuzzy_signal_index(1)
+    assert detect_all("it held up", fuzzy=index) == {}
+    assert detect_all("a fow of ideas", fuzzy=index) == {}
+
+
+@pytest.mark.parametrize("text", [
+    "I want to ensure the tests pass",
+    "we insure the building",
+    "it might explode",
+    "a lean team",
+    "a steep slope",
+    "though it took a while",
+])
+def test_real_words_near_keywords_are_not_typos(text):
+    assert detect_all(text, fuzzy=fuzzy_signal_index(1)) == {}
+
+
+def test_exact_words_still_match_their_own_phrases():
+    index = FuzzyPhraseIndex({"g": ["lean", "learn"]}, exact_words=["lean"])
+    assert index.match(TextFeatures("a lean plan").tokens) == {"g": ["lean"]}
+    assert index.match(TextFeatures("i want to lern").tokens) == {"g": ["learn"]}
+
+
+def test_fuzzy_results_extend_exact_results_in_keyword_order():
+    index = fuzzy_signal_index(1)
+    text = "an example and some guidence would help"
+    exact = detect_all(text)
+    fuzzy = detect_all(text, fuzzy=index)
+    assert exact == {"support_seeking": ["help", "example"]}
+    assert fuzzy == {"support_seeking": ["help", "guidance", "example"]}
+
+
+def test_exact_text_is_unchanged_by_fuzzy_mode():
+    index = fuzzy_signal_index(1)
+    for signal in SIGNALS:
+        for keyword in signal["keywords"]:
+            assert detect_all(keyword, fuzzy=index) == detect_all(keyword)
+
+
+def test_edit_distance_is_configurable():
+    text = "i'd like to experiemnt and reserach"
+    assert detect_all(text, fuzzy=fuzzy_signal_index(1)) == {
+        "exploration_first": ["research", "experiment"],
+    }
+    assert detect_all("exprmnt", fuzzy=fuzzy_signal_index(1)) == {}
+    assert detect_all("exprment", fuzzy=fuzzy_signal_index(2)) == {
+        "exploration_first": ["experiment"],
+    }
+
+
+def test_index_accepts_text_features_tokens():
+    index = FuzzyPhraseIndex({"g": ["pipeline"]})
+    assert index.match(TextFeatures("the PIPELNIE").tokens) == {"g": ["pipeline"]}
@@ -0,0 +1,54 @@
+from phase5.intents import Intent, INTENT_TRIGGERS, classify_intents
+from text_features import TextFeatures
+
+
+def naive_intents(text):
+    lowered = text.lower()
+    return frozenset(
+        intent for intent, triggers in INTENT_TRIGGERS.items()
+        if any(t in lowered for t in triggers)
+    )
+
+
+def test_one_classification_returns_every_intent():
+    text = "Please analyze this. What should I do?"
+
+    assert classify_intents(text) == {
+        Intent.PHASE5_REQUEST,
+        Intent.EXPLICIT_INTERPRETATION,
+        Intent.AUTHORITATIVE_GUIDANCE,
+    }
+
+
+def test_classification_matches_the_old_per_list_scans():
+    samples = [
+        "",
+        "I answered the questions already.",
+        "Can we go deeper?",
+        "What does this suggest about me?",
+        "Help me understand what this means.",
+        "Tell me what to do with this PATTERN.",
+        "I'd like to reflect on my answers.",
+    ]
+
+    for text in samples:
+        assert classify_intents(text) == naive_intents(text), text
+
+
+def test_intents_are_cached_on_text_features():
+    features = TextFeatures("interpret this")
+
+    assert classify_intents(features) is classify_intents(features)
+
+
+def test_app_and_boundary_consume_the_same_intents():
+    from app import looks_like_phase5_request
+    from phase5.boundary import LLMBoundary
+    from phase5.bounded_adapter import requests_authoritative_guidance
+
+    features = TextFeatures("Please ANALYZE this. What should I do?")
+
+    assert looks_like_phase5_request(features) is True
+    assert LLMBoundary.is_explicit_interpretation_request(features) is True
+    assert requests_authoritative_guidance(features) is True
+    assert requests_authoritative_guidance("All good.") is False
@@ -0,0 +1,31 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tools.pool import IN_FLIGHT_PER_WORKER, bounded_map, chunked
+
+
+def test_chunked_splits_lazily():
+    assert list(chunked(iter(range(7)), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunked([], 3)) == []
+
+
+def test_results_keep_input_order_and_in_flight_is_bounded():
+    produced = []
+
+    def items():
+        for n in range(20):
+            produced.append(n)
+            yield n
+
+    def slow_square(n):
+        time.sleep(0.002 * (n % 3))
+        return n * n
+
+    taken = []
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        for item, result in bounded_map(pool, slow_square, items(), workers=2):
+            # Never more than the window ahead of what was consumed.
+            assert len(produced) - len(taken) <= 2 * IN_FLIGHT_PER_WORKER
+            taken.append((item, result))
+
+    assert taken == [(n, n * n) for n in range(20)]
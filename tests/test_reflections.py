@@ -0,0 +1,85 @@
+from itertools import product
+from types import SimpleNamespace
+
+import reflections
+from reflections import (
+    REFLECTION_SNIPPETS,
+    check_reflection_condition,
+    collect_reflections,
+    signal_vector,
+    unlocked_snippets,
+)
+
+
+def state(support=0, systems=0, exploration=0, escalated=False):
+    return SimpleNamespace(
+        signal_counts={
+            "support_seeking": support,
+            "overwhelmed": 0,
+            "systems_thinking": systems,
+            "exploration_first": exploration,
+        },
+        signal_escalated={"support_seeking": escalated},
+    )
+
+
+def reference_condition(condition, s):
+    # The original string-dispatched if-chain.
+    if condition == "support_seeking_escalated":
+        return s.signal_escalated.get("support_seeking", False)
+    if condition == "support_seeking_observed":
+        return (
+            s.signal_counts.get("support_seeking", 0) >= 2
+            and not s.signal_escalated.get("support_seeking", False)
+        )
+    if condition == "systems_thinking_observed":
+        return s.signal_counts.get("systems_thinking", 0) >= 1
+    if condition == "exploration_first_observed":
+        return s.signal_counts.get("exploration_first", 0) >= 2
+    return False
+
+
+def test_compiled_conditions_match_reference_if_chain():
+    for support, systems, exploration, escalated in product(range(4), range(3), range(4), [False, True]):
+        s = state(support, systems, exploration, escalated)
+        for snippet in REFLECTION_SNIPPETS.values():
+            condition = snippet["condition"]
+            assert check_reflection_condition(condition, s) == reference_condition(condition, s)
+
+        expected = [
+            snippet["text"]
+            for snippet in REFLECTION_SNIPPETS.values()
+            if reference_condition(snippet["condition"], s)
+        ]
+        assert collect_reflections(s) == expected
+
+
+def test_unknown_condition_is_false():
+    assert check_reflection_condition("no_such_condition", state(support=5)) is False
+
+
+def test_snippets_recompute_only_when_signals_change(monkeypatch):
+    calls = []
+    real = reflections.COMPILED_CONDITIONS["systems_thinking_observed"]
+    monkeypatch.setitem(
+        reflections.COMPILED_CONDITIONS,
+        "systems_thinking_observed",
+        lambda v: calls.append(v) or real(v),
+    )
+    unlocked_snippets.cache_clear()
+
+    s = state(systems=1)
+    collect_reflections(s)
+    collect_reflections(s)
+    assert len(calls) == 1
+
+    s.signal_counts["systems_thinking"] += 1
+    collect_reflections(s)
+    assert len(calls) == 2
+    unlocked_snippets.cache_clear()
+
+
+def test_missing_signals_count_as_zero():
+    s = SimpleNamespace(signal_counts={}, signal_escalated={})
+    assert signal_vector(s) == signal_vector(state())
+    assert collect_reflections(s) == []
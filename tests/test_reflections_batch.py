@@ -0,0 +1,93 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from reflections import (  # noqa: E402
+    REFLECTION_SNIPPETS,
+    batch_unlocked_snippets,
+    condition_masks,
+    check_reflection_condition,
+    signal_matrix,
+    signal_vector,
+    unlocked_snippets,
+)
+
+
+def random_signals(rng):
+    return {
+        "signal_counts": {
+            "support_seeking": rng.randint(0, 4),
+            "overwhelmed": rng.randint(0, 2),
+            "systems_thinking": rng.randint(0, 3),
+            "exploration_first": rng.randint(0, 4),
+        },
+        "signal_escalated": {"support_seeking": rng.random() < 0.3},
+    }
+
+
+def test_batch_matches_scalar_reflections():
+    rng = random.Random(0)
+    items = [random_signals(rng) for _ in range(2_000)]
+    states = [SimpleNamespace(**item) for item in items]
+
+    assert batch_unlocked_snippets(items) == [
+        unlocked_snippets.__wrapped__(signal_vector(s)) for s in states
+    ]
+
+    masks = condition_masks(signal_matrix(items))
+    for name, mask in masks.items():
+        assert mask.tolist() == [check_reflection_condition(name, s) for s in states]
+
+
+def test_batch_accepts_states_snapshot_data_and_snapshot_records():
+    data = {
+        "signal_counts": {"systems_thinking": 1, "support_seeking": 3},
+        "signal_escalated": {"support_seeking": True},
+    }
+    record = {"run_id": "r", "session_id": "s", "data": data}
+    state = SimpleNamespace(**data)
+
+    expected = ("uncertainty_handling", "structure_orientation")
+    assert batch_unlocked_snippets([state, data, record]) == [expected] * 3
+
+
+def test_missing_signals_count_as_zero():
+    assert batch_unlocked_snippets([{"data": {}}]) == [()]
+
+
+def test_empty_batch():
+    assert batch_unlocked_snippets([]) == []
+    assert signal_matrix([]).shape[0] == 0
+
+
+def test_keys_follow_snippet_order():
+    everything = {
+        "signal_counts": {"support_seeking": 5, "systems_thinking": 5, "exploration_first": 5},
+        "signal_escalated": {"support_seeking": True},
+    }
+    [keys] = batch_unlocked_snippets([everything])
+    order = list(REFLECTION_SNIPPETS)
+    assert list(keys) == sorted(keys, key=order.index)
+
+
+def test_many_snippets_still_match_scalar(monkeypatch):
+    import reflections
+
+    conditions = list(reflections.REFLECTION_CONDITIONS)
+    for i in range(60):
+        monkeypatch.setitem(
+            reflections.REFLECTION_SNIPPETS,
+            f"extra_{i}",
+            {"condition": conditions[i % len(conditions)], "text": f"extra {i}"},
+        )
+    monkeypatch.setattr(reflections, "SNIPPET_KEYS", list(reflections.REFLECTION_SNIPPETS))
+
+    rng = random.Random(1)
+    items = [random_signals(rng) for _ in range(500)]
+    assert batch_unlocked_snippets(items) == [
+        unlocked_snippets.__wrapped__(signal_vector(SimpleNamespace(**item)))
+        for item in items
+    ]
@@ -0,0 +1,116 @@
+import json
+
+import app as app_module
+import telemetry
+from tools import replay
+from tests.helpers import ANSWERS, make_logger, write_run
+
+
+def test_recorded_inputs_are_grouped_per_session(tmp_path, monkeypatch):
+    logger = write_run(tmp_path, monkeypatch, {"a": ANSWERS, "b": ANSWERS[2:]})
+    sessions = list(replay.iter_recorded_sessions(logger.run_dir))
+    assert [(s["session_id"], s["inputs"]) for s in sessions] == [("a", ANSWERS), ("b", ANSWERS[2:])]
+
+
+def test_completed_sessions_are_yielded_without_reading_ahead(monkeypatch):
+    def message(session_id, text):
+        return {"session_id": session_id, "type": "conversation.message",
+                "payload": {"speaker": "user", "content": text}}
+
+    records = [
+        message("a", "one"),
+        message("b", "two"),
+        {"session_id": "a", "type": "conversation.completed", "payload": {}},
+        message("b", "three"),
+        message("a", "after the summary"),
+    ]
+    read = []
+
+    def fake_iter_events(run_dir):
+        for record in records:
+            read.append(record)
+            yield record
+
+    monkeypatch.setattr(replay, "iter_events", fake_iter_events)
+    sessions = replay.iter_recorded_sessions("run")
+
+    assert next(sessions)["inputs"] == ["one"]
+    assert len(read) == 3
+    assert [(s["session_id"], s["inputs"]) for s in sessions] == [("b", ["two", "three"])]
+
+
+def test_inputs_intercepted_by_consent_are_recorded_and_replayed(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, "DEV_PHASE5_CONSENT_TOKEN", None)
+    monkeypatch.setattr(app_module, "logger", make_logger(tmp_path, monkeypatch, "run-live"))
+    monkeypatch.setattr(app_module, "append_proposal", lambda **kwargs: None)
+    inputs = ["Can you analyze my answers?", "A first answer.", "A second answer.", "A third answer."]
+    client = app_module.app.test_client()
+    client.get("/")
+    for text in inputs:
+        client.post("/", data={"user_input": text})
+    app_module.logger.close()
+    run_dir = app_module.logger.run_dir
+    assert "conversation.completed" in {r["type"] for r in telemetry.iter_events(run_dir)}
+
+    [session] = replay.iter_recorded_sessions(run_dir)
+    assert session["inputs"] == inputs
+    result = replay.replay_session(app_module, session)
+    assert result["steps"][0] == {"stage": 1, "consent_prompt": True}
+    assert result["completed"] is True
+
+
+def test_replay_session_records_followups_stages_and_summary(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, "append_proposal", lambda **kwargs: None)
+    session = {"run_id": "r", "session_id": "s", "inputs": ANSWERS}
+
+    first = replay.replay_session(app_module, session)
+    second = replay.replay_session(app_module, session)
+
+    assert first == second
+    assert first["completed"] is True
+    assert first["replayed"] == 4
+    assert "followups" in first["steps"][0]
+    assert first["steps"][0]["stage"] == 1
+    assert first["steps"][1]["stage"] == 2
+    assert first["steps"][-1] == {"stage": "summary"}
+    assert first["summary"]
+
+
+def test_incomplete_session_has_no_summary(monkeypatch):
+    session = {"run_id": "r", "session_id": "s", "inputs": ANSWERS[2:3]}
+    result = replay.replay_session(app_module, session)
+    assert result["completed"] is False
+    assert result["summary"] is None
+    assert result["steps"] == [{"stage": 2}]
+
+
+def test_parallel_replay_keeps_source_order(tmp_path, monkeypatch):
+    sessions = {f"s{n}": ANSWERS if n % 2 else ANSWERS[2:] for n in range(7)}
+    write_run(tmp_path, monkeypatch, sessions)
+    output = tmp_path / "replay.jsonl"
+
+    assert replay.replay(tmp_path, output, workers=2, chunk_size=2) == 7
+
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [r["session_id"] for r in results] == list(sessions)
+    assert [r["completed"] for r in results] == [n % 2 == 1 for n in range(7)]
+    assert all("error" not in r for r in results)
+    assert len({r["summary"] for r in results if r["completed"]}) == 1
+
+
+def test_single_session_uses_index(tmp_path, monkeypatch):
+    write_run(tmp_path, monkeypatch, {"a": ANSWERS, "b": ANSWERS[2:]})
+    [session] = replay.iter_sessions(tmp_path, "run-rec", "b")
+    assert session["inputs"] == ANSWERS[2:]
+    assert telemetry.session_events(tmp_path / "runs" / "run-rec", "zzz") == []
+
+
+def test_workers_remove_their_memory_dirs(tmp_path, monkeypatch):
+    write_run(tmp_path, monkeypatch, {"a": ANSWERS})
+    scratch = tmp_path / "scratch"
+    scratch.mkdir()
+    # Spawned workers read TMPDIR afresh.
+    monkeypatch.setenv("TMPDIR", str(scratch))
+
+    assert replay.replay(tmp_path, tmp_path / "replay.jsonl", workers=2) == 1
+    assert list(scratch.iterdir()) == []
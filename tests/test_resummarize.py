@@ -0,0 +1,118 @@
+import json
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from reflections import collect_reflections
+from tools import resummarize as rs
+
+
+def write_snapshots(logs_dir, runs=3, per_run=7, seed=0):
+    rng = random.Random(seed)
+    for r in range(runs):
+        sessions_dir = logs_dir / "runs" / f"run-{r}" / "sessions"
+        sessions_dir.mkdir(parents=True)
+        for s in range(per_run):
+            session_id = f"s-{r}-{s}"
+            data = {
+                "conversation_log": [
+                    {"id": 1, "speaker": "system", "ref": "question:1",
+                     "content_type": "question", "phase": 1, "timestamp": 0},
+                    {"id": 2, "speaker": "user", "content": "I'd explore the context",
+                     "content_type": "user_response", "phase": 1, "timestamp": 0},
+                ],
+                "signal_counts": {
+                    "support_seeking": rng.randint(0, 3),
+                    "overwhelmed": 0,
+                    "systems_thinking": rng.randint(0, 2),
+                    "exploration_first": rng.randint(0, 3),
+                },
+                "signal_escalated": {"support_seeking": rng.random() < 0.3},
+                "feedback": {},
+            }
+            (sessions_dir / f"{session_id}.json").write_text(json.dumps({
+                "run_id": f"run-{r}",
+                "git_sha": "abc",
+                "session_id": session_id,
+                "snapshot_ts": 0,
+                "data": data,
+            }))
+
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_outputs_every_snapshot_in_walk_order(tmp_path):
+    write_snapshots(tmp_path / "logs")
+    out = tmp_path / "out.jsonl"
+
+    total = rs.resummarize(tmp_path / "logs", out, workers=2, chunk_size=3)
+
+    records = read_lines(out)
+    assert total == len(records) == 21
+    assert [r["session_id"] for r in records] == [
+        f"s-{r}-{s}" for r in range(3) for s in range(7)
+    ]
+    for record in records:
+        snapshot = json.loads(open(record["source"]).read())
+        state = SimpleNamespace(**snapshot["data"])
+        assert record["reflections"] == collect_reflections(state)
+        assert record["base_summary"][0].startswith("You approach new problems by exploring")
+
+
+def test_resume_continues_after_checkpoint(tmp_path):
+    write_snapshots(tmp_path / "logs")
+    full = tmp_path / "full.jsonl"
+    rs.resummarize(tmp_path / "logs", full, workers=2, chunk_size=4)
+
+    # Simulate a crash: 8 records checkpointed, a partial line after them.
+    out = tmp_path / "out.jsonl"
+    lines = full.read_text().splitlines(keepends=True)
+    head = "".join(lines[:8])
+    out.write_text(head + lines[8][:10])
+    rs.save_checkpoint(
+        out.with_name(out.name + ".checkpoint"),
+        done=8,
+        offset=len(head.encode("utf-8")),
+        fingerprint=rs.pipeline_fingerprint(),
+    )
+
+    total = rs.resummarize(tmp_path / "logs", out, resume=True, workers=2, chunk_size=4)
+
+    assert total == 21
+    assert out.read_text() == full.read_text()
+
+
+def test_resume_refuses_checkpoint_from_other_wording(tmp_path):
+    write_snapshots(tmp_path / "logs", runs=1, per_run=2)
+    out = tmp_path / "out.jsonl"
+    rs.resummarize(tmp_path / "logs", out, workers=1)
+    rs.save_checkpoint(out.with_name(out.name + ".checkpoint"), 1, 0, "other-wording")
+
+    with pytest.raises(SystemExit):
+        rs.resummarize(tmp_path / "logs", out, resume=True, workers=1)
+
+
+def test_unreadable_snapshot_is_reported_not_fatal(tmp_path):
+    write_snapshots(tmp_path / "logs", runs=1, per_run=2)
+    (tmp_path / "logs" / "runs" / "run-0" / "sessions" / "broken.json").write_text("{")
+    out = tmp_path / "out.jsonl"
+
+    rs.resummarize(tmp_path / "logs", out, workers=1)
+
+    records = read_lines(out)
+    assert len(records) == 3
+    assert records[0]["source"].endswith("broken.json")
+    assert "error" in records[0]
+
+
+def test_followup_answers_are_not_stage_responses():
+    log = [
+        {"speaker": "user", "phase": 1, "content": "first"},
+        {"speaker": "system", "content_type": "followup_question", "phase": 2},
+        {"speaker": "user", "phase": 1, "content": "followup answer"},
+        {"speaker": "user", "phase": 2, "content": "second"},
+    ]
+    assert rs.responses_from_log(log) == {1: "first", 2: "second"}
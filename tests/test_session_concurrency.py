@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+
+import app as app_module
+from app import (
+    app,
+    session_locks,
+    OWNER_COOKIE_NAME,
+)
+from conversation import ConversationState
+from sessions import InMemorySessionStore, SQLiteSessionStore
+
+
+THREADS = 16
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def session_store(request, tmp_path, monkeypatch):
+    if request.param == "sqlite":
+        store = SQLiteSessionStore(
+            path=tmp_path / "sessions.sqlite3",
+            encode=ConversationState.to_dict,
+            decode=ConversationState.from_dict,
+        )
+    else:
+        store = InMemorySessionStore()
+    monkeypatch.setattr(app_module, "session_store", store)
+    return store
+
+
+def client_for(owner_id):
+    client = app.test_client()
+    client.set_cookie(OWNER_COOKIE_NAME, owner_id)
+    return client
+
+
+def run_in_threads(target, count):
+    barrier = threading.Barrier(count)
+    errors = []
+
+    def worker(i):
+        try:
+            barrier.wait()
+            target(i)
+        except Exception as exc:  # pragma: no cover - surfaced below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=30)
+
+    assert not errors, errors
+
+
+def test_many_owners_progress_independently(session_store):
+    def conversation(i):
+        client = client_for(f"stress-owner-{i}")
+        client.get("/")
+        for stage in (1, 2, 3):
+            resp = client.post(
+                "/",
+                data={"user_input": f"owner {i} answer {stage}"},
+                follow_redirects=True,
+            )
+            assert resp.status_code == 200
+
+    run_in_threads(conversation, THREADS)
+
+    for i in range(THREADS):
+        state = session_store.get(f"stress-owner-{i}")
+        assert state.stage == 4
+        assert state.responses == {
+            stage: f"owner {i} answer {stage}" for stage in (1, 2, 3)
+        }
+
+
+def test_same_owner_requests_serialize_without_lost_updates(session_store):
+    owner_id = "stress-shared-owner"
+    client_for(owner_id).get("/")
+
+    def submit(i):
+        resp = client_for(owner_id).post(
+            "/",
+            data={"user_input": f"tab {i} answer"},
+            follow_redirects=True,
+        )
+        assert resp.status_code == 200
+
+    run_in_threads(submit, THREADS)
+
+    state = session_store.get(owner_id)
+    user_entries = [
+        e for e in state.conversation_log if e.speaker == "user"
+    ]
+    assert len(user_entries) == THREADS
+    assert state.stage == THREADS + 1
+    assert sorted(state.responses) == list(range(1, THREADS + 1))
+
+
+def test_locked_owner_does_not_block_other_owners():
+    done = {}
+
+    def request_as(owner_id):
+        client_for(owner_id).get("/")
+        done[owner_id] = True
+
+    with session_locks.hold("stress-busy-owner"):
+        other = threading.Thread(target=request_as, args=("stress-free-owner",))
+        same = threading.Thread(target=request_as, args=("stress-busy-owner",))
+        other.start()
+        same.start()
+
+        other.join(timeout=10)
+        same.join(timeout=0.2)
+
+        assert done.get("stress-free-owner")
+        assert "stress-busy-owner" not in done
+
+    same.join(timeout=10)
+    assert done.get("stress-busy-owner")
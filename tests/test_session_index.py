@@ -0,0 +1,224 @@
+import json
+import os
+
+import pytest
+
+import telemetry
+from telemetry import (
+    build_run_index,
+    index_path,
+    iter_events,
+    list_segments,
+    session_events,
+)
+from tools import session_events as cli
+from tests.helpers import make_logger
+
+
+def emit(logger, count=120, sessions=5):
+    for n in range(count):
+        logger.event(f"s{n % sessions}", ("conversation.message", "debug.signal")[n % 2], {"n": n})
+
+
+def expected(logger, session_id):
+    return [r for r in iter_events(logger.run_dir) if r["session_id"] == session_id]
+
+
+@pytest.mark.parametrize("event_format", ["jsonl", "compact"])
+@pytest.mark.parametrize("max_segment_bytes", [None, 1_500])
+def test_session_events_match_full_scan(tmp_path, monkeypatch, event_format, max_segment_bytes):
+    logger = make_logger(tmp_path, monkeypatch, event_format=event_format, max_segment_bytes=max_segment_bytes)
+    emit(logger)
+    logger.close()
+
+    for session_id in ("s0", "s3"):
+        assert session_events(logger.run_dir, session_id) == expected(logger, session_id)
+    assert session_events(logger.run_dir, "nobody") == []
+
+
+def test_lookup_seeks_instead_of_scanning_indexed_segments(tmp_path, monkeypatch):
+    logger = make_logger(tmp_path, monkeypatch, event_format="compact", max_segment_bytes=1_500)
+    emit(logger, sessions=40)
+    logger.close()
+    want = expected(logger, "s7")
+
+    scanned = []
+    real = telemetry._raw_lines
+    monkeypatch.setattr(telemetry, "_raw_lines", lambda path, start=0: scanned.append(path) or real(path, start))
+    assert session_events(logger.run_dir, "s7") == want
+    assert scanned == []
+
+
+def test_open_segment_is_read_without_index(tmp_path, monkeypatch):
+    logger = make_logger(tmp_path, monkeypatch, event_format="compact", max_segment_bytes=1_500)
+    emit(logger)
+    logger.close()
+    # More events after close go to the open file; its sidecar is now stale.
+    logger.event("s2", "debug.late", {"n": -1})
+
+    records = session_events(logger.run_dir, "s2")
+    assert records[-1]["type"] == "debug.late"
+    assert records == expected(logger, "s2")
+
+
+@pytest.mark.parametrize("event_format", ["jsonl", "compact"])
+def test_open_file_is_indexed_before_close(tmp_path, monkeypatch, event_format):
+    monkeypatch.setattr(telemetry, "INDEX_CHECKPOINT_BYTES", 1_000)
+    monkeypatch.setattr(telemetry, "TS_INDEX_BYTES", 500)
+    logger = make_logger(tmp_path, monkeypatch, event_format=event_format)
+    emit(logger)
+    logger.flush()
+    records = list(iter_events(logger.run_dir))
+    middle = records[len(records) // 2]["ts"]
+    want = expected(logger, "s2")
+
+    scanned = []
+    real = telemetry._raw_lines
+    monkeypatch.setattr(telemetry, "_raw_lines", lambda path, start=0: scanned.append(start) or real(path, start))
+
+    assert session_events(logger.run_dir, "s2") == want
+    assert list(telemetry.events_between(logger.run_dir, middle)) == [r for r in records if r["ts"] >= middle]
+    # Only the tail past the last checkpoint, and the window from
+    # a sparse entry, were scanned.
+    assert scanned and all(start > 0 for start in scanned)
+    logger.close()
+
+
+@pytest.mark.parametrize("event_format", ["jsonl", "compact"])
+def test_checkpoints_append_only_new_entries(tmp_path, monkeypatch, event_format):
+    monkeypatch.setattr(telemetry, "INDEX_CHECKPOINT_BYTES", 1_000)
+    monkeypatch.setattr(telemetry, "TS_INDEX_BYTES", 500)
+    logger = make_logger(tmp_path, monkeypatch, event_format=event_format)
+    emit(logger)
+    logger.flush()
+
+    # The writer keeps only the offsets since the last checkpoint.
+    assert sum(map(len, logger._segments.index.sessions.values())) < 30
+    logger.close()
+
+    # Each checkpoint appended only the offsets since the one before.
+    lines = index_path(logger.events_path).read_bytes().splitlines()
+    counts = [sum(map(len, json.loads(line)["sessions"].values())) for line in lines]
+    assert len(lines) > 2 and sum(counts) == 120
+    merged = telemetry.load_segment_index(logger.events_path)
+    assert merged.to_dict() == telemetry.build_segment_index(logger.events_path).to_dict()
+
+
+def test_restart_after_crash_extends_checkpointed_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(telemetry, "INDEX_CHECKPOINT_BYTES", 1_000)
+    first = make_logger(tmp_path, monkeypatch, event_format="compact")
+    emit(first)
+    first.flush()
+    # No close(): the sidecar is a checkpoint behind the file.
+    assert 0 < telemetry.load_segment_index(first.events_path).size < first.events_path.stat().st_size
+
+    second = make_logger(tmp_path, monkeypatch, event_format="compact")
+    emit(second, count=10)
+    second.close()
+
+    assert session_events(first.run_dir, "s1") == expected(first, "s1")
+    assert len(session_events(first.run_dir, "s1")) == 26
+
+
+def test_restart_resumes_index_of_existing_file(tmp_path, monkeypatch):
+    first = make_logger(tmp_path, monkeypatch)
+    emit(first, count=10)
+    first.close()
+    index_path(first.events_path).unlink()
+
+    second = make_logger(tmp_path, monkeypatch, event_format="compact")
+    emit(second, count=10)
+    second.close()
+
+    assert session_events(first.run_dir, "s1") == expected(first, "s1")
+    assert len(session_events(first.run_dir, "s1")) == 4
+
+
+def test_restart_appends_to_single_object_sidecar(tmp_path, monkeypatch):
+    first = make_logger(tmp_path, monkeypatch)
+    emit(first, count=10)
+    first.close()
+    # A sidecar from before checkpoints were appended: no newline.
+    sidecar = index_path(first.events_path)
+    sidecar.write_text(json.dumps(telemetry.load_segment_index(first.events_path).to_dict()))
+
+    second = make_logger(tmp_path, monkeypatch)
+    emit(second, count=10)
+    second.close()
+
+    index = telemetry.load_segment_index(first.events_path)
+    assert index.size == first.events_path.stat().st_size
+    assert session_events(first.run_dir, "s1") == expected(first, "s1")
+
+
+def numbers(records):
+    return [r["payload"]["n"] for r in records]
+
+
+@pytest.mark.parametrize("event_format", ["jsonl", "compact"])
+@pytest.mark.parametrize("max_segment_bytes", [None, 1_500])
+def test_writers_sharing_a_run_dir(tmp_path, monkeypatch, clock, event_format, max_segment_bytes):
+    monkeypatch.setattr(telemetry, "INDEX_CHECKPOINT_BYTES", 1_000)
+    owner = make_logger(tmp_path, monkeypatch, event_format=event_format, max_segment_bytes=max_segment_bytes)
+    other = make_logger(tmp_path, monkeypatch, event_format=event_format, max_segment_bytes=max_segment_bytes)
+    assert owner._segments.owner and not other._segments.owner
+    for n in range(120):
+        # The other writer starts late, as a second worker would.
+        writer = other if n > 40 and n % 3 == 0 else owner
+        writer.event(f"s{n % 5}", "debug.test", {"n": n})
+    owner.flush()
+
+    want = [n for n in range(120) if n % 5 == 2]
+    assert numbers(session_events(owner.run_dir, "s2")) == want
+    other.close()
+    owner.close()
+    assert numbers(session_events(owner.run_dir, "s2")) == want
+    ts = {r["payload"]["n"]: r["ts"] for r in iter_events(owner.run_dir)}
+    assert numbers(telemetry.events_between(owner.run_dir, ts[50], ts[90])) == list(range(50, 91))
+    # Nothing was compressed under the other writer.
+    assert all(path.suffix == ".jsonl" for _, path in list_segments(owner.run_dir))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_writer_leaves_the_index_to_its_parent(tmp_path, monkeypatch):
+    monkeypatch.setattr(telemetry, "INDEX_CHECKPOINT_BYTES", 1_000)
+    logger = make_logger(tmp_path, monkeypatch, event_format="compact")
+    emit(logger, count=60)
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            for n in range(60, 90):
+                logger.event("s2", "debug.child", {"n": n})
+            status = 0
+        finally:
+            os._exit(status)
+    assert os.waitpid(pid, 0)[1] == 0
+    emit(logger, count=30)
+    logger.close()
+
+    records = session_events(logger.run_dir, "s2")
+    assert sorted(numbers(records)) == sorted([*range(2, 60, 5), *range(60, 90), *range(2, 30, 5)])
+
+
+def test_build_run_index_for_unindexed_logs(tmp_path, monkeypatch):
+    logger = make_logger(tmp_path, monkeypatch, max_segment_bytes=1_500)
+    emit(logger)
+    logger.close()
+    for _, path in list_segments(logger.run_dir):
+        index_path(path).unlink()
+    (logger.run_dir / telemetry.SESSION_MAP_FILE).unlink()
+
+    assert build_run_index(logger.run_dir) == len(list_segments(logger.run_dir))
+    assert build_run_index(logger.run_dir) == 0
+    assert session_events(logger.run_dir, "s4") == expected(logger, "s4")
+
+
+def test_cli_prints_session_jsonl(tmp_path, monkeypatch, capsys):
+    logger = make_logger(tmp_path, monkeypatch, max_segment_bytes=1_500)
+    emit(logger)
+    logger.close()
+
+    assert cli.main(["s1", "--logs", str(tmp_path)]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line) for line in lines] == expected(logger, "s1")
@@ -0,0 +1,142 @@
+import pytest
+
+from app import app, session_store
+from conversation import ConversationState
+from sessions import InMemorySessionStore, SessionStore, SQLiteSessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_in_memory_store_evicts_least_recently_used():
+    store = InMemorySessionStore(max_sessions=2, ttl_seconds=None)
+
+    store.put("a", {"n": 1})
+    store.put("b", {"n": 2})
+    assert store.get("a") == {"n": 1}  # "a" is now most recent
+
+    store.put("c", {"n": 3})
+
+    assert store.get("b") is None
+    assert store.get("a") == {"n": 1}
+    assert store.get("c") == {"n": 3}
+    assert len(store) == 2
+
+
+def test_in_memory_store_expires_idle_sessions():
+    clock = FakeClock()
+    store = InMemorySessionStore(ttl_seconds=10, clock=clock)
+
+    store.put("a", {"n": 1})
+    clock.now = 5
+    assert store.get("a") == {"n": 1}  # touching refreshes the TTL
+
+    clock.now = 14
+    assert store.get("a") == {"n": 1}
+
+    clock.now = 30
+    assert store.get("a") is None
+    assert len(store) == 0
+
+
+def test_sqlite_store_round_trips_conversation_state(tmp_path):
+    store = SQLiteSessionStore(
+        path=tmp_path / "sessions.sqlite3",
+        encode=ConversationState.to_dict,
+        decode=ConversationState.from_dict,
+    )
+
+    state = ConversationState.new(owner_id="owner-1")
+    state.responses[1] = "first answer"
+    state.questions_logged.add(1)
+    state.append_log("user", "first answer", "user_response", 1)
+    store.put("owner-1", state)
+
+    loaded = store.get("owner-1")
+
+    assert loaded == state
+    assert store.get("owner-2") is None
+
+
+def test_sqlite_store_expires_idle_sessions(tmp_path):
+    clock = FakeClock()
+    store = SQLiteSessionStore(
+        path=tmp_path / "sessions.sqlite3",
+        encode=ConversationState.to_dict,
+        decode=ConversationState.from_dict,
+        ttl_seconds=10,
+        clock=clock,
+    )
+
+    store.put("a", ConversationState.new(owner_id="a"))
+    store.put("b", ConversationState.new(owner_id="b"))
+    clock.now = 20
+    store.put("b", ConversationState.new(owner_id="b"))
+
+    assert store.purge_expired() == 1
+    assert store.get("a") is None
+    assert store.get("b") is not None
+
+
+def test_sqlite_store_purges_expired_sessions_while_writing(tmp_path):
+    clock = FakeClock()
+    store = SQLiteSessionStore(
+        path=tmp_path / "sessions.sqlite3",
+        encode=ConversationState.to_dict,
+        decode=ConversationState.from_dict,
+        ttl_seconds=10,
+        clock=clock,
+        purge_every=3,
+    )
+
+    store.put("a", ConversationState.new(owner_id="a"))
+    store.put("b", ConversationState.new(owner_id="b"))
+    clock.now = 20
+    assert len(store) == 2  # expired, but nothing has purged yet
+
+    store.put("c", ConversationState.new(owner_id="c"))  # third write purges
+    assert len(store) == 1
+
+
+def test_session_store_is_abstract():
+    with pytest.raises(TypeError):
+        SessionStore()
+
+    class Partial(SessionStore):
+        def get(self, owner_id):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_conversation_log_does_not_create_sessions():
+    client = app.test_client()
+    before = len(session_store)
+
+    data = client.get("/conversation/log").get_json()
+
+    assert data == {"entries": [], "cursor": 0, "stage": 1}
+    assert len(session_store) == before
+
+
+def test_owners_do_not_share_conversation_state():
+    alice = app.test_client()
+    bob = app.test_client()
+
+    alice.get("/")
+    bob.get("/")
+    alice.post("/", data={"user_input": "Alice answers the first question."})
+
+    alice_page = alice.get("/").data.decode("utf-8")
+    bob_page = bob.get("/").data.decode("utf-8")
+
+    assert "Alice answers the first question." in alice_page
+    assert "Alice answers the first question." not in bob_page
+    assert "How would you actually start working on this?" in alice_page
+    assert "How would you actually start working on this?" not in bob_page
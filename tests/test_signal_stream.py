@@ -0,0 +1,127 @@
+import random
+
+from app import app
+from signals import (
+    SIGNALS,
+    detect_all,
+    detect_exploration_signal,
+    detect_support_signal,
+    detect_systems_signal,
+    signal_stream,
+)
+
+SAMPLES = [
+    "",
+    "I'm not sure, but an EXAMPLE would HELP.",
+    "I'm unsure — maybe I don't know the architecture yet.",
+    "Walk me through the pipeline and its components.",
+    "I'd explore, research and dig into the system flow to understand it.",
+    "Ｈelp with a café-style ﬂow",  # NFKC folds the fullwidth H and the ﬂ ligature
+    "cafe\u0301 then not sure",  # combining accent may arrive in the next piece
+]
+
+
+def feed_in_pieces(text, rng):
+    stream = signal_stream()
+    i = 0
+    while i < len(text):
+        j = i + rng.randint(1, 5)
+        stream.feed(text[i:j])
+        i = j
+    return stream
+
+
+def fired(text):
+    return {
+        signal_id
+        for signal_id, hit in [
+            ("support_seeking", detect_support_signal(text)[0]),
+            ("systems_thinking", detect_systems_signal(text)),
+            ("exploration_first", detect_exploration_signal(text)),
+        ]
+        if hit
+    }
+
+
+def test_stream_matches_detectors_on_final_text():
+    rng = random.Random(0)
+    for text in SAMPLES:
+        for _ in range(20):
+            stream = feed_in_pieces(text, rng)
+            assert stream.matches() == detect_all(text), text
+            assert set(stream.matches()) == fired(text), text
+
+
+def test_stream_matches_detect_all_on_random_text():
+    rng = random.Random(1)
+    keywords = [kw for signal in SIGNALS for kw in signal["keywords"]]
+    alphabet = list("abcdeilnorstuw '") + ["É", "́", "ß"]
+    for _ in range(500):
+        text = "".join(rng.choice(alphabet + keywords) for _ in range(rng.randint(0, 25)))
+        assert feed_in_pieces(text, rng).matches() == detect_all(text), text
+
+
+def test_stream_counts_raw_characters_received():
+    stream = signal_stream()
+    stream.feed("not ")
+    stream.feed("sure")
+    assert stream.length == 8
+    assert stream.matches() == {"support_seeking": ["not sure"]}
+
+
+def post(client, offset, text):
+    return client.post("/signals/stream", json={"offset": offset, "text": text}).get_json()
+
+
+def test_endpoint_consumes_only_appended_text():
+    client = app.test_client()
+
+    assert post(client, 0, "I need a mentor") == {
+        "length": 15,
+        "fired": ["support_seeking"],
+        "signals": {"support_seeking": ["mentor"]},
+    }
+    data = post(client, 15, " and a clear architecture")
+    assert data["length"] == 40
+    assert data["fired"] == ["support_seeking", "systems_thinking"]
+
+
+def test_endpoint_asks_for_resync_on_offset_mismatch():
+    client = app.test_client()
+    post(client, 0, "hello")
+
+    assert post(client, 3, "p me") == {"resync": True}
+
+    data = post(client, 0, "help me")
+    assert data["fired"] == ["support_seeking"]
+
+
+def test_offsets_count_code_points_after_astral_characters():
+    client = app.test_client()
+    text = "Honestly 😅 I'm not sure 🙃 where to start"
+
+    # The client sends each keystroke with the length the server
+    # reported, which counts code points, not UTF-16 units.
+    length = 0
+    for ch in text:
+        data = post(client, length, ch)
+        assert "resync" not in data
+        length = data["length"]
+
+    assert length == len(text)
+    assert data["fired"] == ["support_seeking"]
+    utf16_length = len(text.encode("utf-16-le")) // 2
+    assert post(client, utf16_length, "!") == {"resync": True}
+
+
+def test_offset_zero_starts_a_new_answer():
+    client = app.test_client()
+    post(client, 0, "I want to explore")
+
+    assert post(client, 0, "Nothing here")["fired"] == []
+
+
+def test_endpoint_rejects_malformed_body():
+    client = app.test_client()
+    resp = client.post("/signals/stream", json={"offset": "3", "text": "x"})
+    assert resp.status_code == 400
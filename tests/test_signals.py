@@ -0,0 +1,109 @@
+import random
+
+from text_features import PhraseMatcher, TextFeatures
+from signals import (
+    SIGNALS,
+    SUPPORT_SIGNAL,
+    SYSTEMS_SIGNAL,
+    EXPLORATION_SIGNAL,
+    detect_all,
+    detect_support_signal,
+    detect_systems_signal,
+    detect_exploration_signal,
+)
+
+
+def naive_matches(text):
+    lowered = text.lower()
+    result = {}
+    for signal in SIGNALS:
+        matched = [kw for kw in signal["keywords"] if kw in lowered]
+        if matched:
+            result[signal["id"]] = matched
+    return result
+
+
+SAMPLES = [
+    "",
+    "I'm not sure, but an EXAMPLE would HELP.",
+    "I'm unsure — maybe I don't know the architecture yet.",
+    "Walk me through the pipeline and its components.",
+    "I'd explore, research and dig into the system flow to understand it.",
+    "Nothing relevant here at all.",
+    "workflow subsystem frameworks",
+]
+
+
+def test_detect_all_matches_naive_substring_scan():
+    for text in SAMPLES:
+        assert detect_all(text) == naive_matches(text), text
+
+
+def test_detect_all_matches_naive_scan_on_random_keyword_soup():
+    rng = random.Random(1234)
+    vocabulary = [kw for signal in SIGNALS for kw in signal["keywords"]]
+    vocabulary += ["the", "a", "sure", "not", "now", "syst", "unders", " ", "-"]
+
+    for _ in range(500):
+        words = rng.choices(vocabulary, k=rng.randint(0, 12))
+        text = rng.choice(["", " ", ""]).join(words)
+        if rng.random() < 0.5:
+            text = text.upper()
+        assert detect_all(text) == naive_matches(text), text
+
+
+def test_compatibility_forms_match_like_their_plain_spelling():
+    # NFKC + casefold, where lower() would leave these unmatched.
+    assert detect_all("ＨＥＬＰ") == {"support_seeking": ["help"]}
+    assert detect_all("a ﬂow chart") == {"systems_thinking": ["flow"]}
+    assert detect_all("I'll ﬁgure out the rest") == {"exploration_first": ["figure out"]}
+    assert naive_matches("ＨＥＬＰ") == naive_matches("a ﬂow chart") == {}
+
+
+def test_overlapping_and_prefix_keywords_are_all_reported():
+    matcher = PhraseMatcher({
+        "a": ["help", "helpful", "elp"],
+        "b": ["ful", "help"],
+    })
+
+    assert matcher.match("so helpful") == {
+        "a": ["help", "helpful", "elp"],
+        "b": ["ful", "help"],
+    }
+
+
+def test_per_signal_wrappers_keep_their_results():
+    text = "Not sure how the system should flow; I want to explore."
+
+    fired, info = detect_support_signal(text)
+    assert fired
+    assert info == {"matched_keywords": ["not sure"], "reason": "keyword_match"}
+
+    assert detect_systems_signal(text)
+    assert detect_exploration_signal(text)
+
+    fired, info = detect_support_signal("All good.")
+    assert not fired
+    assert info["checked_keywords"] == SUPPORT_SIGNAL["keywords"]
+
+    assert not detect_systems_signal("All good.")
+    assert not detect_exploration_signal("All good.")
+
+
+def test_wrappers_accept_precomputed_matches():
+    text = "A pipeline I want to research."
+    matches = detect_all(text)
+
+    assert detect_systems_signal(text, matches) == detect_systems_signal(text)
+    assert detect_exploration_signal(text, matches) == detect_exploration_signal(text)
+    assert detect_support_signal(text, matches) == detect_support_signal(text)
+    assert set(matches) == {SYSTEMS_SIGNAL["id"], EXPLORATION_SIGNAL["id"]}
+
+
+def test_detectors_accept_text_features():
+    features = TextFeatures("I'm NOT SURE about the Architecture.")
+
+    assert detect_all(features) == detect_all(features.raw)
+    assert detect_support_signal(features)[0]
+    assert detect_systems_signal(features)
+    assert not detect_exploration_signal(features)
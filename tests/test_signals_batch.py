@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from signals import (  # noqa: E402
+    BATCH_KEYWORDS,
+    SIGNALS,
+    detect_all,
+    detect_batch,
+    detect_exploration_signal,
+    detect_support_signal,
+    detect_systems_signal,
+)
+from text_features import normalize  # noqa: E402
+
+
+def corpus(n, seed=7):
+    rng = random.Random(seed)
+    vocabulary = [kw for signal in SIGNALS for kw in signal["keywords"]]
+    vocabulary += ["the", "Straße", "NOT", "sure", "syst", "em", "\x00", "ﬁgure", "out", " "]
+    return [
+        rng.choice(["", " "]).join(rng.choices(vocabulary, k=rng.randint(0, 10)))
+        for _ in range(n)
+    ]
+
+
+def test_batch_matches_scalar_detection():
+    texts = corpus(2_000) + ["not\x00sure", "\x00help\x00"]
+    result = detect_batch(texts, chunk_size=300)
+
+    assert result.fired.shape == (len(texts), len(SIGNALS))
+    for row, text in enumerate(texts):
+        expected = detect_all(text)
+        assert result.matched_keywords(row) == expected, text
+        assert list(result.fired[row]) == [s["id"] in expected for s in SIGNALS]
+
+        assert result.fired[row, 0] == detect_support_signal(text)[0]
+        assert result.fired[row, 1] == detect_systems_signal(text)
+        assert result.fired[row, 2] == detect_exploration_signal(text)
+
+
+def test_offsets_point_at_keywords_in_normalized_text():
+    texts = ["Not sure — the SYSTEM flow", "", "ok, let's explore"]
+    result = detect_batch(iter(texts))
+
+    for i in range(len(result.match_text)):
+        text = normalize(texts[result.match_text[i]])
+        keyword = BATCH_KEYWORDS[result.match_keyword[i]]
+        assert text[result.match_start[i]:result.match_end[i]] == keyword
+
+    assert sorted(set(result.match_text.tolist())) == [0, 2]
+
+
+def test_accepts_numpy_arrays_and_empty_input():
+    texts = np.array(["help me", "pipeline"], dtype=object)
+
+    assert detect_batch(texts).fired.tolist() == [
+        [True, False, False],
+        [False, True, False],
+    ]
+    assert detect_batch([]).fired.shape == (0, len(SIGNALS))
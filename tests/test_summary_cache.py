@@ -0,0 +1,69 @@
+import app as app_module
+from app import OWNER_COOKIE_NAME, app, session_store
+from conversation import ConversationState
+from tests.helpers import finish_conversation
+
+
+def count_summaries(monkeypatch):
+    calls = []
+    real = app_module.generate_summary
+
+    def counting(responses, conversation_state, **kwargs):
+        calls.append(conversation_state.version)
+        return real(responses, conversation_state, **kwargs)
+
+    monkeypatch.setattr(app_module, "generate_summary", counting)
+    return calls
+
+
+def test_version_bumps_on_log_append_and_touch():
+    state = ConversationState.new()
+    assert state.version == 0
+    state.append_log("user", "hi", "user_response", 1)
+    assert state.version == 1
+    state.touch()
+    assert state.version == 2
+    assert ConversationState.from_dict(state.to_dict()).version == 2
+
+
+def test_summary_refresh_is_a_cache_hit(monkeypatch):
+    calls = count_summaries(monkeypatch)
+    client = app.test_client()
+    finish_conversation(client)
+
+    first = client.get("/").data
+    second = client.get("/").data
+
+    assert b"Conversation Summary" in first
+    assert first == second
+    assert len(calls) == 1
+
+
+def test_feedback_invalidates_cached_summary(monkeypatch):
+    calls = count_summaries(monkeypatch)
+    client = app.test_client()
+    finish_conversation(client)
+    client.get("/")
+
+    client.post("/feedback", data={"feedback": "yes"})
+    client.get("/")
+
+    assert len(calls) == 2
+    assert calls[0] < calls[1]
+
+
+def test_summary_cache_is_per_session(monkeypatch):
+    calls = count_summaries(monkeypatch)
+    client = app.test_client()
+    finish_conversation(client)
+    client.get("/")
+
+    owner_id = client.get_cookie(OWNER_COOKIE_NAME).value
+    first_session = session_store.get(owner_id).session_id
+
+    client.get("/reset")
+    finish_conversation(client)
+    client.get("/")
+
+    assert session_store.get(owner_id).session_id != first_session
+    assert len(calls) == 2
@@ -0,0 +1,160 @@
+import threading
+
+import pytest
+
+import app as app_module
+from app import OWNER_COOKIE_NAME, app, session_store, summary_jobs
+from tests.helpers import finish_conversation
+
+
+def record_proposals(monkeypatch):
+    emitted = []
+    monkeypatch.setattr(
+        app_module,
+        "append_proposal",
+        lambda **kwargs: emitted.append(kwargs["owner_id"]),
+    )
+    return emitted
+
+
+def record_summary_threads(monkeypatch):
+    threads = []
+    real = app_module.generate_summary
+
+    def recording(responses, conversation_state, **kwargs):
+        threads.append(threading.current_thread().name)
+        return real(responses, conversation_state, **kwargs)
+
+    monkeypatch.setattr(app_module, "generate_summary", recording)
+    return threads
+
+
+def test_final_answer_redirects_and_summary_is_built_off_request(monkeypatch):
+    threads = record_summary_threads(monkeypatch)
+    client = app.test_client()
+
+    resp = finish_conversation(client)
+    assert resp.status_code == 303
+
+    page = client.get("/").data
+    assert b"Conversation Summary" in page
+    assert len(threads) == 1
+    assert threads[0].startswith("summary")
+
+    # The job's done-callback may still be running, so check the
+    # stored state rather than summary_jobs.
+    owner_id = client.get_cookie(OWNER_COOKIE_NAME).value
+    assert session_store.get(owner_id).proposals_emitted is True
+
+
+def test_summary_deadline_falls_back_without_double_emission(monkeypatch):
+    emitted = record_proposals(monkeypatch)
+    monkeypatch.setattr(app_module, "SUMMARY_WAIT_SECONDS", 0.05)
+    gate = threading.Event()
+    real = app_module.generate_summary
+
+    def slow_in_worker(responses, conversation_state, **kwargs):
+        if threading.current_thread().name.startswith("summary"):
+            gate.wait(timeout=5)
+        return real(responses, conversation_state, **kwargs)
+
+    monkeypatch.setattr(app_module, "generate_summary", slow_in_worker)
+
+    client = app.test_client()
+    # Enough uncertainty to unlock at least one reflection
+    client.get("/")
+    client.post("/", data={"user_input": "I'm not sure, I need help."})
+    client.post("/", data={"user_input": "An example would help."})
+    client.post("/", data={"user_input": "Still unsure."})
+    client.post("/", data={"user_input": "I'd explore it."})
+    owner_id = client.get_cookie(OWNER_COOKIE_NAME).value
+    while session_store.get(owner_id).stage in app_module.QUESTIONS:
+        client.post("/", data={"user_input": "Moving on."})
+    job = summary_jobs[owner_id]
+
+    page = client.get("/").data
+    assert b"Conversation Summary" in page
+    assert emitted == []  # the running job owns emission
+
+    gate.set()
+    job.result(timeout=5)
+    assert emitted and set(emitted) == {owner_id}
+    count = len(emitted)
+
+    client.get("/")
+    assert len(emitted) == count
+
+
+def test_saturated_pool_builds_summary_inline(monkeypatch):
+    emitted = record_proposals(monkeypatch)
+    full = threading.BoundedSemaphore(1)
+    full.acquire()
+    monkeypatch.setattr(app_module, "_summary_slots", full)
+
+    client = app.test_client()
+    client.get("/")
+    client.post("/", data={"user_input": "I'm not sure."})
+    owner_id = client.get_cookie(OWNER_COOKIE_NAME).value
+    while session_store.get(owner_id).stage in app_module.QUESTIONS:
+        client.post("/", data={"user_input": "I'm still not sure."})
+    assert owner_id not in summary_jobs
+
+    assert b"Conversation Summary" in client.get("/").data
+    assert session_store.get(owner_id).proposals_emitted is True
+    assert emitted == [owner_id]
+    client.get("/")
+    assert emitted == [owner_id]
+
+
+class Unregistered(dict):
+    """
+    summary_jobs as a GET sees it before the POST registers its job.
+    """
+
+    def __setitem__(self, key, value):
+        pass
+
+
+@pytest.mark.parametrize("job_first", [False, True])
+def test_get_racing_job_registration_emits_once(monkeypatch, job_first):
+    emitted = []
+    monkeypatch.setattr(
+        app_module,
+        "append_proposal",
+        lambda **kwargs: emitted.append((kwargs["owner_id"], kwargs["proposed_text"])),
+    )
+    monkeypatch.setattr(app_module, "summary_jobs", Unregistered())
+    started, gate = threading.Event(), threading.Event()
+    jobs = []
+    real_submit = app_module.summary_pool.submit
+
+    def gated_submit(fn, snapshot):
+        def run():
+            started.set()
+            gate.wait(timeout=5)
+            return fn(snapshot)
+        jobs.append(real_submit(run))
+        return jobs[-1]
+
+    monkeypatch.setattr(app_module.summary_pool, "submit", gated_submit)
+
+    client = app.test_client()
+    client.get("/")
+    client.post("/", data={"user_input": "I'm not sure, I need help."})
+    owner_id = client.get_cookie(OWNER_COOKIE_NAME).value
+    while session_store.get(owner_id).stage in app_module.QUESTIONS:
+        client.post("/", data={"user_input": "I'm still not sure, an example would help."})
+    assert started.wait(timeout=5)
+
+    if job_first:
+        gate.set()
+        jobs[0].result(timeout=5)
+        assert b"Conversation Summary" in client.get("/").data
+    else:
+        assert b"Conversation Summary" in client.get("/").data
+        gate.set()
+        jobs[0].result(timeout=5)
+
+    assert emitted
+    assert {owner for owner, _ in emitted} == {owner_id}
+    assert len(emitted) == len(set(emitted))
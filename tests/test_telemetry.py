@@ -0,0 +1,268 @@
+import gzip
+import json
+import threading
+
+import pytest
+
+from telemetry import EventLogger, compress_segment, iter_events, iter_segment, list_segments, load_segment_index
+from tests.helpers import make_logger
+
+
+def read_events(logger):
+    return [json.loads(line) for line in logger.events_path.read_text().splitlines()]
+
+
+def test_sync_mode_writes_each_event_immediately(tmp_path, monkeypatch):
+    logger = make_logger(tmp_path, monkeypatch)
+    logger.event("s1", "conversation.message", {"n": 1})
+
+    [record] = read_events(logger)
+    assert record["run_id"] == "run-test"
+    assert record["session_id"] == "s1"
+    assert record["type"] == "conversation.message"
+    assert record["payload"] == {"n": 1}
+    assert logger.stats()["written"] == 1
+
+
+def test_async_mode_batches_and_drains_on_close(tmp_path, monkeypatch):
+    logger = make_logger(tmp_path, monkeypatch, async_mode=True, flush_records=50, flush_interval=10)
+
+    def emit(t):
+        for i in range(200):
+            logger.event(f"s{t}", "debug.test", {"i": i})
+
+    threads = [threading.Thread(target=emit, args=(t,)) for t in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    logger.close()
+
+    records = read_events(logger)
+    assert len(records) == 800
+    for t in range(4):
+        assert [r["payload"]["i"] for r in records if r["session_id"] == f"s{t}"] == list(range(200))
+    stats = logger.stats()
+    assert stats["written"] == 800 and stats["dropped"] == 0
+    assert stats["batches"] < 800
+
+
+def test_async_mode_flushes_on_interval(tmp_path, monkeypatch):
+    logger = make_logger(tmp_path, monkeypatch, async_mode=True, flush_records=1000, flush_interval=0.05)
+    logger.event("s1", "debug.test")
+
+    assert logger.flush(timeout=5)
+    assert len(read_events(logger)) == 1
+    logger.close()
+
+
+def test_full_queue_drops_and_counts(tmp_path, monkeypatch):
+    logger = make_logger(tmp_path, monkeypatch, async_mode=True, queue_size=5, flush_interval=10)
+    gate = threading.Event()
+    real_get = logger._queue.get
+
+    # Hold the writer so the queue can fill up.
+    def blocked_get(*args, **kwargs):
+        gate.wait(5)
+        return real_get(*args, **kwargs)
+
+    logger._queue.get = blocked_get
+    for i in range(20):
+        logger.event("s1", "debug.test", {"i": i})
+    gate.set()
+    logger.close()
+
+    stats = logger.stats()
+    assert stats["dropped"] > 0
+    assert stats["written"] + stats["dropped"] == 20
+    assert len(read_events(logger)) == stats["written"]
+
+
+def test_events_after_close_are_written_synchronously(tmp_path, monkeypatch):
+    logger = make_logger(tmp_path, monkeypatch, async_mode=True)
+    logger.close()
+    logger.close()
+    logger.event("s1", "debug.after_close")
+
+    assert [r["type"] for r in read_events(logger)] == ["debug.after_close"]
+
+
+def test_disabled_logger_writes_nothing(tmp_path, monkeypatch):
+    logger = EventLogger(enabled=False, base_dir=tmp_path, async_mode=True)
+    logger.event("s1", "debug.test")
+    logger.close()
+    assert not (tmp_path / "runs").exists()
+
+
+def test_rollover_writes_numbered_gzipped_segments(tmp_path, monkeypatch):
+    logger = make_logger(tmp_path, monkeypatch, max_segment_bytes=2_000)
+    for i in range(100):
+        logger.event(f"s{i % 7}", "debug.test", {"i": i})
+    logger.close()
+
+    segments = list_segments(logger.run_dir)
+    assert len(segments) > 3
+    assert [n for n, _ in segments] == list(range(1, len(segments) + 1))
+    # every closed segment is compressed; the last one stays open/plain
+    assert all(p.name.endswith(".jsonl.gz") for _, p in segments[:-1])
+    assert segments[-1][1].name.endswith(".jsonl")
+    assert logger.stats()["segments_closed"] == len(segments) - 1
+
+    records = list(iter_events(logger.run_dir))
+    assert [r["payload"]["i"] for r in records] == list(range(100))
+    assert [r["ts"] for r in records] == sorted(r["ts"] for r in records)
+
+
+def test_finished_compressions_are_not_kept(tmp_path, monkeypatch):
+    logger = make_logger(tmp_path, monkeypatch, max_segment_bytes=500)
+    for i in range(100):
+        logger.event("s1", "debug.test", {"i": i})
+        for job in logger._compressions:
+            job.result()
+        assert len(logger._compressions) <= 1
+    assert logger.stats()["segments_closed"] > 5
+    logger.close()
+
+
+def test_async_rollover_keeps_every_record(tmp_path, monkeypatch):
+    logger = make_logger(
+        tmp_path, monkeypatch, async_mode=True, flush_records=10, max_segment_bytes=3_000
+    )
+    for i in range(300):
+        logger.event("s1", "debug.test", {"i": i})
+    logger.close()
+
+    assert [r["payload"]["i"] for r in iter_events(logger.run_dir)] == list(range(300))
+
+
+@pytest.mark.parametrize("event_format", ["jsonl", "compact"])
+def test_one_large_batch_is_split_across_segments(tmp_path, monkeypatch, event_format):
+    logger = make_logger(
+        tmp_path, monkeypatch, async_mode=True, flush_records=1_000, flush_interval=60,
+        max_segment_bytes=2_000, event_format=event_format,
+    )
+    for i in range(300):
+        logger.event(f"s{i % 7}", "debug.test", {"i": i})
+    logger.close()
+
+    assert logger.stats()["batches"] == 1
+    segments = list_segments(logger.run_dir)
+    assert len(segments) > 3
+    assert all(load_segment_index(path).size <= 2_000 for _, path in segments)
+    assert [r["payload"]["i"] for r in iter_events(logger.run_dir)] == list(range(300))
+
+
+def test_gzip_blocks_can_be_read_independently(tmp_path):
+    path = tmp_path / "events.000001.jsonl"
+    lines = [json.dumps({"ts": i, "payload": "x" * (i % 50)}) + "\n" for i in range(2_000)]
+    path.write_text("".join(lines))
+    raw = path.read_bytes()
+
+    gz_path = compress_segment(path, block_bytes=4_096)
+
+    assert not path.exists()
+    assert gzip.decompress(gz_path.read_bytes()) == raw
+    block_map = json.loads(gz_path.with_name(gz_path.name + ".blocks").read_text())
+    assert block_map["raw_size"] == len(raw)
+    data = gz_path.read_bytes()
+    for (raw_start, gz_start), nxt in zip(block_map["blocks"], block_map["blocks"][1:] + [None]):
+        gz_end = nxt[1] if nxt else len(data)
+        block = gzip.decompress(data[gz_start:gz_end])
+        assert raw[raw_start:raw_start + len(block)] == block
+        assert block.endswith(b"\n")
+
+
+def test_reader_merges_plain_file_with_segments(tmp_path, monkeypatch):
+    plain = make_logger(tmp_path, monkeypatch)
+    plain.event("a", "debug.test", {"n": 1})
+    plain.close()
+    segmented = make_logger(tmp_path, monkeypatch, max_segment_bytes=500)
+    for n in range(2, 10):
+        segmented.event("b", "debug.test", {"n": n})
+    segmented.close()
+
+    assert [r["payload"]["n"] for r in iter_events(plain.run_dir)] == list(range(1, 10))
+
+
+def test_restart_continues_segment_numbering(tmp_path, monkeypatch):
+    first = make_logger(tmp_path, monkeypatch, max_segment_bytes=500)
+    for n in range(10):
+        first.event("a", "debug.test", {"n": n})
+    first.close()
+    last_before = list_segments(first.run_dir)[-1][0]
+
+    second = make_logger(tmp_path, monkeypatch, max_segment_bytes=500)
+    second.event("a", "debug.test", {"n": 10})
+    second.close()
+
+    assert list_segments(first.run_dir)[-1][0] >= last_before
+    assert [r["payload"]["n"] for r in iter_events(first.run_dir)] == list(range(11))
+
+
+def emit_sample(logger):
+    for n in range(30):
+        logger.event(f"s{n % 3}", ("conversation.message", "debug.signal")[n % 2], {"n": n, "text": "café"})
+    logger.close()
+
+
+def test_compact_format_decodes_to_plain_records(tmp_path, monkeypatch):
+    plain = make_logger(tmp_path / "plain", monkeypatch)
+    compact = make_logger(tmp_path / "compact", monkeypatch, event_format="compact")
+    emit_sample(plain)
+    emit_sample(compact)
+
+    expected = read_events(plain)
+    decoded = list(iter_events(compact.run_dir))
+    for record in expected + decoded:
+        record.pop("ts")
+    assert decoded == expected
+    assert [list(r) for r in decoded] == [list(r) for r in expected]
+    assert compact.events_path.stat().st_size < plain.events_path.stat().st_size
+
+
+def test_plain_format_matches_json_dumps(tmp_path, monkeypatch):
+    logger = make_logger(tmp_path, monkeypatch)
+    logger.event("s1", "debug.test", {"text": "ünïcode", "n": [1, 2]})
+    line = logger.events_path.read_text(encoding="utf-8").splitlines()[0]
+    assert line == json.dumps(json.loads(line), ensure_ascii=False)
+
+
+def test_compact_segments_decode_independently(tmp_path, monkeypatch):
+    logger = make_logger(tmp_path, monkeypatch, event_format="compact", max_segment_bytes=400)
+    emit_sample(logger)
+
+    segments = list_segments(logger.run_dir)
+    assert len(segments) > 2
+    for _, path in segments:
+        raw = path.read_bytes()
+        if path.suffix == ".gz":
+            raw = gzip.decompress(raw)
+        first = json.loads(raw.splitlines()[0])
+        assert first["format"] == "compact-v1"
+        assert all(r["run_id"] == "run-test" for r in iter_segment(path))
+    assert [r["payload"]["n"] for r in iter_events(logger.run_dir)] == list(range(30))
+
+
+def test_async_compact_drops_do_not_break_dictionary(tmp_path, monkeypatch):
+    logger = make_logger(tmp_path, monkeypatch, event_format="compact", async_mode=True, queue_size=5)
+    for n in range(200):
+        logger.event(f"s{n}", "debug.test", {"n": n})
+    logger.close()
+
+    records = list(iter_events(logger.run_dir))
+    assert len(records) == logger.stats()["written"]
+    assert all(r["session_id"] == f"s{r['payload']['n']}" for r in records)
+
+
+def test_format_switch_on_restart_reads_both(tmp_path, monkeypatch):
+    first = make_logger(tmp_path, monkeypatch)
+    first.event("a", "debug.test", {"n": 0})
+    first.close()
+    second = make_logger(tmp_path, monkeypatch, event_format="compact")
+    second.event("a", "debug.test", {"n": 1})
+    second.close()
+    third = make_logger(tmp_path, monkeypatch)
+    third.event("a", "debug.test", {"n": 2})
+    third.close()
+
+    assert [r["payload"]["n"] for r in iter_events(first.run_dir)] == [0, 1, 2]
@@ -0,0 +1,45 @@
+import text_features
+from phase5.intents import Intent
+from signals import SUPPORT_SIGNAL
+from text_features import TextFeatures, register_phrases, normalize
+
+
+def test_normalization_casefolds_and_applies_nfkc():
+    assert normalize("Straße ＡＮＡＬＹＺＥ") == "strasse analyze"
+
+
+def test_tokens_are_computed_from_normalized_text():
+    features = TextFeatures("I don't KNOW where to start.")
+
+    assert features.tokens == ["i", "don't", "know", "where", "to", "start"]
+
+
+def test_all_registered_groups_come_from_one_scan(monkeypatch):
+    scans = []
+    original = text_features.PhraseMatcher.match
+
+    def counting_match(self, normalized):
+        scans.append(normalized)
+        return original(self, normalized)
+
+    monkeypatch.setattr(text_features.PhraseMatcher, "match", counting_match)
+
+    features = TextFeatures("Can you analyze the system? I'm not sure.")
+    features.intents
+    features.matched("support_seeking")
+    features.matched("systems_thinking")
+
+    assert len(scans) == 1
+    assert Intent.PHASE5_REQUEST in features.intents
+    assert features.matched(SUPPORT_SIGNAL["id"]) == ["not sure"]
+
+
+def test_registering_a_group_extends_the_shared_matcher(monkeypatch):
+    # A private copy of the registry, restored (with the matcher
+    # built from it) when the test ends.
+    monkeypatch.setattr(text_features, "_GROUPS", dict(text_features._GROUPS))
+    monkeypatch.setattr(text_features, "_matcher", None)
+    register_phrases("test_only_group", ["Zebra Crossing"])
+
+    assert TextFeatures("a zebra crossing").matched("test_only_group") == ["zebra crossing"]
+    assert TextFeatures("a zebra crossing").matched(SUPPORT_SIGNAL["id"]) == []
@@ -0,0 +1,93 @@
+import json
+import random
+
+import app as app_module
+from timing import LatencyHistogram, Timings, bucket_bounds, bucket_index
+
+
+def test_bucket_bounds_contain_their_values():
+    for value in [0, 1, 127, 128, 129, 255, 256, 1000, 12345, 10**6, 10**9]:
+        low, high = bucket_bounds(bucket_index(value))
+        assert low <= value <= high
+        assert (high - low) <= max(1, value) * 0.016
+
+
+def test_percentiles_are_within_bucket_error():
+    rng = random.Random(7)
+    values = sorted(int(rng.lognormvariate(8, 1.5)) for _ in range(20000))
+    hist = LatencyHistogram()
+    for value in values:
+        hist.record(value)
+
+    for p in (50, 90, 99, 99.9):
+        exact = values[int(-(-len(values) * p // 100)) - 1]
+        assert abs(hist.percentile(p) - exact) <= exact * 0.016 + 1
+    assert hist.percentile(100) == hist.max == values[-1]
+
+
+def test_merge_matches_single_histogram():
+    whole, left, right = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for value in range(0, 50000, 37):
+        whole.record(value)
+        (left if value % 2 else right).record(value)
+    left.merge(right)
+    assert left.to_dict() == whole.to_dict()
+
+
+def test_spans_record_under_current_route():
+    timings = Timings()
+    with timings.route("GET /"):
+        with timings.span("render"):
+            pass
+    with timings.span("render"):
+        pass
+
+    snap = timings.snapshot()
+    assert set(snap["routes"]) == {"GET /", "-"}
+    assert snap["routes"]["GET /"]["render"]["count"] == 1
+    assert snap["stages"]["render"]["count"] == 2
+
+
+def test_flusher_writes_snapshot_on_stop(tmp_path):
+    timings = Timings()
+    timings.record("GET /", "request", 1500)
+    path = tmp_path / "latency.json"
+
+    timings.start_flusher(path, interval=3600)
+    timings.stop_flusher()
+
+    data = json.loads(path.read_text())
+    assert data["routes"]["GET /"]["request"]["p50_us"] == 1500
+    assert "flushed_at" in data
+
+
+def test_request_path_stages_are_timed(monkeypatch):
+    monkeypatch.setattr(app_module, "timings", Timings())
+    client = app_module.app.test_client()
+    client.get("/")
+    client.post("/", data={"user_input": "I'm not sure where to start, maybe with an example."})
+
+    snap = client.get("/debug/latency").get_json()
+
+    counts = {stage: hist["count"] for stage, hist in snap["routes"]["POST /"].items()}
+    assert counts == {
+        "request": 1,
+        "signals.features": 1,
+        "signals.detect": 1,
+        # The boundary check, then the question paraphrase.
+        "llm_boundary": 2,
+        # The answer and the follow-up question.
+        "append_to_log": 2,
+        # Those two messages, plus USER INPUT, SUPPORT SIGNAL FIRED
+        # and STATE SUMMARY debug events.
+        "logger.event": 5,
+        "render": 1,
+    }
+    post = snap["routes"]["POST /"]
+    assert post["request"]["max_us"] >= post["signals.detect"]["max_us"]
+
+
+def test_latency_endpoint_is_local_only():
+    client = app_module.app.test_client()
+    resp = client.get("/debug/latency", environ_base={"REMOTE_ADDR": "10.0.0.5"})
+    assert resp.status_code == 404
@@ -0,0 +1,504 @@
+# text_features.py
+# ============================================================
+# Shared Per-Input Text Features
+# ------------------------------------------------------------
+# Purpose:
+# Normalize and scan each piece of user text ONCE, then let
+# every detector read the result.
+#
+# This module contains:
+#   - normalize(): the one text normalization (NFKC + casefold)
+#   - PhraseMatcher: single-pass multi-phrase matcher
+#   - a phrase-group registry that detectors add their lists to
+#   - intent groups (register_intent), exposed as TextFeatures.intents
+#   - TextFeatures: normalized text, tokens and match results
+#   - FuzzyPhraseIndex: opt-in typo-tolerant phrase matching
+#   - PhraseAutomaton / PhraseStream: incremental matching of
+#     text that arrives in pieces (live typing)
+#
+# Detectors register named phrase groups at import time. All
+# groups are compiled into one matcher, so a TextFeatures scan
+# costs the same no matter how many detectors are registered.
+#
+# This module NEVER:
+#   - decides what a match means
+#   - mutates conversation state
+# ============================================================
+
+from __future__ import annotations
+
+import re
+import threading
+import unicodedata
+from functools import lru_cache
+from collections import deque
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
+
+_TOKEN_RE = re.compile(r"\w+(?:['’]\w+)*")
+
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def _trie_pattern(phrases: Iterable[str]) -> str:
+    """
+    Build one regex alternation with shared prefixes factored out
+    ("ex(?:ample|p(?:eriment|lore))"), so the regex engine tests
+    each position against a trie instead of every phrase in turn.
+    Greedy optionals make the longest phrase at a position win.
+    """
+    trie: Dict[str, dict] = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            body = "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+def _phrase_owners(
+    groups: Dict[str, Iterable[str]],
+    keep: Callable[[str], object] = bool,
+) -> Dict[str, List[tuple]]:
+    """
+    phrase -> [(group_id, position in that group's list)] for
+    every phrase `keep` accepts. Shared by the matchers below.
+    """
+    owners: Dict[str, List[tuple]] = {}
+    for group_id, phrases in groups.items():
+        for index, phrase in enumerate(phrases):
+            if keep(phrase):
+                owners.setdefault(phrase, []).append((group_id, index))
+    return owners
+
+
+def _group_hits(owners: Dict[str, List[tuple]], found: Iterable[str]) -> Dict[str, List[str]]:
+    """
+    Map each group owning a found phrase to its found phrases,
+    in the group's own phrase order.
+    """
+    hits: Dict[str, List[tuple]] = {}
+    for phrase in found:
+        for group_id, index in owners[phrase]:
+            hits.setdefault(group_id, []).append((index, phrase))
+    return {
+        group_id: [p for _, p in sorted(pairs)]
+        for group_id, pairs in hits.items()
+    }
+
+
+class PhraseMatcher:
+    """
+    Single-pass matcher over named phrase groups.
+
+    All phrases are compiled into ONE trie-shaped regex. Scanning
+    resumes one character after each match start, so overlapping
+    phrases (e.g. "unsure" / "not sure") are all found; shorter
+    phrases sharing a start with a longer match come from `prefixes`.
+    Matching semantics are identical to `phrase in normalized_text`.
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        self.owners = _phrase_owners(groups)
+
+        phrases = sorted(self.owners)
+        self.pattern = re.compile(_trie_pattern(phrases)) if phrases else None
+        self.prefixes = {
+            p: [other for other in phrases if p.startswith(other)]
+            for p in phrases
+        }
+
+    def scan(self, normalized: str) -> Set[str]:
+        """
+        Return every phrase occurring in already-normalized text.
+        """
+        found: Set[str] = set()
+        if self.pattern is None:
+            return found
+        search = self.pattern.search
+        m = search(normalized)
+        while m is not None:
+            found.update(self.prefixes[m.group()])
+            m = search(normalized, m.start() + 1)
+        return found
+
+    def match(self, normalized: str) -> Dict[str, List[str]]:
+        """
+        Map each group with at least one hit to its matched phrases,
+        in the group's own phrase order.
+        """
+        return _group_hits(self.owners, self.scan(normalized))
+
+
+# ----------------------------
+# Phrase-group registry
+# ----------------------------
+
+_GROUPS: Dict[str, List[str]] = {}
+_matcher: Optional[PhraseMatcher] = None
+_registry_lock = threading.Lock()
+
+
+def register_phrases(group_id: str, phrases: Iterable[str]) -> None:
+    """
+    Add (or replace) a named phrase group in the shared matcher.
+    Phrases are normalized the same way as input text.
+    """
+    global _matcher
+    with _registry_lock:
+        _GROUPS[group_id] = [normalize(p) for p in phrases]
+        _matcher = None
+
+
+INTENT_PREFIX = "intent:"
+
+
+def register_intent(intent: str, triggers: Iterable[str]) -> None:
+    """
+    Register trigger phrases for a named intent.
+    """
+    register_phrases(INTENT_PREFIX + intent, triggers)
+
+
+def shared_matcher() -> PhraseMatcher:
+    global _matcher
+    matcher = _matcher
+    if matcher is None:
+        with _registry_lock:
+            if _matcher is None:
+                _matcher = PhraseMatcher(_GROUPS)
+            matcher = _matcher
+    return matcher
+
+
+class TextFeatures:
+    """
+    Everything detectors need from one piece of text,
+    computed at most once.
+    """
+
+    __slots__ = ("raw", "normalized", "_tokens", "_matches", "_intents")
+
+    def __init__(self, raw: str) -> None:
+        self.raw = raw
+        self.normalized = normalize(raw)
+        self._tokens: Optional[List[str]] = None
+        self._matches: Optional[Dict[str, List[str]]] = None
+        self._intents: Optional[FrozenSet[str]] = None
+
+    @classmethod
+    def of(cls, text: Union[str, "TextFeatures"]) -> "TextFeatures":
+        """
+        Accept either raw text or existing features.
+        """
+        if isinstance(text, TextFeatures):
+            return text
+        return cls(text or "")
+
+    @property
+    def tokens(self) -> List[str]:
+        if self._tokens is None:
+            self._tokens = _TOKEN_RE.findall(self.normalized)
+        return self._tokens
+
+    @property
+    def matches(self) -> Dict[str, List[str]]:
+        """
+        group_id -> matched phrases, for every registered group.
+        """
+        if self._matches is None:
+            self._matches = shared_matcher().match(self.normalized)
+        return self._matches
+
+    def matched(self, group_id: str) -> List[str]:
+        return self.matches.get(group_id, [])
+
+    @property
+    def intents(self) -> FrozenSet[str]:
+        """
+        Every registered intent whose triggers matched.
+        """
+        if self._intents is None:
+            self._intents = frozenset(
+                group_id[len(INTENT_PREFIX):]
+                for group_id in self.matches
+                if group_id.startswith(INTENT_PREFIX)
+            )
+        return self._intents
+
+    def __repr__(self) -> str:
+        return f"TextFeatures({self.raw!r})"
+
+
+# ----------------------------
+# Fuzzy (typo-tolerant) matching
+# ----------------------------
+# Opt-in. Phrases are matched token by token, so "unsrue" or
+# "architecure" still count. Candidates come from a symmetric-
+# delete index: every keyword token is stored under all of its
+# variants with up to `max_distance` characters deleted, and a
+# text token looks up its own delete variants. Each lookup is a
+# dict hit, so cost depends on token length and max_distance,
+# never on how many phrases are registered. Candidates are then
+# confirmed with optimal-string-alignment distance (edits plus
+# adjacent transpositions).
+
+
+def osa_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance, or limit + 1 once it is
+    certain to exceed `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def _delete_variants(token: str, max_distance: int) -> Set[str]:
+    variants = {token}
+    frontier = {token}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+
+class FuzzyPhraseIndex:
+    """
+    Typo-tolerant matcher over named phrase groups.
+
+    - max_distance: edits allowed per token
+    - min_token_length: shorter phrase tokens must match exactly
+      (keeps "help" from matching "held")
+    - exact_words: correctly spelled words within reach of a
+      phrase token ("lean" of "learn"); as text tokens they only
+      match exactly
+    """
+
+    def __init__(
+        self,
+        groups: Dict[str, Iterable[str]],
+        max_distance: int = 1,
+        min_token_length: int = 5,
+        cache_size: int = 65_536,
+        exact_words: Iterable[str] = (),
+    ) -> None:
+        self.max_distance = max_distance
+        self.min_token_length = min_token_length
+        self.exact_words: FrozenSet[str] = frozenset(normalize(word) for word in exact_words)
+
+        def tokenize(phrase: str) -> Tuple[str, ...]:
+            return tuple(_TOKEN_RE.findall(normalize(phrase)))
+
+        self.owners = _phrase_owners(groups, keep=tokenize)
+        self.phrase_tokens: Dict[str, Tuple[str, ...]] = {p: tokenize(p) for p in self.owners}
+
+        # first token -> phrases starting with it
+        self._by_first: Dict[str, List[str]] = {}
+        self._vocabulary: Set[str] = set()
+        for phrase, tokens in self.phrase_tokens.items():
+            self._by_first.setdefault(tokens[0], []).append(phrase)
+            self._vocabulary.update(tokens)
+
+        self._deletes: Dict[str, Set[str]] = {}
+        # text-token lengths that could be within reach of a fuzzy token
+        self._lengths: Set[int] = set()
+        for token in self._vocabulary:
+            if len(token) >= min_token_length:
+                for variant in _delete_variants(token, max_distance):
+                    self._deletes.setdefault(variant, set()).add(token)
+                self._lengths.update(
+                    range(len(token) - max_distance, len(token) + max_distance + 1)
+                )
+
+        self.candidates = lru_cache(maxsize=cache_size)(self._candidates)
+
+    def _candidates(self, token: str) -> FrozenSet[str]:
+        """
+        Phrase tokens within max_distance of `token` (including an
+        exact hit). Empty for tokens unrelated to any phrase.
+        """
+        found = set()
+        if token in self._vocabulary:
+            found.add(token)
+        if len(token) not in self._lengths or token in self.exact_words:
+            return frozenset(found)
+        deletes = self._deletes
+        for variant in _delete_variants(token, self.max_distance):
+            for keyword_token in deletes.get(variant, ()):
+                if keyword_token not in found and (
+                    osa_distance(token, keyword_token, self.max_distance) <= self.max_distance
+                ):
+                    found.add(keyword_token)
+        return frozenset(found)
+
+    def match(self, tokens: List[str]) -> Dict[str, List[str]]:
+        """
+        Map each group with a fuzzy hit to its matched phrases,
+        in the group's own phrase order. A phrase matches when
+        consecutive text tokens each match its tokens.
+        """
+        candidates = self.candidates
+        per_position = [candidates(token) for token in tokens]
+
+        seen: Set[str] = set()
+        for i, found in enumerate(per_position):
+            for keyword_token in found:
+                for phrase in self._by_first.get(keyword_token, ()):
+                    if phrase in seen:
+                        continue
+                    rest = self.phrase_tokens[phrase][1:]
+                    if i + len(rest) >= len(tokens):
+                        continue
+                    if all(t in per_position[i + k + 1] for k, t in enumerate(rest)):
+                        seen.add(phrase)
+        return _group_hits(self.owners, seen)
+
+
+# ----------------------------
+# Incremental (streaming) matching
+# ----------------------------
+# For text that grows a few characters at a time. An Aho-Corasick
+# automaton over the normalized phrases carries its state between
+# pieces, so each character is looked at once no matter how long
+# the text gets. The result is the same as PhraseMatcher.match()
+# on the full text.
+
+
+class PhraseAutomaton:
+    """
+    Aho-Corasick automaton over named phrase groups.
+    Immutable once built; share one across streams.
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        self.owners = _phrase_owners(groups)
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[FrozenSet[str]] = [frozenset()]
+        outputs: List[Set[str]] = [set()]
+        for phrase in self.owners:
+            node = 0
+            for ch in phrase:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    outputs.append(set())
+                node = nxt
+            outputs[node].add(phrase)
+
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                outputs[child] |= outputs[self._fail[child]]
+                queue.append(child)
+        self._out = [frozenset(o) for o in outputs]
+
+    def step(self, node: int, text: str, found: Set[str]) -> int:
+        """
+        Advance from `node` over already-normalized text, adding
+        every phrase that ends inside it to `found`.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return node
+
+    def stream(self) -> "PhraseStream":
+        return PhraseStream(self)
+
+    def group_matches(self, found: Iterable[str]) -> Dict[str, List[str]]:
+        return _group_hits(self.owners, found)
+
+
+# Raw characters held back before normalizing, in case the next
+# piece starts with a combining mark that NFKC would fold into them.
+_MAX_PENDING = 32
+
+
+class PhraseStream:
+    """
+    Matching state for one growing piece of text.
+
+    feed() takes only the newly appended raw characters. The
+    last characters are held back until it is safe to normalize
+    them (an ASCII character, or _MAX_PENDING characters later).
+    """
+
+    __slots__ = ("automaton", "length", "_node", "_found", "_pending")
+
+    def __init__(self, automaton: PhraseAutomaton) -> None:
+        self.automaton = automaton
+        self.length = 0   # raw characters received
+        self._node = 0
+        self._found: Set[str] = set()
+        self._pending = ""
+
+    def feed(self, chunk: str) -> None:
+        if not chunk:
+            return
+        self.length += len(chunk)
+        pending = self._pending + chunk
+
+        # Normalize up to the last ASCII character; it can only be
+        # changed by what follows if a combining mark comes next.
+        cut = len(pending) - 1
+        while cut > 0 and ord(pending[cut]) >= 128:
+            cut -= 1
+        if cut <= 0 and len(pending) > _MAX_PENDING:
+            cut = len(pending) - 1
+        if cut > 0:
+            self._node = self.automaton.step(self._node, normalize(pending[:cut]), self._found)
+            pending = pending[cut:]
+        self._pending = pending
+
+    def found(self) -> Set[str]:
+        """
+        Phrases in everything fed so far (pending text included).
+        """
+        if not self._pending:
+            return set(self._found)
+        found = set(self._found)
+        self.automaton.step(self._node, normalize(self._pending), found)
+        return found
+
+    def matches(self) -> Dict[str, List[str]]:
+        """
+        Same shape as PhraseMatcher.match() over the full text.
+        """
+        return self.automaton.group_matches(self.found())
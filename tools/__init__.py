@@ -0,0 +1,7 @@
+"""
+Offline tools
+
+Command-line utilities that read the local logs written by
+telemetry.EventLogger (logs/runs/<run_id>/...). They never touch
+live sessions or the running app.
+"""
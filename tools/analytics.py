@@ -0,0 +1,281 @@
+# tools/analytics.py
+# ============================================================
+# Streaming Telemetry Analytics
+# ------------------------------------------------------------
+# Purpose:
+# Aggregate rates over logged runs without loading them:
+#   - support signal firing rate (per evaluated answer)
+#   - follow-up escalation frequency
+#   - feedback interpretation distribution
+#   - consent offer rates
+#   - per event type: count and first/last timestamp
+#
+# - Each run directory is one task for a process pool
+# - Within a run, events (telemetry.events_between) and session
+#   snapshots are streamed through generators into incremental,
+#   mergeable counters; nothing per session or per record is kept
+# - Worker results are merged as they arrive, a few in flight
+#   per worker, so memory stays flat however large the logs are
+# - --start/--end restrict events and snapshots to a time window
+#   (e.g. one day)
+#
+# Run from the repo root:
+#   python -m tools.analytics
+#   python -m tools.analytics --start 2026-10-18 --end 2026-10-19 --output day.json
+#
+# This module NEVER modifies logs.
+# ============================================================
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from telemetry import events_between
+from tools.event_window import parse_ts
+from tools.pool import bounded_map
+from tools.session_events import DEFAULT_LOGS, iter_run_dirs
+
+
+
+# ----------------------------
+# Aggregates
+# ----------------------------
+
+class Aggregates:
+    """
+    Counters that merge by addition. Every key space is bounded
+    by the app's code (event types, content types, signal names,
+    feedback interpretations), never by the data volume.
+    """
+
+    def __init__(self) -> None:
+        # event type -> [count, first_ts, last_ts]
+        self.types: Dict[str, List[Any]] = {}
+        self.counters: Dict[str, Counter] = {}
+
+    def count(self, name: str, key: str, n: int = 1) -> None:
+        counter = self.counters.get(name)
+        if counter is None:
+            counter = self.counters[name] = Counter()
+        counter[key] += n
+
+    def observe_type(self, event_type: str, ts: float) -> None:
+        seen = self.types.get(event_type)
+        if seen is None:
+            self.types[event_type] = [1, ts, ts]
+        else:
+            seen[0] += 1
+            seen[1] = min(seen[1], ts)
+            seen[2] = max(seen[2], ts)
+
+    def merge(self, other: "Aggregates") -> None:
+        for event_type, (count, first, last) in other.types.items():
+            seen = self.types.get(event_type)
+            if seen is None:
+                self.types[event_type] = [count, first, last]
+            else:
+                seen[0] += count
+                seen[1] = min(seen[1], first)
+                seen[2] = max(seen[2], last)
+        for name, counter in other.counters.items():
+            for key, n in counter.items():
+                self.count(name, key, n)
+
+
+# ----------------------------
+# Per-type handlers
+# ----------------------------
+
+HANDLERS: Dict[str, Callable[[Aggregates, Dict[str, Any]], None]] = {}
+
+
+def handles(*event_types: str):
+    def register(fn):
+        for event_type in event_types:
+            HANDLERS[event_type] = fn
+        return fn
+    return register
+
+
+@handles("conversation.message")
+def _message(agg: Aggregates, payload: Dict[str, Any]) -> None:
+    agg.count("messages", payload.get("content_type") or "unknown")
+    # Every session's log starts at entry 1.
+    if payload.get("id") == 1:
+        agg.count("sessions", "started")
+
+
+@handles("debug.support_signal_fired")
+def _support_fired(agg: Aggregates, payload: Dict[str, Any]) -> None:
+    agg.count("support_signal", "fired")
+
+
+@handles("debug.support_signal_not_fired")
+def _support_not_fired(agg: Aggregates, payload: Dict[str, Any]) -> None:
+    agg.count("support_signal", "not_fired")
+
+
+@handles("debug.support_signal_observed_(no_escalation)")
+def _support_observed(agg: Aggregates, payload: Dict[str, Any]) -> None:
+    agg.count("support_signal", "observed_after_escalation")
+
+
+@handles("session.feedback_received")
+def _feedback(agg: Aggregates, payload: Dict[str, Any]) -> None:
+    agg.count("feedback_interpretation", payload.get("interpretation") or "unknown")
+
+
+def observe_snapshot(agg: Aggregates, record: Dict[str, Any]) -> None:
+    data = record.get("data") or {}
+    agg.count("snapshots", "sessions")
+    for signal, count in (data.get("signal_counts") or {}).items():
+        if count:
+            agg.count("snapshot_signal_sessions", signal)
+    for signal, escalated in (data.get("signal_escalated") or {}).items():
+        if escalated:
+            agg.count("snapshot_escalated_sessions", signal)
+
+
+# ----------------------------
+# Streams
+# ----------------------------
+
+def iter_snapshots(run_dir: Path, start_ts: Optional[float], end_ts: Optional[float]) -> Iterator[Dict[str, Any]]:
+    sessions_dir = Path(run_dir) / "sessions"
+    if not sessions_dir.is_dir():
+        return
+    for entry in os.scandir(sessions_dir):
+        if not entry.name.endswith(".json"):
+            continue
+        try:
+            with open(entry.path, encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            continue
+        ts = record.get("snapshot_ts") or 0
+        if (start_ts is None or ts >= start_ts) and (end_ts is None or ts <= end_ts):
+            yield record
+
+
+def analyze_run(run_dir: str, start_ts: Optional[float] = None, end_ts: Optional[float] = None) -> Aggregates:
+    """
+    Worker entry point: stream one run into fresh aggregates.
+    """
+    agg = Aggregates()
+    for record in events_between(Path(run_dir), start_ts, end_ts):
+        event_type = record["type"]
+        agg.observe_type(event_type, record["ts"])
+        handler = HANDLERS.get(event_type)
+        if handler is not None:
+            handler(agg, record.get("payload") or {})
+    for record in iter_snapshots(Path(run_dir), start_ts, end_ts):
+        observe_snapshot(agg, record)
+    return agg
+
+
+def analyze(
+    logs_dir: Path,
+    start_ts: Optional[float] = None,
+    end_ts: Optional[float] = None,
+    run_id: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> Aggregates:
+    total = Aggregates()
+    workers = workers or os.cpu_count() or 1
+    run_dirs = iter_run_dirs(logs_dir, run_id)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        task = partial(analyze_run, start_ts=start_ts, end_ts=end_ts)
+        for _, agg in bounded_map(pool, task, (str(d) for d in run_dirs), workers):
+            total.merge(agg)
+    return total
+
+
+# ----------------------------
+# Report
+# ----------------------------
+
+def _rate(n: int, d: int) -> Optional[float]:
+    return round(n / d, 4) if d else None
+
+
+def report(agg: Aggregates) -> Dict[str, Any]:
+    c = agg.counters
+    sessions = c.get("sessions", Counter())["started"]
+    messages = c.get("messages", Counter())
+    support = c.get("support_signal", Counter())
+    feedback = c.get("feedback_interpretation", Counter())
+    snapshots = c.get("snapshots", Counter())["sessions"]
+    evaluated = support["fired"] + support["not_fired"]
+    feedback_total = sum(feedback.values())
+
+    return {
+        "sessions_started": sessions,
+        "signals": {
+            "support_evaluated": evaluated,
+            "support_fired": support["fired"],
+            "support_firing_rate": _rate(support["fired"], evaluated),
+            # Among sessions that left feedback (and so a snapshot)
+            "sessions_with_signal": {
+                signal: {"sessions": n, "rate": _rate(n, snapshots)}
+                for signal, n in sorted(c.get("snapshot_signal_sessions", Counter()).items())
+            },
+        },
+        "followups": {
+            "asked": messages["followup_question"],
+            "per_session": _rate(messages["followup_question"], sessions),
+            "fired_after_escalation": support["observed_after_escalation"],
+            "escalated_sessions": {
+                signal: {"sessions": n, "rate": _rate(n, snapshots)}
+                for signal, n in sorted(c.get("snapshot_escalated_sessions", Counter()).items())
+            },
+        },
+        "feedback": {
+            "total": feedback_total,
+            "interpretation": {
+                key: {"count": n, "share": _rate(n, feedback_total)}
+                for key, n in sorted(feedback.items())
+            },
+        },
+        "consent": {
+            "offers": messages["consent_offer"],
+            "offer_rate": _rate(messages["consent_offer"], sessions),
+            "limits_explained": messages["consent_limits"],
+            "limits_per_offer": _rate(messages["consent_limits"], messages["consent_offer"]),
+        },
+        "event_types": {
+            event_type: {"count": count, "first_ts": first, "last_ts": last}
+            for event_type, (count, first, last) in sorted(agg.types.items())
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Aggregate telemetry rates over logged runs.")
+    parser.add_argument("--logs", type=Path, default=DEFAULT_LOGS, help="logs directory (default: ./logs)")
+    parser.add_argument("--run", help="only this run")
+    parser.add_argument("--start", type=parse_ts, help="first timestamp (inclusive)")
+    parser.add_argument("--end", type=parse_ts, help="last timestamp (inclusive)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--output", type=Path, help="write the report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    result = report(analyze(args.logs, args.start, args.end, args.run, args.workers))
+    text = json.dumps(result, indent=2, ensure_ascii=False) + "\n"
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
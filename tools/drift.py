@@ -0,0 +1,221 @@
+# tools/drift.py
+# ============================================================
+# Run-to-Run Drift Diff
+# ------------------------------------------------------------
+# Purpose:
+# Compare what two runs (typically a recorded run and its
+# replay under another git_sha, see tools.replay --record-run)
+# did with the same sessions:
+#   - reflections: which snippets unlocked (as stored in the
+#                  snapshot when the run wrote it)
+#   - followups:   follow-up questions asked, in order
+#   - stage_path:  system prompts shown (questions, follow-ups,
+#                  consent), in order; entries logged before
+#                  catalog refs are mapped back from their text
+#
+# - Both runs' session snapshots are walked in sorted session
+#   order and merge-joined; one snapshot per side is loaded at a
+#   time (only file names are held, to sort them)
+# - Only differing sessions are written, as JSONL, with a compact
+#   per-field diff; sessions present on one side only are counted
+# - Summary statistics go to stderr (or --summary)
+#
+# Run from the repo root:
+#   python -m tools.drift RUN_A RUN_B [--output drift.jsonl]
+# RUN_A / RUN_B are run ids under logs/runs or run directories.
+#
+# This module NEVER modifies logs.
+# ============================================================
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from catalog import ref_for_text
+from tools.resummarize import summarize_snapshot
+from tools.session_events import DEFAULT_LOGS
+
+FIELDS = ("reflections", "followups", "stage_path")
+
+
+def resolve_run(logs_dir: Path, run: str) -> Path:
+    path = Path(run)
+    return path if path.is_dir() else Path(logs_dir) / "runs" / run
+
+
+def run_info(run_dir: Path) -> Dict[str, Any]:
+    meta_path = run_dir / "run_meta.json"
+    meta = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else {}
+    return {"run_id": run_dir.name, "git_sha": meta.get("git_sha")}
+
+
+def iter_snapshots(run_dir: Path) -> Iterator[Tuple[str, Path]]:
+    """
+    (session_id, path) in session id order.
+    """
+    sessions_dir = Path(run_dir) / "sessions"
+    if not sessions_dir.is_dir():
+        return
+    # Sorted by id, not file name: the merge join compares ids.
+    ids = sorted(e.name[:-len(".json")] for e in os.scandir(sessions_dir) if e.name.endswith(".json"))
+    for session_id in ids:
+        yield session_id, sessions_dir / f"{session_id}.json"
+
+
+def system_ref(entry: Dict[str, Any]) -> str:
+    """
+    Catalog ref of a system entry. Entries logged before refs
+    existed are mapped back from their text.
+    """
+    ref = entry.get("ref") or ref_for_text(entry.get("content") or "")
+    return ref or entry.get("content_type") or ""
+
+
+def features(record: Dict[str, Any]) -> Dict[str, List[str]]:
+    data = record.get("data") or {}
+    log = data.get("conversation_log") or []
+    path = [system_ref(e) for e in log if e.get("speaker") == "system"]
+    reflections = data.get("unlocked_snippets")
+    if reflections is None:
+        # Snapshots from before unlocked keys were stored: the best
+        # available is what the current conditions unlock.
+        reflections = summarize_snapshot(record)["unlocked"]
+    return {
+        "reflections": list(reflections),
+        "followups": [ref for ref in path if ref.startswith("followup:")],
+        "stage_path": path,
+    }
+
+
+def diff_lists(a: List[str], b: List[str], ordered: bool) -> Optional[Dict[str, Any]]:
+    if a == b:
+        return None
+    if not ordered:
+        return {
+            "added": [x for x in b if x not in a],
+            "removed": [x for x in a if x not in b],
+        }
+    common = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        common += 1
+    return {"common_prefix": common, "a": a[common:], "b": b[common:]}
+
+
+def diff_session(a: Dict[str, List[str]], b: Dict[str, List[str]]) -> Dict[str, Any]:
+    diff = {}
+    for field in FIELDS:
+        delta = diff_lists(a[field], b[field], ordered=field != "reflections")
+        if delta is not None:
+            diff[field] = delta
+    return diff
+
+
+def _load(path: Path) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def merge_join(a_iter: Iterator[Tuple[str, Path]], b_iter: Iterator[Tuple[str, Path]]):
+    """
+    (session_id, path_a or None, path_b or None) over the union
+    of two session-ordered streams.
+    """
+    a, b = next(a_iter, None), next(b_iter, None)
+    while a is not None or b is not None:
+        if b is None or (a is not None and a[0] < b[0]):
+            yield a[0], a[1], None
+            a = next(a_iter, None)
+        elif a is None or b[0] < a[0]:
+            yield b[0], None, b[1]
+            b = next(b_iter, None)
+        else:
+            yield a[0], a[1], b[1]
+            a, b = next(a_iter, None), next(b_iter, None)
+
+
+def drift(run_a: Path, run_b: Path, out) -> Dict[str, Any]:
+    """
+    Write one JSON line per differing session to `out`; return
+    summary statistics.
+    """
+    stats: Dict[str, Any] = {
+        "a": run_info(run_a),
+        "b": run_info(run_b),
+        "compared": 0,
+        "identical": 0,
+        "differing": 0,
+        "only_a": 0,
+        "only_b": 0,
+        "errors": 0,
+        "fields": Counter(),
+        "reflections_added": Counter(),
+        "reflections_removed": Counter(),
+    }
+
+    for session_id, path_a, path_b in merge_join(iter_snapshots(run_a), iter_snapshots(run_b)):
+        if path_b is None:
+            stats["only_a"] += 1
+            continue
+        if path_a is None:
+            stats["only_b"] += 1
+            continue
+        stats["compared"] += 1
+        try:
+            diff = diff_session(features(_load(path_a)), features(_load(path_b)))
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            stats["errors"] += 1
+            out.write(json.dumps({"session_id": session_id, "error": f"{type(exc).__name__}: {exc}"}) + "\n")
+            continue
+        if not diff:
+            stats["identical"] += 1
+            continue
+        stats["differing"] += 1
+        stats["fields"].update(diff.keys())
+        if "reflections" in diff:
+            stats["reflections_added"].update(diff["reflections"]["added"])
+            stats["reflections_removed"].update(diff["reflections"]["removed"])
+        out.write(json.dumps({"session_id": session_id, "diff": diff}, ensure_ascii=False) + "\n")
+
+    for key in ("fields", "reflections_added", "reflections_removed"):
+        stats[key] = dict(sorted(stats[key].items()))
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Diff two runs' session snapshots.")
+    parser.add_argument("run_a", help="baseline run id or directory")
+    parser.add_argument("run_b", help="compared run id or directory")
+    parser.add_argument("--logs", type=Path, default=DEFAULT_LOGS, help="logs directory (default: ./logs)")
+    parser.add_argument("--output", type=Path, help="JSONL of differing sessions (default: stdout)")
+    parser.add_argument("--summary", type=Path, help="write summary statistics here (default: stderr)")
+    args = parser.parse_args(argv)
+
+    run_a, run_b = resolve_run(args.logs, args.run_a), resolve_run(args.logs, args.run_b)
+    for run_dir in (run_a, run_b):
+        if not run_dir.is_dir():
+            parser.error(f"no such run: {run_dir}")
+
+    if args.output:
+        with args.output.open("w", encoding="utf-8") as out:
+            stats = drift(run_a, run_b, out)
+    else:
+        stats = drift(run_a, run_b, sys.stdout)
+
+    text = json.dumps(stats, indent=2) + "\n"
+    if args.summary:
+        args.summary.write_text(text, encoding="utf-8")
+    else:
+        sys.stderr.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# tools/event_window.py
+# ============================================================
+# Time-Window Event Fetch
+# ------------------------------------------------------------
+# Purpose:
+# Print every logged event between two timestamps as JSONL,
+# e.g. "what happened between 14:02 and 14:05".
+#
+# - Uses the ts ranges and sparse ts index written by
+#   telemetry.EventLogger (telemetry.events_between), so only
+#   the matching part of each run is read
+# - Bounds are epoch seconds or ISO datetimes (local time unless
+#   an offset is given); either may be left out
+# - Events from several runs are merged by timestamp
+#
+# Run from the repo root:
+#   python -m tools.event_window --start 2026-10-18T14:02 --end 2026-10-18T14:05
+#   python -m tools.event_window --run RUN_ID --start 1760796120
+#
+# Logs written before the index existed: run
+#   python -m tools.session_events --build-index
+# ============================================================
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from telemetry import events_between
+from tools.session_events import DEFAULT_LOGS, iter_run_dirs
+
+
+def parse_ts(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a timestamp or ISO datetime: {value!r}")
+
+
+def fetch(
+    logs_dir: Path,
+    start_ts: Optional[float] = None,
+    end_ts: Optional[float] = None,
+    run_id: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    streams = [events_between(run_dir, start_ts, end_ts) for run_dir in iter_run_dirs(logs_dir, run_id)]
+    return heapq.merge(*streams, key=lambda record: record["ts"])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Print the logged events in a time window as JSONL.")
+    parser.add_argument("--start", type=parse_ts, help="first timestamp (inclusive)")
+    parser.add_argument("--end", type=parse_ts, help="last timestamp (inclusive)")
+    parser.add_argument("--logs", type=Path, default=DEFAULT_LOGS, help="logs directory (default: ./logs)")
+    parser.add_argument("--run", help="only look in this run")
+    args = parser.parse_args(argv)
+
+    count = 0
+    for record in fetch(args.logs, args.start, args.end, args.run):
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+        count += 1
+    print(f"{count} events", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
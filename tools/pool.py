@@ -0,0 +1,63 @@
+# tools/pool.py
+# ============================================================
+# Bounded Process-Pool Driver
+# ------------------------------------------------------------
+# Purpose:
+# Feed a lazily produced stream of work items to a process pool
+# without materializing it, and hand results back in input
+# order, for the offline tools (resummarize, analytics, replay).
+#
+# - At most IN_FLIGHT_PER_WORKER items per worker are submitted
+#   but not yet consumed, so memory stays flat however long the
+#   stream is, and every worker has the next item queued
+# - Results are yielded in submission order; a slow item holds
+#   back later results but never reorders them
+#
+# This module NEVER creates or configures the pool; callers own
+# it (worker count, start method, initializer).
+# ============================================================
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Executor
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Tuple
+
+IN_FLIGHT_PER_WORKER = 2
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def bounded_map(
+    pool: Executor,
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    workers: int,
+) -> Iterator[Tuple[Any, Any]]:
+    """
+    (item, fn(item)) for every item, in order, with fn run in
+    `pool`. The next item is submitted as each result is taken.
+    """
+    items = iter(items)
+    pending: deque = deque()
+
+    def submit_next() -> bool:
+        for item in islice(items, 1):
+            pending.append((item, pool.submit(fn, item)))
+            return True
+        return False
+
+    while len(pending) < workers * IN_FLIGHT_PER_WORKER and submit_next():
+        pass
+    while pending:
+        item, future = pending.popleft()
+        yield item, future.result()
+        submit_next()
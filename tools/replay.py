@@ -0,0 +1,281 @@
+# tools/replay.py
+# ============================================================
+# Session Replay
+# ------------------------------------------------------------
+# Purpose:
+# Feed the user inputs of recorded sessions through the CURRENT
+# code and record what it does with them, for comparing
+# behaviour across commits (see telemetry.EventLogger).
+#
+# - Inputs per session are rebuilt from conversation.message
+#   events (speaker "user") and conversation.intercepted_input
+#   events (answers a Phase 5 consent prompt intercepted), in
+#   order. Runs recorded before intercepted inputs were logged
+#   lack them, so those sessions replay without the prompts.
+# - A run is read in one pass. A session is handed out as soon as
+#   its conversation.completed event is read, so only unfinished
+#   sessions are held; the rest follow at the end of the run.
+# - Each session is driven through the Flask test client in
+#   client mode (?after=), one fresh client (owner) per session
+# - Sessions are sent in chunks to worker processes. Each worker
+#   imports the app with logging off, stdout discarded and memory
+#   proposals written to its own temporary directory (removed per
+#   session), so nothing touches live logs, live memory or other
+#   workers
+# - Results stream to a JSONL file in source order: per step the
+#   stage reached, follow-up questions asked, consent prompts,
+#   and the final summary text
+# - With --record-run, every replayed session's final state is
+#   also written as a session snapshot of a new run (named by the
+#   SOURCE session id, stamped with the current git_sha), ready
+#   for tools.drift against the recorded run
+#
+# Run from the repo root:
+#   python -m tools.replay --output replay.jsonl [--run RUN_ID]
+#   python -m tools.replay --output one.jsonl --run RUN_ID --session SESSION_ID
+#   python -m tools.replay --output replay.jsonl --run RUN_A --record-run RUN_B
+# ============================================================
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import multiprocessing.util
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from memory.storage import owner_dir
+from telemetry import EventLogger, iter_events, session_events
+from tools.pool import bounded_map, chunked
+from tools.session_events import DEFAULT_LOGS, iter_run_dirs
+
+DEFAULT_CHUNK = 200
+
+
+# ----------------------------
+# Recorded inputs
+# ----------------------------
+
+def _is_input(record) -> bool:
+    if record["type"] == "conversation.intercepted_input":
+        return True
+    return record["type"] == "conversation.message" and record["payload"].get("speaker") == "user"
+
+
+def user_inputs(records) -> List[str]:
+    return [r["payload"].get("content") or "" for r in records if _is_input(r)]
+
+
+def iter_recorded_sessions(run_dir: Path) -> Iterator[Dict[str, Any]]:
+    """
+    {"run_id", "session_id", "inputs"} per session of a run: each
+    completed session once its conversation.completed event is
+    read, then the unfinished ones in order of first input. Holds
+    the inputs (text only) of sessions still in progress and the
+    ids of completed ones.
+    """
+    run_id = Path(run_dir).name
+    pending: Dict[str, List[str]] = {}
+    completed: Set[str] = set()
+    for record in iter_events(run_dir):
+        session_id = record["session_id"]
+        if session_id in completed:
+            continue
+        if _is_input(record):
+            pending.setdefault(session_id, []).append(record["payload"].get("content") or "")
+        elif record["type"] == "conversation.completed":
+            completed.add(session_id)
+            inputs = pending.pop(session_id, None)
+            if inputs:
+                yield {"run_id": run_id, "session_id": session_id, "inputs": inputs}
+    for session_id, inputs in pending.items():
+        yield {"run_id": run_id, "session_id": session_id, "inputs": inputs}
+
+
+# ----------------------------
+# Worker
+# ----------------------------
+
+_app = None
+_recorder: Optional[EventLogger] = None
+
+
+def _init_worker(logs_dir: Optional[str] = None, record_run: Optional[str] = None) -> None:
+    """
+    Import the app in isolation: no event logging, in-memory
+    sessions, memory files under a private temporary directory.
+    With record_run, snapshots go to that run under logs_dir.
+    """
+    global _app, _recorder
+    if record_run:
+        os.environ["CAREER_EXPLORER_RUN_ID"] = record_run
+        _recorder = EventLogger(enabled=True, base_dir=Path(logs_dir))
+    os.environ["CAREER_EXPLORER_LOGGING"] = "0"
+    os.environ["CAREER_EXPLORER_SESSION_BACKEND"] = "memory"
+    # The app prints debug output on every request.
+    sys.stdout = open(os.devnull, "w")
+
+    import memory.storage as storage
+
+    memory_dir = tempfile.mkdtemp(prefix="replay-memory-")
+    storage.BASE_MEMORY_DIR = Path(memory_dir)
+    # Pool workers leave through multiprocessing's exit path, which
+    # runs its finalizers but not atexit handlers.
+    multiprocessing.util.Finalize(
+        None, shutil.rmtree, args=(memory_dir,), kwargs={"ignore_errors": True}, exitpriority=0,
+    )
+
+    import app as app_module
+
+    _app = app_module
+
+
+def replay_session(
+    app_module,
+    session: Dict[str, Any],
+    recorder: Optional[EventLogger] = None,
+) -> Dict[str, Any]:
+    client = app_module.app.test_client()
+    data = client.get("/?after=0").get_json()
+    cursor = data["cursor"]
+    steps: List[Dict[str, Any]] = []
+    completed = False
+
+    for text in session["inputs"]:
+        data = client.post(f"/?after={cursor}", data={"user_input": text}).get_json()
+        if "redirect" in data:
+            steps.append({"stage": "summary"})
+            completed = True
+            break
+        if "page" in data:
+            steps.append({"stage": steps[-1]["stage"] if steps else 1, "consent_prompt": True})
+            continue
+        step: Dict[str, Any] = {"stage": data["stage"]}
+        followups = [e["content"] for e in data["entries"] if e["content_type"] == "followup_question"]
+        if followups:
+            step["followups"] = followups
+        steps.append(step)
+        cursor = data["cursor"]
+
+    summary = None
+    owner_id = client.get_cookie(app_module.OWNER_COOKIE_NAME).value
+    if completed:
+        client.get("/")
+    state = app_module.session_store.get(owner_id)
+    if completed and state is not None:
+        cached = app_module.summary_cache.get(state.session_id)
+        summary = cached[1] if cached else None
+    if recorder is not None and state is not None:
+        recorder.write_session_snapshot(session["session_id"], app_module.session_snapshot(state))
+    shutil.rmtree(owner_dir(owner_id), ignore_errors=True)
+
+    return {
+        "run_id": session["run_id"],
+        "session_id": session["session_id"],
+        "inputs": len(session["inputs"]),
+        "replayed": len(steps),
+        "completed": completed,
+        "steps": steps,
+        "summary": summary,
+    }
+
+
+def replay_chunk(sessions: List[Dict[str, Any]]) -> str:
+    """
+    Worker entry point: one JSONL block for a chunk of sessions,
+    in the order given.
+    """
+    lines = []
+    for session in sessions:
+        try:
+            result = replay_session(_app, session, _recorder)
+        except Exception as exc:
+            result = {
+                "run_id": session["run_id"],
+                "session_id": session["session_id"],
+                "error": f"{type(exc).__name__}: {exc}",
+            }
+        lines.append(json.dumps(result, ensure_ascii=False) + "\n")
+    return "".join(lines)
+
+
+# ----------------------------
+# Driver
+# ----------------------------
+
+def iter_sessions(logs_dir: Path, run_id: Optional[str] = None, session_id: Optional[str] = None):
+    for run_dir in iter_run_dirs(logs_dir, run_id):
+        if session_id:
+            inputs = user_inputs(session_events(run_dir, session_id))
+            if inputs:
+                yield {"run_id": run_dir.name, "session_id": session_id, "inputs": inputs}
+        else:
+            yield from iter_recorded_sessions(run_dir)
+
+
+def replay(
+    logs_dir: Path,
+    output: Path,
+    run_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK,
+    record_run: Optional[str] = None,
+) -> int:
+    """
+    Replay recorded sessions into `output` (JSONL). Returns the
+    number of sessions replayed.
+    """
+    if record_run and (Path(logs_dir) / "runs" / record_run).exists():
+        raise SystemExit(f"run {record_run!r} already exists; pick a new --record-run")
+    workers = workers or os.cpu_count() or 1
+    sessions = iter_sessions(logs_dir, run_id, session_id)
+    done = 0
+
+    with Path(output).open("w", encoding="utf-8") as out, \
+            ProcessPoolExecutor(
+                max_workers=workers,
+                # Fresh interpreters: a forked copy of an already
+                # imported app would inherit dead pool threads.
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(str(logs_dir), record_run),
+            ) as pool:
+        for chunk, block in bounded_map(pool, replay_chunk, chunked(sessions, chunk_size), workers):
+            out.write(block)
+            done += len(chunk)
+    return done
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded sessions against the current code.")
+    parser.add_argument("--logs", type=Path, default=DEFAULT_LOGS, help="logs directory (default: ./logs)")
+    parser.add_argument("--output", type=Path, required=True, help="JSONL file to write")
+    parser.add_argument("--run", help="only sessions recorded in this run")
+    parser.add_argument("--session", help="only this session (uses the session index)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK, help="sessions per task")
+    parser.add_argument("--record-run", help="also write replayed session snapshots as this new run")
+    args = parser.parse_args(argv)
+
+    total = replay(
+        args.logs,
+        args.output,
+        run_id=args.run,
+        session_id=args.session,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        record_run=args.record_run,
+    )
+    print(f"{total} sessions replayed -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
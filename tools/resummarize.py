@@ -0,0 +1,237 @@
+# tools/resummarize.py
+# ============================================================
+# Offline Re-Summarization
+# ------------------------------------------------------------
+# Purpose:
+# Re-run the reflection pipeline over every stored session
+# snapshot (logs/runs/*/sessions/*.json), e.g. after the wording
+# of REFLECTION_SNIPPETS changes.
+#
+# - Snapshots are walked lazily in a fixed order (runs, then
+#   files, both sorted) and handed to a process pool in chunks
+# - At most a few chunks per worker are in flight, so memory
+#   stays flat however many snapshots exist
+# - Results stream to a JSONL file in walk order
+# - A checkpoint records how many snapshots are done and the
+#   output size at that point; --resume continues from there
+#   (it assumes no snapshots were added or removed meanwhile)
+#
+# Run from the repo root:
+#   python -m tools.resummarize --output resummarized.jsonl
+#   python -m tools.resummarize --output resummarized.jsonl --resume
+#
+# This module NEVER:
+#   - modifies snapshots
+#   - touches live sessions or memory proposals
+# ============================================================
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from reflections import (
+    REFLECTION_CONDITIONS,
+    REFLECTION_SNIPPETS,
+    generate_base_summary,
+    signal_vector,
+    unlocked_snippets,
+)
+from tools.pool import bounded_map, chunked
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_LOGS = ROOT / "logs"
+DEFAULT_CHUNK = 256
+
+
+def pipeline_fingerprint() -> str:
+    """
+    Identifies the snippet wording and conditions. A checkpoint
+    made under a different fingerprint cannot be resumed.
+    """
+    blob = json.dumps([REFLECTION_SNIPPETS, REFLECTION_CONDITIONS], sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def iter_snapshot_paths(logs_dir: Path) -> Iterator[Path]:
+    runs_dir = Path(logs_dir) / "runs"
+    if not runs_dir.is_dir():
+        return
+    for run_dir in sorted(p for p in runs_dir.iterdir() if p.is_dir()):
+        sessions_dir = run_dir / "sessions"
+        if sessions_dir.is_dir():
+            for name in sorted(e.name for e in os.scandir(sessions_dir) if e.name.endswith(".json")):
+                yield sessions_dir / name
+
+
+# ----------------------------
+# Snapshot -> summary
+# ----------------------------
+
+class _SnapshotSignals:
+    __slots__ = ("signal_counts", "signal_escalated")
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.signal_counts = data.get("signal_counts") or {}
+        self.signal_escalated = data.get("signal_escalated") or {}
+
+
+def responses_from_log(conversation_log: Iterable[Dict[str, Any]]) -> Dict[int, str]:
+    """
+    Rebuild stage -> answer from a logged conversation.
+
+    A user entry directly after a follow-up question answers the
+    follow-up, not the stage, mirroring how app.py stores them.
+    """
+    responses: Dict[int, str] = {}
+    answering_followup = False
+    for entry in conversation_log:
+        if entry.get("speaker") == "system" and entry.get("content_type") == "followup_question":
+            answering_followup = True
+        elif entry.get("speaker") == "user":
+            if answering_followup:
+                answering_followup = False
+            else:
+                responses[entry["phase"]] = entry.get("content") or ""
+    return responses
+
+
+def summarize_snapshot(record: Dict[str, Any]) -> Dict[str, Any]:
+    data = record.get("data") or {}
+    keys = unlocked_snippets(signal_vector(_SnapshotSignals(data)))
+    reflections = [REFLECTION_SNIPPETS[key]["text"] for key in keys]
+    base_summary = generate_base_summary(responses_from_log(data.get("conversation_log") or []))
+    return {
+        "run_id": record.get("run_id"),
+        "git_sha": record.get("git_sha"),
+        "session_id": record.get("session_id"),
+        "snapshot_ts": record.get("snapshot_ts"),
+        "unlocked": list(keys),
+        "reflections": reflections,
+        "base_summary": base_summary,
+        "summary": " ".join(base_summary + reflections),
+    }
+
+
+def summarize_chunk(paths: List[str]) -> str:
+    """
+    Worker entry point: one JSONL block for a chunk of snapshot
+    files, in the order given.
+    """
+    lines = []
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as f:
+                result = summarize_snapshot(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            result = {"error": f"{type(exc).__name__}: {exc}"}
+        result["source"] = path
+        lines.append(json.dumps(result, ensure_ascii=False) + "\n")
+    return "".join(lines)
+
+
+# ----------------------------
+# Checkpoint
+# ----------------------------
+
+def load_checkpoint(path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_checkpoint(path: Path, done: int, offset: int, fingerprint: str) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({
+        "done": done,
+        "offset": offset,
+        "fingerprint": fingerprint,
+    }), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ----------------------------
+# Driver
+# ----------------------------
+
+def resummarize(
+    logs_dir: Path,
+    output: Path,
+    checkpoint: Optional[Path] = None,
+    resume: bool = False,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK,
+) -> int:
+    """
+    Re-summarize every snapshot under logs_dir into `output`.
+    Returns the total number of snapshots written.
+    """
+    output = Path(output)
+    checkpoint = Path(checkpoint) if checkpoint else output.with_name(output.name + ".checkpoint")
+    fingerprint = pipeline_fingerprint()
+    workers = workers or os.cpu_count() or 1
+
+    done, offset = 0, 0
+    resume = resume and output.exists()
+    if resume:
+        state = load_checkpoint(checkpoint)
+        if state is not None:
+            if state["fingerprint"] != fingerprint:
+                raise SystemExit(
+                    "checkpoint was made with different reflection snippets; rerun without --resume"
+                )
+            done, offset = state["done"], state["offset"]
+
+    paths = iter_snapshot_paths(logs_dir)
+    for _ in islice(paths, done):
+        pass
+
+    mode = "r+b" if resume else "wb"
+    with output.open(mode) as out, ProcessPoolExecutor(max_workers=workers) as pool:
+        # Drop anything written after the last checkpoint.
+        out.seek(offset)
+        out.truncate()
+
+        chunks = chunked((str(p) for p in paths), chunk_size)
+        for chunk, block in bounded_map(pool, summarize_chunk, chunks, workers):
+            out.write(block.encode("utf-8"))
+            out.flush()
+            done += len(chunk)
+            save_checkpoint(checkpoint, done, out.tell(), fingerprint)
+
+    return done
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Re-run the reflection pipeline over stored session snapshots."
+    )
+    parser.add_argument("--logs", type=Path, default=DEFAULT_LOGS, help="logs directory (default: ./logs)")
+    parser.add_argument("--output", type=Path, required=True, help="JSONL file to write")
+    parser.add_argument("--checkpoint", type=Path, help="checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--resume", action="store_true", help="continue from the checkpoint")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK, help="snapshots per task")
+    args = parser.parse_args(argv)
+
+    total = resummarize(
+        logs_dir=args.logs,
+        output=args.output,
+        checkpoint=args.checkpoint,
+        resume=args.resume,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+    )
+    print(f"{total} snapshots summarized -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# tools/session_events.py
+# ============================================================
+# Single-Session Event Fetch
+# ------------------------------------------------------------
+# Purpose:
+# Print every logged event of one session as JSONL, for replay
+# or audit, without scanning whole runs.
+#
+# - Uses the per-file .idx sidecars and session_segments.json
+#   written by telemetry.EventLogger (telemetry.session_events)
+# - Files without an index (e.g. logs written before indexing
+#   existed) can be indexed once with --build-index
+#
+# Run from the repo root:
+#   python -m tools.session_events <session_id> [--run RUN_ID]
+#   python -m tools.session_events --build-index [--run RUN_ID]
+#
+# This module NEVER modifies events files; --build-index only
+# writes sidecars next to them.
+# ============================================================
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from telemetry import build_run_index, session_events
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_LOGS = ROOT / "logs"
+
+
+def iter_run_dirs(logs_dir: Path, run_id: Optional[str] = None) -> Iterator[Path]:
+    runs_dir = Path(logs_dir) / "runs"
+    if run_id:
+        yield runs_dir / run_id
+        return
+    if runs_dir.is_dir():
+        yield from sorted(p for p in runs_dir.iterdir() if p.is_dir())
+
+
+def fetch(logs_dir: Path, session_id: str, run_id: Optional[str] = None) -> List[dict]:
+    records = []
+    for run_dir in iter_run_dirs(logs_dir, run_id):
+        records.extend(session_events(run_dir, session_id))
+    return records
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Print the logged events of one session as JSONL.")
+    parser.add_argument("session_id", nargs="?", help="session to fetch")
+    parser.add_argument("--logs", type=Path, default=DEFAULT_LOGS, help="logs directory (default: ./logs)")
+    parser.add_argument("--run", help="only look in this run")
+    parser.add_argument("--build-index", action="store_true", help="index files that have no sidecar yet")
+    args = parser.parse_args(argv)
+
+    if args.build_index:
+        for run_dir in iter_run_dirs(args.logs, args.run):
+            print(f"{run_dir.name}: {build_run_index(run_dir)} files indexed", file=sys.stderr)
+        if not args.session_id:
+            return 0
+    elif not args.session_id:
+        parser.error("session_id is required unless --build-index is given")
+
+    records = fetch(args.logs, args.session_id, args.run)
+    for record in records:
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+    print(f"{len(records)} events", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())